@@ -1,23 +1,30 @@
-from flask import Flask, render_template, request, jsonify, send_from_directory, current_app, redirect, url_for
+from flask import Flask, Blueprint, Response, render_template, request, jsonify, send_from_directory, current_app, redirect, url_for, stream_with_context
 from flask_cors import CORS
 import os
 import sys
 import logging
 import argparse
-from datetime import datetime
+import importlib.util
+import functools
+import threading
+from datetime import datetime, timezone
 from dotenv import load_dotenv
-from modules.utils import clean_environment
+from modules.utils import clean_environment, load_or_create_secret_key
 from modules.rate_limiter import rate_limit
+from werkzeug.exceptions import HTTPException
+from werkzeug.http import is_resource_modified
 import json
-import traceback
-from modules.voice_analysis import VoiceAnalyzer
-from modules.web_scraper import WebScraper
-from modules.content_generator import ContentGenerator
-from modules.workflow import ApprovalWorkflow
-from modules.direct_generator import DirectGenerator
+from flask.json.provider import DefaultJSONProvider
 from modules.settings_manager import SettingsManager
+from modules.llm_cache import LLMCache, make_cache_key
 import signal
 
+# orjson is optional; fall back to Flask's stdlib-based JSON provider
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Load environment variables from .env file
 dotenv_loaded = load_dotenv()
 
@@ -41,9 +48,24 @@ logger.info(f"OPENAI_API_KEY present: {'OPENAI_API_KEY' in os.environ}")
 logger.info(f"Running in Python version: {sys.version}")
 
 # Initialize Flask app
+class ORJSONProvider(DefaultJSONProvider):
+    """Flask JSON provider that serializes with orjson"""
+    
+    def dumps(self, obj, **kwargs):
+        # Keep sorted keys like the default provider so output (and ETags) stay stable
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_SORT_KEYS
+        return orjson.dumps(obj, default=self.default, option=option).decode('utf-8')
+    
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
 app = Flask(__name__, static_folder='static', static_url_path='/static', template_folder='templates')
+if orjson is not None:
+    app.json = ORJSONProvider(app)
 CORS(app)  # Enable CORS for all routes
-app.secret_key = os.urandom(24)
+# Persist the session key so cookies stay valid across restarts and workers
+app.secret_key = os.environ.get('FLASK_SECRET_KEY') or load_or_create_secret_key(
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), '.secret_key'))
 
 # Define API version
 API_VERSION = 'v1'
@@ -53,24 +75,101 @@ def handle_restart_signal(signum, frame):
     logger.info("Received restart signal, exiting process")
     sys.exit(0)
 
-# Register signal handler
-signal.signal(signal.SIGUSR1, handle_restart_signal)
-
-# Initialize components
-try:
-    voice_analyzer = VoiceAnalyzer()
-    web_scraper = WebScraper()
-    content_generator = ContentGenerator()
-    workflow = ApprovalWorkflow()
-    direct_generator = DirectGenerator()
-    logger.info("All application components initialized successfully")
-except Exception as e:
-    logger.error(f"Error initializing application components: {e}")
-    logger.error(traceback.format_exc())
-    # We'll continue running but functionality may be limited
-
-# API Version
-API_VERSION = "v1"
+# Register signal handler for the development server only; under gunicorn,
+# SIGUSR1 belongs to the worker and restarts go through the arbiter (HUP)
+if 'gunicorn' not in sys.modules:
+    signal.signal(signal.SIGUSR1, handle_restart_signal)
+
+# Shared response cache for the LLM-backed generation endpoints
+response_cache = LLMCache()
+
+# Component status for /health: None until first use, then whether it initialized
+_COMPONENT_STATUS = {
+    'voice_analyzer': None,
+    'web_scraper': None,
+    'content_generator': None,
+    'workflow': None,
+    'direct_generator': None
+}
+_HEALTH_STATE = {}
+
+def refresh_health_state():
+    """Snapshot component and LLM provider status for /health (re-run when either changes)"""
+    llm_config = {
+        'provider': os.getenv('LLM_PROVIDER', 'openai'),
+        'gemini_configured': os.getenv('GEMINI_API_KEY') is not None,
+        'openai_configured': os.getenv('OPENAI_API_KEY') is not None
+    }
+    status = 'degraded' if False in _COMPONENT_STATUS.values() else 'healthy'
+    _HEALTH_STATE.update({
+        'status': status,
+        'llm_config': llm_config,
+        'settings_version': settings_manager.version,
+        'etag': make_cache_key(status=status, components=_COMPONENT_STATUS, llm_config=llm_config)
+    })
+
+refresh_health_state()
+
+_components_lock = threading.Lock()
+
+def lazy_component(name, required_method, reloadable=False):
+    """Turn a factory into a cached accessor that builds the component on first use
+
+    Components (and the LLM SDKs they import) are created lazily so a worker
+    only pays for the endpoints it actually serves. Reloadable components are
+    rebuilt on next use after settings change, instead of restarting the process.
+    """
+    def decorator(factory):
+        state = {}
+        
+        @functools.wraps(factory)
+        def accessor():
+            version = None
+            if reloadable:
+                settings_manager.reload_if_changed()
+                version = settings_manager.version
+            if state and state['version'] == version:
+                return state['component']
+            with _components_lock:
+                if not state or state['version'] != version:
+                    try:
+                        component = factory()
+                    except Exception as e:
+                        logger.error(f"Error initializing {name}: {e}", exc_info=True)
+                        _COMPONENT_STATUS[name] = False
+                        refresh_health_state()
+                        raise
+                    state.update(component=component, version=version)
+                    _COMPONENT_STATUS[name] = hasattr(component, required_method)
+                    refresh_health_state()
+            return state['component']
+        return accessor
+    return decorator
+
+@lazy_component('voice_analyzer', 'analyze', reloadable=True)
+def get_voice_analyzer():
+    from modules.voice_analysis import VoiceAnalyzer
+    return VoiceAnalyzer()
+
+@lazy_component('web_scraper', 'fetch_content')
+def get_web_scraper():
+    from modules.web_scraper import WebScraper
+    return WebScraper()
+
+@lazy_component('content_generator', 'generate', reloadable=True)
+def get_content_generator():
+    from modules.content_generator import ContentGenerator
+    return ContentGenerator()
+
+@lazy_component('workflow', 'approve_post')
+def get_workflow():
+    from modules.workflow import ApprovalWorkflow
+    return ApprovalWorkflow()
+
+@lazy_component('direct_generator', 'analyze_and_generate', reloadable=True)
+def get_direct_generator():
+    from modules.direct_generator import DirectGenerator
+    return DirectGenerator()
 
 # Main index route
 @app.route('/', methods=['GET'])
@@ -83,36 +182,24 @@ def index():
 def health_check():
     """Health check endpoint to verify the application is running properly"""
     try:
-        # Check if key components are initialized
-        components_status = {
-            'voice_analyzer': hasattr(voice_analyzer, 'analyze'),
-            'web_scraper': hasattr(web_scraper, 'fetch_content'),
-            'content_generator': hasattr(content_generator, 'generate'),
-            'workflow': hasattr(workflow, 'approve_post'),
-            'direct_generator': hasattr(direct_generator, 'analyze_and_generate')
-        }
-        
-        # Check LLM provider status
-        llm_provider = os.getenv('LLM_PROVIDER', 'openai')
-        gemini_api_key = os.getenv('GEMINI_API_KEY') is not None
-        openai_api_key = os.getenv('OPENAI_API_KEY') is not None
+        # Pick up settings saved by another worker
+        settings_manager.reload_if_changed()
+        if _HEALTH_STATE['settings_version'] != settings_manager.version:
+            refresh_health_state()
         
-        # Prepare response
-        status = 'healthy'
-        if not all(components_status.values()):
-            status = 'degraded'
-            
-        return jsonify({
-            'status': status,
+        response = jsonify({
+            'status': _HEALTH_STATE['status'],
             'timestamp': datetime.now().isoformat(),
             'version': API_VERSION,
-            'components': components_status,
-            'llm_config': {
-                'provider': llm_provider,
-                'gemini_configured': gemini_api_key,
-                'openai_configured': openai_api_key
-            }
+            'components': _COMPONENT_STATUS,
+            'cache': response_cache.stats,
+            'llm_config': _HEALTH_STATE['llm_config']
         })
+        # Let probes and proxies dedupe. The ETag is weak: it covers status,
+        # components and LLM config, but not the timestamp or cache stats
+        response.cache_control.max_age = 1
+        response.set_etag(_HEALTH_STATE['etag'], weak=True)
+        return response.make_conditional(request)
     except Exception as e:
         logger.error(f"Health check failed: {e}")
         return jsonify({
@@ -124,8 +211,13 @@ def health_check():
 # Error handler
 @app.errorhandler(Exception)
 def handle_exception(e):
-    logger.error(f"Unhandled exception: {e}")
-    logger.error(traceback.format_exc())
+    # Client errors (bad JSON, unknown route, wrong method) need no stack trace
+    if isinstance(e, HTTPException) and e.code < 500:
+        return jsonify({
+            "error": e.description,
+            "status": "error"
+        }), e.code
+    logger.error(f"Unhandled exception: {e}", exc_info=True)
     return jsonify({
         "error": str(e),
         "status": "error"
@@ -145,8 +237,33 @@ def api_response(data=None, message=None, status="success", code=200):
         response["message"] = message
     return jsonify(response), code
 
-@app.route(f'/api/{API_VERSION}/analyze-voice', methods=['POST'])
-@rate_limit
+def conditional_api_response(etag, build, last_modified=None):
+    """Answer 304 when the client's validators still match, before building the body
+    
+    Args:
+        etag (str): Validator identifying the current representation
+        build (callable): Produces the usual api_response (response, code) tuple
+        last_modified (datetime, optional): When the underlying data last changed
+    """
+    if not is_resource_modified(request.environ, etag=etag, last_modified=last_modified):
+        response, code = Response(status=304), 304
+    else:
+        response, code = build()
+        if code != 200:
+            return response, code
+    response.set_etag(etag)
+    if last_modified is not None:
+        response.last_modified = last_modified
+    return response, code
+
+def is_deterministic_request(data):
+    """Only cache generations the client has asked to be reproducible"""
+    return str(data.get('deterministic', 'false')).lower() in ['true', '1', 'yes'] or data.get('temperature') == 0
+
+def is_cacheable_result(result):
+    """Never cache error placeholders returned by the generators"""
+    return isinstance(result, dict) and result.get('status') != 'error'
+
 def analyze_voice():
     """Analyze voice from previous LinkedIn posts"""
     try:
@@ -158,14 +275,12 @@ def analyze_voice():
         if not posts:
             return api_response(message="No posts provided for analysis", status="error", code=400)
             
-        profile = voice_analyzer.analyze(posts)
+        profile = get_voice_analyzer().analyze(posts)
         return api_response(data=profile)
     except Exception as e:
         logger.error(f"Error in voice analysis: {e}")
         return api_response(message=f"Error analyzing voice style: {str(e)}", status="error", code=500)
 
-@app.route(f'/api/{API_VERSION}/configure-sources', methods=['POST'])
-@rate_limit
 def configure_sources():
     """Add or update sources to monitor"""
     try:
@@ -180,7 +295,7 @@ def configure_sources():
         source_type = data.get('type', 'website')
         frequency = data.get('frequency', 'daily')
         
-        success = web_scraper.add_source(url, source_type, frequency)
+        success = get_web_scraper().add_source(url, source_type, frequency)
         
         if success:
             return api_response(data={"url": url, "type": source_type, "frequency": frequency}, 
@@ -191,8 +306,6 @@ def configure_sources():
         logger.error(f"Error configuring sources: {e}")
         return api_response(message=f"Error configuring source: {str(e)}", status="error", code=500)
 
-@app.route(f'/api/{API_VERSION}/fetch-content', methods=['GET'])
-@rate_limit
 def fetch_content():
     """Get content from monitored sources"""
     try:
@@ -201,41 +314,56 @@ def fetch_content():
         force_refresh = request.args.get('force_refresh', 'false').lower() == 'true'
         category = request.args.get('category', '')
         max_articles = int(request.args.get('max_articles', '10'))
+        stream = request.args.get('stream', 'false').lower() == 'true'
         
         # Use the enhanced fetch_articles method with ArticleScorer integration
+        web_scraper = get_web_scraper()
         articles = web_scraper.fetch_articles(
             force_refresh=force_refresh,
             filter_category=category if category else None,
             max_articles=max_articles
         )
         
-        # Update relevance scores if interests are provided
+        # Boost articles matching the user's interests (ordering is cached per interest list)
         if interests and web_scraper.article_scorer:
-            interests_list = [term.strip() for term in interests.split(',') if term.strip()]
-            if interests_list:
-                web_scraper.article_scorer.set_boost_terms(interests_list)
-                # Re-order articles with the updated boost terms
-                articles = web_scraper.article_scorer.order_articles_by_relevance(articles)
+            articles = web_scraper.article_scorer.order_articles_by_interests(articles, interests)
         
-        # Create a response with both articles and metadata
-        content = {
-            'articles': articles,
-            'metadata': {
-                'total_count': len(articles),
-                'sources_count': len(web_scraper.sources) if hasattr(web_scraper, 'sources') else 0,
-                'last_updated': datetime.now().isoformat(),
-                'interests_applied': bool(interests)
-            }
+        metadata = {
+            'total_count': len(articles),
+            'sources_count': len(web_scraper.sources) if hasattr(web_scraper, 'sources') else 0,
+            'last_updated': datetime.now().isoformat(),
+            'interests_applied': bool(interests)
         }
+        stream = stream or request.accept_mimetypes.best == 'application/x-ndjson'
+        
+        # Articles only change when a source cache refreshes, so the validator can be
+        # derived from the refresh time and query instead of the serialized body
+        last_refresh = web_scraper.last_refresh()
+        etag = make_cache_key(refreshed=last_refresh, sources=metadata['sources_count'], interests=interests,
+                              category=category, max_articles=max_articles, stream=stream)
+        last_modified = datetime.fromtimestamp(last_refresh, timezone.utc) if last_refresh else None
+        
+        def build():
+            # Stream one article per line when the client asks for NDJSON
+            if stream:
+                def generate():
+                    for article in articles:
+                        yield json.dumps(article, default=str) + '\n'
+                    yield json.dumps({'__meta__': metadata}) + '\n'
+                return Response(stream_with_context(generate()), mimetype='application/x-ndjson'), 200
+            
+            # Create a response with both articles and metadata
+            content = {
+                'articles': articles,
+                'metadata': metadata
+            }
+            return api_response(data=content)
         
-        return api_response(data=content)
+        return conditional_api_response(etag, build, last_modified)
     except Exception as e:
-        logger.error(f"Error fetching content: {e}")
-        logger.error(traceback.format_exc())
+        logger.error(f"Error fetching content: {e}", exc_info=True)
         return api_response(message=f"Error fetching content: {str(e)}", status="error", code=500)
 
-@app.route(f'/api/{API_VERSION}/generate-content', methods=['POST'])
-@rate_limit
 def generate_content():
     """Generate LinkedIn post content"""
     try:
@@ -247,25 +375,47 @@ def generate_content():
         source_content = data.get('sourceContent', {})
         post_type = data.get('postType', 'Professional Insight')
         
-        post = content_generator.generate(voice_profile, source_content, post_type)
+        # Stream completion text as NDJSON events when the client asks for it
+        stream = request.args.get('stream', 'false').lower() == 'true'
+        if stream or request.accept_mimetypes.best == 'application/x-ndjson':
+            content_generator = get_content_generator()
+            def events():
+                for event in content_generator.generate_stream(voice_profile, source_content, post_type):
+                    yield json.dumps(event, default=str) + '\n'
+            return Response(stream_with_context(events()), mimetype='application/x-ndjson'), 200
+        
+        if not is_deterministic_request(data):
+            post = get_content_generator().generate(voice_profile, source_content, post_type)
+            return api_response(data=post)
+
+        # Deterministic requests are served from the response cache, matching
+        # on the exact inputs first and then on a near-identical source article
+        source_text = source_content
+        if isinstance(source_content, dict):
+            source_text = f"{source_content.get('title', '')} {source_content.get('summary', '')}"
+        # Results from one provider must not be served after switching to another
+        provider = os.getenv('LLM_PROVIDER', 'openai')
+        post = response_cache.get_or_compute(
+            make_cache_key(voice=voice_profile, src=source_content, type=post_type, provider=provider),
+            lambda: get_content_generator().generate(voice_profile, source_content, post_type),
+            text=source_text,
+            namespace=make_cache_key(endpoint='generate-content', voice=voice_profile, type=post_type, provider=provider),
+            should_cache=is_cacheable_result
+        )
         return api_response(data=post)
     except Exception as e:
         logger.error(f"Error generating content: {e}")
         return api_response(message=f"Error generating content: {str(e)}", status="error", code=500)
     
-@app.route(f'/api/{API_VERSION}/approval-queue', methods=['GET'])
-@rate_limit
 def get_approval_queue():
     """Get posts waiting for approval"""
     try:
-        posts = workflow.get_approval_queue()
+        posts = get_workflow().get_approval_queue()
         return api_response(data=posts)
     except Exception as e:
         logger.error(f"Error getting approval queue: {e}")
         return api_response(message=f"Error getting approval queue: {str(e)}", status="error", code=500)
 
-@app.route(f'/api/{API_VERSION}/approve-post', methods=['POST'])
-@rate_limit
 def approve_post():
     """Approve a post for publishing"""
     try:
@@ -277,7 +427,7 @@ def approve_post():
         if not post_id:
             return api_response(message="Post ID is required", status="error", code=400)
             
-        success = workflow.approve_post(post_id)
+        success = get_workflow().approve_post(post_id)
         
         if success:
             return api_response(message="Post approved successfully")
@@ -287,13 +437,11 @@ def approve_post():
         logger.error(f"Error approving post: {e}")
         return api_response(message=f"Error approving post: {str(e)}", status="error", code=500)
 
-@app.route(f'/api/{API_VERSION}/analytics', methods=['GET'])
-@rate_limit
 def get_analytics():
     """Get content performance analytics"""
     try:
-        analytics = workflow.get_analytics()
-        return api_response(data=analytics)
+        analytics = get_workflow().get_analytics()
+        return conditional_api_response(make_cache_key(analytics=analytics), lambda: api_response(data=analytics))
     except Exception as e:
         logger.error(f"Error getting analytics: {e}")
         return api_response(message=f"Error getting analytics: {str(e)}", status="error", code=500)
@@ -352,11 +500,12 @@ def update_settings():
         success = settings_manager.update_settings(data)
         
         if success:
-            # Schedule a restart
-            settings_manager.schedule_restart(5)
+            # LLM-backed components rebuild on next use (in every worker, via the
+            # .env version check), so no process restart is needed
+            refresh_health_state()
             return jsonify({
                 'status': 'success', 
-                'message': 'Settings updated successfully. Server will restart.'
+                'message': 'Settings updated successfully and applied.'
             })
         else:
             return jsonify({
@@ -386,8 +535,6 @@ def restart_server():
             'message': f'Error: {str(e)}'
         }), 500
 
-@app.route(f'/api/{API_VERSION}/save-draft', methods=['POST'])
-@rate_limit
 def save_draft():
     """Save post as a draft"""
     try:
@@ -399,7 +546,7 @@ def save_draft():
         if not post:
             return api_response(message="Post data is required", status="error", code=400)
             
-        success = workflow.save_draft(post)
+        success = get_workflow().save_draft(post)
         
         if success:
             return api_response(message="Draft saved successfully")
@@ -408,42 +555,7 @@ def save_draft():
     except Exception as e:
         logger.error(f"Error saving draft: {e}")
         return api_response(message=f"Error saving draft: {str(e)}", status="error", code=500)
-        
-# Add backward compatibility routes for existing frontend code
-@app.route('/analyze-voice', methods=['POST'])
-def analyze_voice_legacy():
-    return analyze_voice()
-
-@app.route('/configure-sources', methods=['POST'])
-def configure_sources_legacy():
-    return configure_sources()
-
-@app.route('/fetch-content', methods=['GET'])
-def fetch_content_legacy():
-    return fetch_content()
-
-@app.route('/generate-content', methods=['POST'])
-def generate_content_legacy():
-    return generate_content()
-    
-@app.route('/approval-queue', methods=['GET'])
-def get_approval_queue_legacy():
-    return get_approval_queue()
-
-@app.route('/approve-post', methods=['POST'])
-def approve_post_legacy():
-    return approve_post()
-
-@app.route('/analytics', methods=['GET'])
-def get_analytics_legacy():
-    return get_analytics()
 
-@app.route('/save-draft', methods=['POST'])
-def save_draft_legacy():
-    return save_draft()
-
-@app.route(f'/api/{API_VERSION}/analyze-generate-news', methods=['POST'])
-@rate_limit
 def analyze_generate_news():
     """Analyze previous posts style and generate news summary in one step"""
     try:
@@ -461,17 +573,60 @@ def analyze_generate_news():
             
         summary_length = data.get('summaryLength', 'medium')
         
-        result = direct_generator.analyze_and_generate(previous_posts, news_content, summary_length)
+        # Stream the style profile and summary text as NDJSON events when asked
+        stream = request.args.get('stream', 'false').lower() == 'true'
+        if stream or request.accept_mimetypes.best == 'application/x-ndjson':
+            direct_generator = get_direct_generator()
+            def events():
+                for event in direct_generator.analyze_and_generate_stream(previous_posts, news_content, summary_length):
+                    yield json.dumps(event, default=str) + '\n'
+            return Response(stream_with_context(events()), mimetype='application/x-ndjson'), 200
+        
+        if not is_deterministic_request(data):
+            result = get_direct_generator().analyze_and_generate(previous_posts, news_content, summary_length)
+            return api_response(data=result)
+
+        news_text = news_content
+        if isinstance(news_content, dict):
+            news_text = f"{news_content.get('title', '')} {news_content.get('description', news_content.get('summary', ''))}"
+        provider = os.getenv('LLM_PROVIDER', 'openai')
+        result = response_cache.get_or_compute(
+            make_cache_key(posts=previous_posts, news=news_content, length=summary_length, provider=provider),
+            lambda: get_direct_generator().analyze_and_generate(previous_posts, news_content, summary_length),
+            text=news_text,
+            namespace=make_cache_key(endpoint='analyze-generate-news', posts=previous_posts, length=summary_length,
+                                     provider=provider),
+            should_cache=is_cacheable_result
+        )
         return api_response(data=result)
     except Exception as e:
-        logger.error(f"Error in direct news generation: {e}")
-        logger.error(traceback.format_exc())
+        logger.error(f"Error in direct news generation: {e}", exc_info=True)
         return api_response(message=f"Error generating news summary: {str(e)}", status="error", code=500)
 
-# Legacy route for the new endpoint
-@app.route('/analyze-generate-news', methods=['POST'])
-def analyze_generate_news_legacy():
-    return analyze_generate_news()
+# Versioned API routes; each is also served at its legacy unversioned path
+# for existing frontend code
+API_ROUTES = [
+    ('analyze-voice', analyze_voice, ['POST']),
+    ('configure-sources', configure_sources, ['POST']),
+    ('fetch-content', fetch_content, ['GET']),
+    ('generate-content', generate_content, ['POST']),
+    ('approval-queue', get_approval_queue, ['GET']),
+    ('approve-post', approve_post, ['POST']),
+    ('analytics', get_analytics, ['GET']),
+    ('save-draft', save_draft, ['POST']),
+    ('analyze-generate-news', analyze_generate_news, ['POST']),
+]
+
+api_v1 = Blueprint('api_v1', __name__, url_prefix=f'/api/{API_VERSION}')
+
+for path, view, methods in API_ROUTES:
+    limited_view = rate_limit(view)
+    api_v1.add_url_rule(f'/{path}', endpoint=view.__name__,
+                        view_func=limited_view, methods=methods)
+    app.add_url_rule(f'/{path}', endpoint=f'{view.__name__}_legacy',
+                     view_func=limited_view, methods=methods)
+
+app.register_blueprint(api_v1)
 
 if __name__ == '__main__':
     # Parse command line arguments
@@ -506,6 +661,14 @@ if __name__ == '__main__':
     # Debug mode setting
     debug_mode = args.debug or os.environ.get('DEBUG', 'false').lower() == 'true'
     
+    # Outside debug/test mode, hand the process over to gunicorn (see gunicorn.conf.py)
+    # so slow LLM requests don't block the single-threaded development server
+    if not debug_mode and not args.test_mode:
+        if importlib.util.find_spec('gunicorn') is not None:
+            logger.info(f"Starting gunicorn on port {port}")
+            os.execvp(sys.executable, [sys.executable, '-m', 'gunicorn', '-b', f'0.0.0.0:{port}', 'app:app'])
+        logger.warning("gunicorn is not installed, falling back to the Flask development server")
+    
     # Use a different port if the primary one is in use
     for attempt in range(3):
         try:
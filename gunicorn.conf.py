@@ -0,0 +1,19 @@
+"""
+Gunicorn configuration for Enhanced LinkedIn Post Generator
+Picked up automatically by `gunicorn app:app` (Procfile, render.yaml) and
+by `python app.py` outside debug/test mode.
+"""
+import os
+import multiprocessing
+
+# Bind to the platform-assigned port
+bind = f"0.0.0.0:{os.environ.get('PORT', '5003')}"
+
+# Pre-forked workers; threads let one worker overlap several slow LLM calls
+workers = int(os.environ.get('WEB_CONCURRENCY', 2 * multiprocessing.cpu_count()))
+worker_class = 'gthread'
+threads = int(os.environ.get('GUNICORN_THREADS', 8))
+
+# LLM generation can take tens of seconds
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 120))
+keepalive = 5
@@ -1,27 +1,85 @@
 #!/usr/bin/env python3
 import os
+import sys
+import time
+import functools
 import google.generativeai as genai
 from dotenv import load_dotenv
 import json
 
+# Model catalog changes rarely; reuse the last listing for an hour
+CACHE_FILE = os.path.join(os.path.expanduser("~"), ".cache", "linkedout", "gemini_models.json")
+CACHE_TTL = 3600
+
 # Load environment variables from .env
 load_dotenv()
 
 # Configure the Gemini API with your API key
 genai.configure(api_key=os.getenv("GEMINI_API_KEY"))
 
-# Print the SDK version
-print(f"Google GenerativeAI SDK Version: {genai.__version__}")
-
-try:
-    # List all available models
-    models = genai.list_models()
-    print("\nAvailable Models:")
-    for model in models:
-        print(f"- Name: {model.name}")
-        print(f"  Display Name: {model.display_name}")
-        print(f"  Description: {model.description}")
-        print(f"  Generation Methods: {model.supported_generation_methods}")
-        print("")
-except Exception as e:
-    print(f"Error listing models: {e}")
+
+def to_dict(model):
+    """Convert an SDK model object into a JSON-serializable dict"""
+    return {
+        "name": model.name,
+        "display_name": model.display_name,
+        "description": model.description,
+        "supported_generation_methods": list(model.supported_generation_methods),
+    }
+
+
+def load_cached_models(ttl=CACHE_TTL):
+    """Return cached models if the cache file is fresher than ttl, else None"""
+    try:
+        with open(CACHE_FILE, "r") as f:
+            cached = json.load(f)
+        if time.time() - cached.get("fetched_at", 0) < ttl:
+            return cached["models"]
+    except (OSError, ValueError, KeyError):
+        pass
+    return None
+
+
+def save_cached_models(models):
+    """Write the model listing to the cache file"""
+    try:
+        os.makedirs(os.path.dirname(CACHE_FILE), exist_ok=True)
+        with open(CACHE_FILE, "w") as f:
+            json.dump({"fetched_at": time.time(), "models": models}, f, indent=2)
+    except OSError as e:
+        print(f"Warning: could not write model cache {CACHE_FILE}: {e}")
+
+
+@functools.lru_cache(maxsize=1)
+def list_models(refresh=False):
+    """List available Gemini models, using the on-disk cache when fresh
+
+    Args:
+        refresh (bool): Skip the cache and query the API
+
+    Returns:
+        tuple: Model dicts (see to_dict)
+    """
+    models = None if refresh else load_cached_models()
+    if models is None:
+        models = [to_dict(model) for model in genai.list_models()]
+        save_cached_models(models)
+    return tuple(models)
+
+
+if __name__ == "__main__":
+    # Print the SDK version
+    print(f"Google GenerativeAI SDK Version: {genai.__version__}")
+
+    try:
+        # List all available models
+        models = list_models(refresh="--refresh" in sys.argv[1:])
+        print("\nAvailable Models:")
+        for model in models:
+            print(f"- Name: {model['name']}")
+            print(f"  Display Name: {model['display_name']}")
+            print(f"  Description: {model['description']}")
+            print(f"  Generation Methods: {model['supported_generation_methods']}")
+            print("")
+    except Exception as e:
+        print(f"Error listing models: {e}")
@@ -5,11 +5,65 @@ This module handles relevance scoring and filtering of scraped articles.
 Updated: June 6, 2025
 """
 import re
+import heapq
+import hashlib
+import functools
+import threading
+from collections import OrderedDict
 from datetime import datetime
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, AsyncIterator, Iterator, List, Optional, Tuple, Union
 
 from .config import DEFAULT_ARTICLE_SCORER_CONFIG, _apply_env_overrides
 
+@functools.lru_cache(maxsize=4096)
+def _parse_pub_date(pub_date: Any) -> Optional[float]:
+    """Parse an ISO-8601 date string, cached since the same articles are re-scored on every refresh"""
+    try:
+        return datetime.fromisoformat(pub_date).timestamp()
+    except (ValueError, TypeError):
+        return None
+
+def _pub_timestamp(pub_date: Any) -> Optional[float]:
+    """Parse an ISO-8601 publication date into a Unix timestamp
+    
+    Returns:
+        float: Timestamp, or None if the date is missing or unparseable
+    """
+    try:
+        return _parse_pub_date(pub_date)
+    except TypeError:
+        # Unhashable value; it cannot be a date string either
+        return None
+
+@functools.lru_cache(maxsize=256)
+def _category_terms(category: str) -> Tuple[str, ...]:
+    """Lowercased comma-separated category terms, skipping short ones (<= 3 chars)"""
+    terms = (term.strip() for term in category.lower().split(','))
+    return tuple(term for term in terms if len(term) > 3)
+
+_TOKEN_RE = re.compile(r'\w+')
+
+# Factors produced by _relevance_factors; all but boost_terms are always present
+SCORING_FACTORS = ('recency', 'content_length', 'category_match', 'title_quality', 'boost_terms')
+
+@functools.lru_cache(maxsize=8192)
+def _token_signs(token: str) -> Tuple[int, ...]:
+    """+1/-1 per bit of a token's 64-bit hash, the per-token SimHash vote"""
+    h = int.from_bytes(hashlib.blake2b(token.encode('utf-8'), digest_size=8).digest(), 'big')
+    return tuple(1 if (h >> bit) & 1 else -1 for bit in range(64))
+
+@functools.lru_cache(maxsize=1024)
+def _simhash(text: str) -> Optional[int]:
+    """64-bit SimHash fingerprint of text (None if it has no tokens)
+    
+    Near-identical texts produce fingerprints with a small Hamming distance.
+    """
+    tokens = _TOKEN_RE.findall(text.lower())
+    if not tokens:
+        return None
+    totals = [sum(column) for column in zip(*map(_token_signs, tokens))]
+    return sum(1 << bit for bit, total in enumerate(totals) if total > 0)
+
 class ArticleScorer:
     """
     A utility class that handles article relevance scoring and filtering
@@ -30,6 +84,48 @@ class ArticleScorer:
         # Override with provided config
         if config:
             self.config.update(config)
+        
+        self._compile_terms()
+        self._normalize_weights()
+        
+        # Cached interest orderings: (terms, article keys) -> index permutation
+        self._order_cache = OrderedDict()
+        self._order_cache_size = 128
+        self._order_lock = threading.Lock()
+    
+    def _compile_terms(self):
+        """Lowercase the term lists once and compile excluded/required terms
+        into single regex alternations (one C-level scan instead of a Python loop)"""
+        self._excluded_lc = tuple(term.lower() for term in self.config['excluded_terms'])
+        self._required_lc = tuple(term.lower() for term in self.config['required_terms'])
+        self._boost_lc = tuple(term.lower() for term in self.config['boost_terms'])
+        self._excluded_re = self._terms_pattern(self._excluded_lc)
+        self._required_re = self._terms_pattern(self._required_lc)
+        # Only build the lowercased title + summary up front when a term list needs it
+        self._need_haystack = bool(self._excluded_lc or self._required_lc or self._boost_lc)
+    
+    def _normalize_weights(self):
+        """Pre-normalize factor weights so scoring is a plain dot product
+        
+        Every factor except boost_terms is always present, so only two weight
+        sets are needed: with and without a boost-term match.
+        """
+        def normalized(keys):
+            total = sum(self.config['weights'][key] for key in keys)
+            if total <= 0:
+                return ()
+            return tuple((key, self.config['weights'][key] / total) for key in keys)
+        
+        keys = [key for key in self.config['weights'] if key in SCORING_FACTORS]
+        self._weights_with_boost = normalized(keys)
+        self._weights_without_boost = normalized([key for key in keys if key != 'boost_terms'])
+    
+    @staticmethod
+    def _terms_pattern(terms):
+        """Compile a substring-matching alternation of terms, or None if empty"""
+        if not terms:
+            return None
+        return re.compile('|'.join(map(re.escape, terms)))
     
     def process_articles(self, articles: List[Dict[str, Any]], source_category: str = '') -> List[Dict[str, Any]]:
         """Process articles: filter, score, rank, and limit
@@ -43,78 +139,142 @@ class ArticleScorer:
         """
         if not articles:
             return []
+        
+        # Top-K selection is O(N log K) and, like a stable sort, keeps input order on ties
+        return heapq.nlargest(self.config['max_articles_per_source'],
+                              self.score_articles(articles, source_category),
+                              key=lambda x: x['relevance_score'])
+    
+    async def process_articles_async(self, articles: AsyncIterator[Dict[str, Any]],
+                                     source_category: str = '') -> List[Dict[str, Any]]:
+        """Process articles as an async source yields them
+        
+        Same filters, scoring and limit as process_articles, but each article
+        is scored on arrival so scoring overlaps with fetching the rest.
+        
+        Args:
+            articles (async iterable): Raw articles, e.g. yielded as fetches complete
+            source_category (str): Category of the source
             
-        processed = []
+        Returns:
+            list: Processed and ranked articles
+        """
         now = datetime.now()
+        now_ts = now.timestamp()
+        scored = []
+        async for article in articles:
+            if self._score_article(article, source_category, now, now_ts):
+                scored.append(article)
         
+        return heapq.nlargest(self.config['max_articles_per_source'], scored,
+                              key=lambda x: x['relevance_score'])
+    
+    def score_articles(self, articles: List[Dict[str, Any]], source_category: str = '') -> Iterator[Dict[str, Any]]:
+        """Filter and score articles lazily, in input order
+        
+        Args:
+            articles (list): Raw articles to process
+            source_category (str): Category of the source
+            
+        Yields:
+            dict: Articles passing the filters and relevance threshold,
+                with relevance_score set
+        """
+        now = datetime.now()
+        now_ts = now.timestamp()
         for article in articles:
-            # Skip if article has no content or title
-            if not article.get('title') or not article.get('content'):
-                continue
-                
-            # Check publication date
-            try:
-                pub_date = datetime.fromisoformat(article.get('pub_date', now.isoformat()))
-                age_days = (now - pub_date).days
-                if age_days > self.config['max_article_age']:
-                    continue
-            except (ValueError, TypeError):
-                # Default to current time if date parsing fails
-                article['pub_date'] = now.isoformat()
-                
+            if self._score_article(article, source_category, now, now_ts):
+                yield article
+    
+    def _score_article(self, article: Dict[str, Any], source_category: str,
+                       now: datetime, now_ts: float) -> bool:
+        """Filter one article and set its relevance_score if it is kept
+        
+        Filters run cheapest first: field checks, term scans, then date parsing.
+        
+        Returns:
+            bool: True if the article passes the filters and relevance threshold
+        """
+        # Skip if article has no content or title
+        if not article.get('title') or not article.get('content'):
+            return False
+        
+        # Lowercased title + summary, shared by the term filters and scoring
+        haystack = None
+        if self._need_haystack:
+            haystack = (article['title'] + ' ' + article.get('summary', '')).lower()
+            
             # Filter by excluded terms
-            if self.config['excluded_terms']:
-                content = (article['title'] + ' ' + article.get('summary', '')).lower()
-                if any(term.lower() in content for term in self.config['excluded_terms']):
-                    continue
+            if self._excluded_re and self._excluded_re.search(haystack):
+                return False
                     
             # Filter by required terms (if any)
-            if self.config['required_terms']:
-                content = (article['title'] + ' ' + article.get('summary', '')).lower()
-                if not any(term.lower() in content for term in self.config['required_terms']):
-                    continue
+            if self._required_re and not self._required_re.search(haystack):
+                return False
             
-            # Calculate relevance score
-            relevance_score = self.calculate_relevance_score(article, source_category)
-            if relevance_score < self.config['relevance_threshold']:
-                continue
-                
-            # Add relevance score to article
-            article['relevance_score'] = relevance_score
-            
-            # Add to processed articles
-            processed.append(article)
-            
-        # Sort by relevance score (descending)
-        processed.sort(key=lambda x: x['relevance_score'], reverse=True)
+        # Check publication date (whole days, as timedelta.days would count them);
+        # undated articles keep an unknown age and get the neutral recency score
+        age_hours = None
+        if 'pub_date' in article:
+            pub_ts = _pub_timestamp(article['pub_date'])
+            if pub_ts is None:
+                # Default to current time if date parsing fails
+                article['pub_date'] = now.isoformat()
+                pub_ts = now_ts
+            elif (now_ts - pub_ts) // 86400 > self.config['max_article_age']:
+                return False
+            age_hours = (now_ts - pub_ts) / 3600
         
-        # Limit to max articles
-        return processed[:self.config['max_articles_per_source']]
+        # Calculate relevance score and drop articles below the threshold
+        relevance_score = self.calculate_relevance_score(article, source_category, haystack=haystack,
+                                                         age_hours=age_hours, now_ts=now_ts)
+        if relevance_score < self.config['relevance_threshold']:
+            return False
+        
+        # Add relevance score to article
+        article['relevance_score'] = relevance_score
+        return True
     
-    def calculate_relevance_score(self, article: Dict[str, Any], category: str) -> float:
+    def calculate_relevance_score(self, article: Dict[str, Any], category: str,
+                                  haystack: Optional[str] = None, age_hours: Optional[float] = None,
+                                  now_ts: Optional[float] = None) -> float:
         """Calculate relevance score for an article
         
         Args:
             article (dict): Article to score
             category (str): Source category
+            haystack (str, optional): Precomputed lowercase title + summary
+            age_hours (float, optional): Precomputed article age in hours
+            now_ts (float, optional): Current timestamp, so a batch of calls
+                can share one clock reading
             
         Returns:
             float: Relevance score (0-1)
         """
-        # Start with base score
-        score = 0.5
+        factors = self._relevance_factors(article, category, haystack=haystack, age_hours=age_hours, now_ts=now_ts)
+        return self._weighted_score(factors)
+    
+    def _relevance_factors(self, article: Dict[str, Any], category: str,
+                           haystack: Optional[str] = None, age_hours: Optional[float] = None,
+                           now_ts: Optional[float] = None) -> Dict[str, float]:
+        """Compute the individual scoring factors (0-1) for an article
         
+        Factors that don't apply (e.g. boost terms with no match) are omitted.
+        """
         # Scoring factors
         factors = {}
         
         # 1. Recency factor (newer articles score higher)
-        try:
-            pub_date = datetime.fromisoformat(article.get('pub_date', ''))
-            now = datetime.now()
-            age_hours = (now - pub_date).total_seconds() / 3600
+        if age_hours is None:
+            pub_ts = _pub_timestamp(article.get('pub_date', ''))
+            if pub_ts is not None:
+                if now_ts is None:
+                    now_ts = datetime.now().timestamp()
+                age_hours = (now_ts - pub_ts) / 3600
+        if age_hours is not None:
             age_factor = max(0, 1 - (age_hours / (24 * self.config['max_article_age'])))
             factors['recency'] = age_factor
-        except (ValueError, TypeError):
+        else:
             factors['recency'] = 0.5
             
         # 2. Content length factor
@@ -126,14 +286,15 @@ class ArticleScorer:
         
         # 3. Category relevance factor
         if category:
-            cat_terms = category.lower().split(',')
-            cat_terms = [term.strip() for term in cat_terms if len(term.strip()) > 3]  # Skip short terms
+            # Parsed once per distinct category string; every article of a source shares it
+            cat_terms = _category_terms(category)
             if cat_terms:
                 # Get text to search in
-                text = (article.get('title', '') + ' ' + article.get('summary', '')).lower()
+                if haystack is None:
+                    haystack = (article.get('title', '') + ' ' + article.get('summary', '')).lower()
                 
                 # Count matching terms
-                matches = sum(1 for term in cat_terms if term in text)
+                matches = sum(1 for term in cat_terms if term in haystack)
                 cat_factor = min(1, matches / len(cat_terms)) if matches > 0 else 0.3
                 factors['category_match'] = cat_factor
             else:
@@ -144,11 +305,11 @@ class ArticleScorer:
         # 4. Title quality factor (penalize clickbait)
         title = article.get('title', '')
         if title:
-            # Penalize all-caps titles
-            if title == title.upper() and len(title) > 10:
+            # Penalize all-caps titles (isupper scans in place, no uppercased copy)
+            if title.isupper() and len(title) > 10:
                 factors['title_quality'] = 0.3
             # Penalize excessive punctuation
-            elif len(re.findall(r'[!?]', title)) > 2:
+            elif title.count('!') + title.count('?') > 2:
                 factors['title_quality'] = 0.4
             # Penalize very short titles
             elif len(title) < 20:
@@ -159,31 +320,33 @@ class ArticleScorer:
             factors['title_quality'] = 0.5
             
         # 5. Boost terms factor
-        if self.config['boost_terms']:
-            text = (article.get('title', '') + ' ' + article.get('summary', '')).lower()
-            boost_matches = sum(1 for term in self.config['boost_terms'] if term.lower() in text)
+        if self._boost_lc:
+            if haystack is None:
+                haystack = (article.get('title', '') + ' ' + article.get('summary', '')).lower()
+            boost_matches = sum(1 for term in self._boost_lc if term in haystack)
             if boost_matches > 0:
                 factors['boost_terms'] = min(1, 0.5 + (0.1 * boost_matches))
                 
-        # Calculate weighted average
-        weights = self.config['weights']
+        return factors
+    
+    def _weighted_score(self, factors: Dict[str, float]) -> float:
+        """Combine factors into a relevance score
         
-        weighted_sum = 0
-        total_weight = 0
+        The score is the weighted average of the factors present (0.5 if none
+        apply), computed as a dot product with the pre-normalized weights.
         
-        for factor, weight in weights.items():
-            if factor in factors:
-                weighted_sum += factors[factor] * weight
-                total_weight += weight
-                
-        # Normalize
-        if total_weight > 0:
-            score = weighted_sum / total_weight
+        Args:
+            factors (dict): Factor dict from _relevance_factors
             
-        return score
+        Returns:
+            float: Relevance score (0-1)
+        """
+        weights = self._weights_with_boost if 'boost_terms' in factors else self._weights_without_boost
+        return sum(factors[key] * weight for key, weight in weights) if weights else 0.5
     
     def order_articles_by_relevance(self, articles: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-        """Order articles by relevance score, handling duplicates
+        """Order articles by relevance score, removing duplicate URLs and
+        near-duplicate content (SimHash distance below near_duplicate_distance)
         
         Args:
             articles (list): Articles to order
@@ -194,23 +357,10 @@ class ArticleScorer:
         if not articles:
             return []
         
-        # First, deduplicate articles by URL
-        unique_urls = {}
-        for article in articles:
-            url = article.get('url', '')
-            if url:
-                # If we have this URL already, keep the one with higher relevance
-                if url in unique_urls:
-                    if article.get('relevance_score', 0) > unique_urls[url].get('relevance_score', 0):
-                        unique_urls[url] = article
-                else:
-                    unique_urls[url] = article
-        
-        # Get unique articles
-        unique_articles = list(unique_urls.values())
-        
-        # Sort by relevance score (primary) and date (secondary)
-        unique_articles.sort(
+        # Sort by relevance score (primary) and date (secondary), then keep the
+        # first (highest-ranked) article seen for each URL in a single pass
+        ranked = sorted(
+            (article for article in articles if article.get('url', '')),
             key=lambda x: (
                 x.get('relevance_score', 0),
                 x.get('pub_date', '2000-01-01')
@@ -218,4 +368,77 @@ class ArticleScorer:
             reverse=True
         )
         
+        seen_urls = set()
+        kept_fingerprints = []
+        max_distance = self.config['near_duplicate_distance']
+        unique_articles = []
+        for article in ranked:
+            url = article['url']
+            if url in seen_urls:
+                continue
+            seen_urls.add(url)
+            
+            # Drop near-duplicates (same story republished under another URL)
+            if max_distance:
+                fingerprint = _simhash(article.get('title', '') + ' ' + article.get('content', '')[:4000])
+                if fingerprint is not None:
+                    if any(bin(fingerprint ^ kept).count('1') < max_distance for kept in kept_fingerprints):
+                        continue
+                    kept_fingerprints.append(fingerprint)
+            
+            unique_articles.append(article)
+        
         return unique_articles
+    
+    def order_articles_by_interests(self, articles: List[Dict[str, Any]],
+                                    interests: Union[str, List[str]]) -> List[Dict[str, Any]]:
+        """Order articles by relevance, boosting those matching the interests
+        
+        Orderings are cached per (interests, articles) so repeated requests
+        with the same interest filter skip re-scoring. Articles are not modified.
+        
+        Args:
+            articles (list): Articles to order
+            interests (str or list): Comma-separated string or list of terms
+            
+        Returns:
+            list: Ordered articles with duplicates removed
+        """
+        articles = self.order_articles_by_relevance(articles)
+        terms = self._normalize_terms(interests)
+        if not terms or not articles:
+            return articles
+        
+        key = (terms, tuple((a.get('url', ''), a.get('relevance_score', 0)) for a in articles))
+        with self._order_lock:
+            order = self._order_cache.get(key)
+            if order is not None:
+                self._order_cache.move_to_end(key)
+                
+        if order is None:
+            order = self._boosted_order(articles, terms)
+            with self._order_lock:
+                self._order_cache[key] = order
+                while len(self._order_cache) > self._order_cache_size:
+                    self._order_cache.popitem(last=False)
+                    
+        return [articles[i] for i in order]
+    
+    @staticmethod
+    def _normalize_terms(interests: Union[str, List[str]]) -> Tuple[str, ...]:
+        """Lowercase, strip and de-duplicate interest terms into a hashable key"""
+        if isinstance(interests, str):
+            interests = interests.split(',')
+        return tuple(sorted({term.strip().lower() for term in interests if term and term.strip()}))
+    
+    def _boosted_order(self, articles: List[Dict[str, Any]], terms: Tuple[str, ...]) -> List[int]:
+        """Index permutation sorting articles by relevance plus weighted term boost"""
+        weight = self.config['weights'].get('boost_terms', 0)
+        scores = []
+        for article in articles:
+            text = (article.get('title', '') + ' ' + article.get('summary', '')).lower()
+            matches = sum(1 for term in terms if term in text)
+            boost = min(1, 0.5 + (0.1 * matches)) if matches > 0 else 0
+            scores.append(article.get('relevance_score', 0) + weight * boost)
+        # Stable sort keeps the relevance/date order among equal scores
+        return sorted(range(len(articles)), key=lambda i: scores[i], reverse=True)
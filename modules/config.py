@@ -7,8 +7,13 @@ consistency and ease of modification.
 Updated: June 8, 2025
 """
 import os
+import re
+import copy
 import json
 import logging
+import functools
+from collections.abc import Mapping
+from types import MappingProxyType
 
 logger = logging.getLogger(__name__)
 
@@ -21,65 +26,101 @@ def _apply_env_overrides(target_config: dict, env_prefix: str) -> dict:
         env_prefix (str): The prefix for environment variable names (e.g., "WEBSCRAPER").
 
     Returns:
-        dict: The updated configuration dictionary.
+        dict: The updated configuration dictionary (target_config itself if
+            no environment variable carries the prefix).
     """
+    # One scan of the environment; the common case is no overrides at all
+    prefix = f"{env_prefix.upper()}_"
+    present = {name for name in os.environ if name.startswith(prefix)}
+    if not present:
+        return target_config
+
+    env_items = []
+    for key, default_value in target_config.items():
+        env_var_name = f"{prefix}{key.upper()}"
+        if env_var_name in present:
+            # Frozen defaults (MappingProxyType) parse like the dicts they wrap
+            original_type = dict if isinstance(default_value, Mapping) else type(default_value)
+            env_items.append((key, env_var_name, original_type, os.environ[env_var_name]))
+
+    if not env_items:
+        return target_config
+
     config_copy = target_config.copy() # Work on a copy
-    for key, default_value in config_copy.items():
-        env_var_name = f"{env_prefix.upper()}_{key.upper()}"
-        env_value_str = os.getenv(env_var_name)
-
-        if env_value_str is not None:
-            original_type = type(default_value)
-            try:
-                if original_type == bool:
-                    parsed_value = env_value_str.lower() in ['true', '1', 'yes', 'y']
-                elif original_type == int:
-                    parsed_value = int(env_value_str)
-                elif original_type == float:
-                    parsed_value = float(env_value_str)
-                elif original_type == list:
-                    if env_value_str.startswith('[') and env_value_str.endswith(']'):
-                        try:
-                            parsed_value = json.loads(env_value_str)
-                            if not isinstance(parsed_value, list):
-                                raise ValueError("JSON was not a list.")
-                        except json.JSONDecodeError:
-                            logger.warning(
-                                f"Env var {env_var_name} looks like JSON list but failed to parse: '{env_value_str}'. "
-                                f"Falling back to comma-separated.")
-                            # Fallback for non-JSON or malformed JSON lists
-                            parsed_value = [item.strip() for item in env_value_str.split(',')]
-                    else:
-                        parsed_value = [item.strip() for item in env_value_str.split(',')]
-                elif original_type == dict:
+    # Parsed values are cached per environment snapshot; copy so callers can mutate them
+    config_copy.update(copy.deepcopy(_parse_env_overrides(tuple(env_items))))
+    return config_copy
+
+
+@functools.lru_cache(maxsize=32)
+def _parse_env_overrides(env_items: tuple) -> dict:
+    """Parse environment override strings into typed config values.
+
+    Cached on the (key, env var, type, raw value) tuples, so repeated
+    construction with an unchanged environment skips parsing and logging.
+
+    Args:
+        env_items (tuple): (key, env_var_name, original_type, env_value_str) entries.
+
+    Returns:
+        dict: Parsed values for the keys that could be parsed.
+    """
+    parsed = {}
+    for key, env_var_name, original_type, env_value_str in env_items:
+        try:
+            if original_type == bool:
+                parsed_value = env_value_str.lower() in ['true', '1', 'yes', 'y']
+            elif original_type == int:
+                parsed_value = int(env_value_str)
+            elif original_type == float:
+                parsed_value = float(env_value_str)
+            elif original_type == list:
+                if env_value_str.startswith('[') and env_value_str.endswith(']'):
                     try:
                         parsed_value = json.loads(env_value_str)
-                        if not isinstance(parsed_value, dict):
-                            raise ValueError("JSON was not a dict.")
-                    except json.JSONDecodeError as e:
+                        if not isinstance(parsed_value, list):
+                            raise ValueError("JSON was not a list.")
+                    except json.JSONDecodeError:
                         logger.warning(
-                            f"Env var {env_var_name} for dict type failed to parse as JSON: '{env_value_str}'. "
-                            f"Error: {e}. Using default for this key.")
-                        continue # Skip update for this key, use default
-                else: # Default to string, though most should be handled above
-                    parsed_value = env_value_str
-                
-                config_copy[key] = parsed_value
-                logger.info(f"Config: Overrode '{key}' with value from env var {env_var_name}.")
-            except ValueError as e:
-                logger.warning(
-                    f"Env var {env_var_name} ('{env_value_str}') could not be parsed to type {original_type.__name__}. "
-                    f"Error: {e}. Using default value '{default_value}' for '{key}'.")
-    return config_copy
+                            f"Env var {env_var_name} looks like JSON list but failed to parse: '{env_value_str}'. "
+                            f"Falling back to comma-separated.")
+                        # Fallback for non-JSON or malformed JSON lists
+                        parsed_value = [item.strip() for item in env_value_str.split(',')]
+                else:
+                    parsed_value = [item.strip() for item in env_value_str.split(',')]
+            elif original_type == dict:
+                try:
+                    parsed_value = json.loads(env_value_str)
+                    if not isinstance(parsed_value, dict):
+                        raise ValueError("JSON was not a dict.")
+                except json.JSONDecodeError as e:
+                    logger.warning(
+                        f"Env var {env_var_name} for dict type failed to parse as JSON: '{env_value_str}'. "
+                        f"Error: {e}. Using default for this key.")
+                    continue # Skip update for this key, use default
+            else: # Default to string, though most should be handled above
+                parsed_value = env_value_str
 
+            parsed[key] = parsed_value
+            logger.info(f"Config: Overrode '{key}' with value from env var {env_var_name}.")
+        except ValueError as e:
+            logger.warning(
+                f"Env var {env_var_name} ('{env_value_str}') could not be parsed to type {original_type.__name__}. "
+                f"Error: {e}. Using default value for '{key}'.")
+    return parsed
 
-DEFAULT_WEBSCRAPER_CONFIG = {
+
+# Defaults are read-only; modules take a .copy() (a plain dict) and update that
+DEFAULT_WEBSCRAPER_CONFIG = MappingProxyType({
     # Scraping settings
     'request_timeout': 15,  # seconds
     'user_agent': 'EnhancedLinkedInScraper/2.0',
-    'max_workers': 4,      # parallel threads
+    'max_workers': 8,      # parallel threads (capped at pool_maxsize)
+    'fetch_timeout': 45,   # seconds to wait for a full multi-source fetch
     'max_redirects': 3,
     'retry_count': 2,
+    'pool_connections': 10,  # hosts kept in the shared session's pool
+    'pool_maxsize': 20,      # keep-alive connections per host
     
     # Content filtering
     'min_article_length': 300,  # characters
@@ -103,9 +144,25 @@ DEFAULT_WEBSCRAPER_CONFIG = {
         r'account', r'sign-?in', r'login', r'newsletter',
         r'404', r'jobs', r'career', r'shop'
     ]
-}
+})
+
+
+@functools.lru_cache(maxsize=16)
+def compile_url_patterns(patterns: tuple):
+    """Compile URL regexes into one case-insensitive alternation.
+
+    Args:
+        patterns (tuple): Regex strings (a tuple so results can be cached).
 
-DEFAULT_ARTICLE_SCORER_CONFIG = {
+    Returns:
+        re.Pattern or None: Combined pattern, or None if there are no patterns.
+    """
+    if not patterns:
+        return None
+    return re.compile('|'.join(f'(?:{p})' for p in patterns), re.IGNORECASE)
+
+
+DEFAULT_ARTICLE_SCORER_CONFIG = MappingProxyType({
     # Content filtering (often inherited/overridden from WebScraper config)
     'min_article_length': 300,  # characters
     'max_article_age': 7,       # days
@@ -117,12 +174,24 @@ DEFAULT_ARTICLE_SCORER_CONFIG = {
     'required_terms': [],
     'boost_terms': [],
     
+    # Near-duplicate suppression: articles whose title+content SimHash differs
+    # from a higher-ranked article's by fewer bits than this are dropped (0 = off)
+    'near_duplicate_distance': 3,
+    
     # Relevance factors weights used in scoring algorithm
-    'weights': {
+    'weights': MappingProxyType({
         'recency': 0.4,
         'content_length': 0.1,
         'category_match': 0.3,
         'title_quality': 0.1,
         'boost_terms': 0.3
-    }
-}
+    })
+})
+
+DEFAULT_LLM_CACHE_CONFIG = MappingProxyType({
+    # Response cache settings (see modules/llm_cache.py)
+    'maxsize': 500,               # entries kept in the in-process cache
+    'ttl': 3600,                  # seconds before a cached completion expires
+    'similarity_threshold': 0.92, # cosine similarity needed for a semantic hit
+    'redis_url': ''               # shared backend; falls back to REDIS_URL, then in-process
+})
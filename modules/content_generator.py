@@ -8,39 +8,210 @@ import re
 from datetime import datetime
 import random
 import logging
+import time
+import uuid
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from enum import Enum
+from types import MappingProxyType
 from modules.openai_wrapper import OpenAIWrapper
-from modules.llm_provider import OpenAIProvider, GeminiProvider
+from modules.llm_cache import LLMCache, make_cache_key
+from modules.llm_provider import completion_text
+
+# tiktoken is optional; without it article content is capped by characters
+try:
+    import tiktoken
+except ImportError:
+    tiktoken = None
 
 logger = logging.getLogger('linkedin-generator')
 
+# Part of every completion cache key; bump when the prompt templates change
+PROMPT_VERSION = '3'
+
+DEFAULT_HASHTAGS = ["#leadership", "#innovation", "#professional"]
+_HASHTAG_RE = re.compile(r'#\w+')
+_WORD_RE = re.compile(r'\w+')
+_JSON_OBJECT_RE = re.compile(r'\{.*\}', re.DOTALL)
+
+# Concurrent completions per generate_many() call; providers batch server-side,
+# so throughput scales with client concurrency up to the account rate limit
+DEFAULT_MAX_CONCURRENCY = int(os.getenv("GENERATION_MAX_CONCURRENCY", "8"))
+
+# Article content sent to the model: a token budget when tiktoken is available,
+# otherwise a character cap (~4 characters per token for English text)
+MAX_CONTENT_TOKENS = 500
+MAX_CONTENT_CHARS = 2000
+
+# Posts are sampled at this temperature unless the caller passes another. Only
+# temperature-0 completions are cached unless the generator is created with
+# cache_posts=True, so regenerating a post gets fresh wording by default
+POST_TEMPERATURE = 0.7
+
+# Minimum seconds between streamed text updates, so clients are not flooded per token
+STREAM_FLUSH_INTERVAL = 0.04
+
+class PostType(str, Enum):
+    """Supported post types; members compare and hash equal to their plain string names"""
+    PROFESSIONAL_INSIGHT = "Professional Insight"
+    QUICK_UPDATE = "Quick Update"
+    QUESTION_STARTER = "Question Starter"
+    STORY_FORMAT = "Story Format"
+    INDUSTRY_ANALYSIS = "Industry Analysis"
+
+    # Format as the plain name in prompts and logs on every Python version
+    __str__ = str.__str__
+
+DEFAULT_POST_TYPE = PostType.PROFESSIONAL_INSIGHT
+
+POST_TYPE_DESCRIPTIONS = MappingProxyType({
+    PostType.PROFESSIONAL_INSIGHT: "Share professional expertise with a thought leadership angle",
+    PostType.QUICK_UPDATE: "Brief status update on professional activities or industry trends",
+    PostType.QUESTION_STARTER: "Ask an engaging question to start a conversation with your network",
+    PostType.STORY_FORMAT: "Share a narrative about a professional experience or learning",
+    PostType.INDUSTRY_ANALYSIS: "Analyze recent industry developments with your expert perspective"
+})
+
+# Completion budget per post type; short formats still need room for the JSON
+# wrapper and hashtags, so they are not cut below what a full response takes
+DEFAULT_MAX_TOKENS = 800
+POST_TYPE_MAX_TOKENS = MappingProxyType({
+    PostType.QUICK_UPDATE: 500,
+    PostType.QUESTION_STARTER: 500,
+})
+
+# Base engagement scores by post type
+_POST_TYPE_BASE_SCORES = MappingProxyType({
+    PostType.PROFESSIONAL_INSIGHT: 7.5,
+    PostType.QUICK_UPDATE: 6.5,
+    PostType.QUESTION_STARTER: 8.0,
+    PostType.STORY_FORMAT: 7.8,
+    PostType.INDUSTRY_ANALYSIS: 7.2
+})
+
+# Mock-mode post templates per post type
+_MOCK_TEMPLATES = MappingProxyType({
+    PostType.PROFESSIONAL_INSIGHT: (
+        "I just came across this fascinating article on {title}. It's a great reminder that {insight}. What are your thoughts on this approach? {url}",
+        "Having worked in this field for years, the insights from this article on {title} align with what I've observed. Key takeaway: {insight}. #ThoughtLeadership {url}"
+    ),
+    PostType.QUICK_UPDATE: (
+        "Quick industry update: {title} - {insight} Read more: {url}",
+        "Just saw this and had to share: {title} - What caught my attention was {insight}. {url}"
+    ),
+    PostType.QUESTION_STARTER: (
+        "After reading this article on {title}, I'm curious: {question} What's your experience with this? {url}",
+        "This got me thinking: {question} - The article that sparked this question: {title}. {url}"
+    ),
+    PostType.STORY_FORMAT: (
+        "When I first started in this industry, {insight} wasn't common knowledge. Now, as this article on {title} shows, it's becoming standard practice. Here's what I've learned along the way... {url}",
+        "I remember when {insight} was considered radical thinking. Now it's mainstream as shown in this piece on {title}. {url}"
+    ),
+    PostType.INDUSTRY_ANALYSIS: (
+        "Looking at the trends discussed in this article on {title}, three key patterns emerge: 1) {insight} 2) Increasing focus on innovation 3) Shift toward sustainable practices. What other patterns are you noticing? {url}",
+        "Market analysis: This piece on {title} highlights {insight}. I'm seeing similar patterns across the sector. Thoughts? {url}"
+    )
+})
+
+# Generic insights and questions for mock templates
+_MOCK_INSIGHTS = (
+    "focusing on customer experience drives better long-term results",
+    "data-driven decision making is essential for growth",
+    "adaptability is becoming the most valued organizational trait",
+    "building authentic relationships is still the foundation of business success",
+    "innovation happens at the intersection of different disciplines"
+)
+
+_MOCK_QUESTIONS = (
+    "How are you implementing these ideas in your organization?",
+    "Do you think this trend will continue over the next 5 years?",
+    "What's been your biggest challenge when applying similar approaches?",
+    "How does this compare to your experience in the industry?",
+    "Is this a game-changer or just another passing trend?"
+)
+
+_MOCK_HASHTAGS = ("#Innovation", "#Leadership", "#ProfessionalDevelopment", "#Industry")
+
+@functools.lru_cache(maxsize=4)
+def _token_encoding(model):
+    """tiktoken encoding for a model, or None if tiktoken or its data is unavailable"""
+    if tiktoken is None:
+        return None
+    try:
+        return tiktoken.encoding_for_model(model)
+    except Exception as e:
+        # Unknown model or encoding files that cannot be downloaded
+        logger.warning("ContentGenerator: No tiktoken encoding for %s (%s); truncating by characters", model, e)
+        return None
+
+def truncate_content(content, model="gpt-3.5-turbo", max_tokens=MAX_CONTENT_TOKENS, keep_end=False):
+    """
+    Shorten text to a prompt budget
+    
+    Args:
+        content (str): Text to shorten (article content by default)
+        model (str): Model whose tokenizer measures the budget
+        max_tokens (int): Token budget
+        keep_end (bool): Keep the end of the text instead of the start
+        
+    Returns:
+        str: Content cut to max_tokens tokens (or MAX_CONTENT_CHARS characters
+            per MAX_CONTENT_TOKENS without tiktoken), marked with "..." where shortened
+    """
+    encoding = _token_encoding(model)
+    if encoding is None:
+        max_chars = max_tokens * MAX_CONTENT_CHARS // MAX_CONTENT_TOKENS
+        if len(content) <= max_chars:
+            return content
+        return "..." + content[-max_chars:] if keep_end else content[:max_chars] + "..."
+    
+    # Text short enough that it cannot exceed the budget skips encoding
+    if len(content) <= max_tokens:
+        return content
+    tokens = encoding.encode(content)
+    if len(tokens) <= max_tokens:
+        return content
+    return "..." + encoding.decode(tokens[-max_tokens:]) if keep_end else encoding.decode(tokens[:max_tokens]) + "..."
+
+def _new_post_id():
+    """Random 53-bit post id; ids round-trip through JavaScript, whose numbers are exact only up to 2**53"""
+    return uuid.uuid4().int >> 75
+
 class ContentGenerator:
     """Generates personalized LinkedIn posts based on voice profile and source content."""
     
-    def __init__(self):
-        """Initialize the content generator with OpenAI client if available."""
+    def __init__(self, cache=None, cache_posts=False):
+        """Initialize the content generator with OpenAI client if available.
+        
+        Args:
+            cache (LLMCache, optional): Completion cache; a new one is created if omitted
+            cache_posts (bool): Also cache sampled (temperature above 0) post completions
+        """
         # Use our OpenAI wrapper to handle initialization safely
         self.openai_wrapper = OpenAIWrapper()
         self.mock_mode = self.openai_wrapper.is_mock()
         self.client = self.openai_wrapper.get_client()
         provider_name = os.getenv("LLM_PROVIDER", "openai").lower()
-        logger.info(f"ContentGenerator: LLM_PROVIDER environment variable set to: '{provider_name}' (defaulting to 'openai' if not set).")
+        logger.info("ContentGenerator: LLM_PROVIDER environment variable set to: '%s' (defaulting to 'openai' if not set).", provider_name)
 
+        # Providers are imported on demand so only the selected SDK gets loaded
         if provider_name == "gemini":
             try:
-                # Already imported at the top level
-                # from modules.llm_provider import GeminiProvider
+                from modules.llm_provider import get_provider
                 gemini_api_key = os.getenv("GEMINI_API_KEY")
                 if not gemini_api_key:
                     logger.warning("ContentGenerator: LLM_PROVIDER is 'gemini' but GEMINI_API_KEY is not set. Falling back to mock/OpenAI if possible or may error.")
-                self.llm = GeminiProvider(gemini_api_key)
+                self.llm = get_provider("gemini", gemini_api_key)
                 logger.info("ContentGenerator: Successfully initialized GeminiProvider.")
             except Exception as e:
-                logger.error(f"ContentGenerator: Failed to initialize GeminiProvider: {e}. Falling back to OpenAIProvider.")
+                logger.error("ContentGenerator: Failed to initialize GeminiProvider: %s. Falling back to OpenAIProvider.", e)
+                from modules.llm_provider import OpenAIProvider
                 self.llm = OpenAIProvider(self.client) # Fallback
                 logger.info("ContentGenerator: Initialized OpenAIProvider as fallback.")
         else:
             if provider_name != "openai":
-                logger.warning(f"ContentGenerator: Unknown LLM_PROVIDER '{provider_name}', defaulting to OpenAI.")
+                logger.warning("ContentGenerator: Unknown LLM_PROVIDER '%s', defaulting to OpenAI.", provider_name)
+            from modules.llm_provider import OpenAIProvider
             self.llm = OpenAIProvider(self.client)
             logger.info("ContentGenerator: Initialized OpenAIProvider (default or explicit).")
 
@@ -49,56 +220,106 @@ class ContentGenerator:
         else:
             logger.info("ContentGenerator: OpenAIWrapper indicates non-mock mode (e.g., OPENAI_API_KEY present).")
 
-        self.post_types = {
-            "Professional Insight": "Share professional expertise with a thought leadership angle",
-            "Quick Update": "Brief status update on professional activities or industry trends",
-            "Question Starter": "Ask an engaging question to start a conversation with your network",
-            "Story Format": "Share a narrative about a professional experience or learning",
-            "Industry Analysis": "Analyze recent industry developments with your expert perspective"
-        }
+        self.post_types = POST_TYPE_DESCRIPTIONS
+        
+        # Exact-match cache for the post and hashtag completions
+        self.cache = cache if cache is not None else LLMCache()
+        self.cache_posts = cache_posts
     
-    def _extract_hashtags(self, content, industry_terms):
+    def _completion_key(self, model, messages, max_tokens, temperature):
+        """Cache key for a completion request"""
+        return make_cache_key(provider=type(self.llm).__name__, model=model, messages=messages,
+                              max_tokens=max_tokens, temperature=temperature, version=PROMPT_VERSION)
+    
+    def _should_cache(self, temperature):
+        """Whether completions at this temperature go through the cache"""
+        return temperature == 0 or self.cache_posts
+    
+    def _cached_completion(self, model, messages, max_tokens, temperature):
         """
-        Extract industry-specific terms for hashtag suggestions
+        Return the completion text for a request, calling the LLM only on a cache miss
+        
+        Sampled requests skip the cache unless the generator was created with
+        cache_posts=True. Matching is exact only: a post is written for one
+        article, so a near-duplicate article never gets another article's post.
         
         Args:
-            content (str): Article content
+            model (str): Model name
+            messages (list): Chat messages
+            max_tokens (int): Completion token limit
+            temperature (float): Sampling temperature
+            
+        Returns:
+            str: Generated text
+        """
+        def complete():
+            response = self.llm.generate_chat_completion(model=model, messages=messages, max_tokens=max_tokens,
+                                                         temperature=temperature)
+            return completion_text(response)
+        
+        if not self._should_cache(temperature):
+            return complete()
+        
+        return self.cache.get_or_compute(self._completion_key(model, messages, max_tokens, temperature), complete)
+    
+    def _extract_hashtags(self, post_content, industry_terms):
+        """
+        Fallback hashtag suggestions when the model response has no hashtag list
+        
+        Args:
+            post_content (str): Generated post content
             industry_terms (str): Industry-specific language from voice profile
             
         Returns:
             list: List of suggested hashtags
         """
-        try:
-            prompt = f"""
-            Generate 3-5 relevant LinkedIn hashtags based on the following content:
-            
-            Content: {content[:1000]}...
-            
-            Industry terms to consider: {industry_terms}
-            
-            Return only the hashtags as a Python list of strings. Include the # symbol.
-            """
-            
-            response = self.llm.generate_chat_completion(
-                model="gpt-3.5-turbo",
-                messages=[
-                    {"role": "system", "content": "You generate relevant hashtags for LinkedIn content."},
-                    {"role": "user", "content": prompt}
-                ],
-                max_tokens=150
-            )
+        # Prefer hashtags the model already wrote into the post
+        hashtags = list(dict.fromkeys(_HASHTAG_RE.findall(post_content)))
+        
+        # Then turn comma-separated industry terms into CamelCase hashtags
+        if len(hashtags) < 3 and industry_terms and industry_terms != 'general':
+            for term in str(industry_terms).split(','):
+                tag = '#' + ''.join(word.capitalize() for word in _WORD_RE.findall(term))
+                if len(tag) > 1 and tag not in hashtags:
+                    hashtags.append(tag)
+        
+        # Top up with defaults so there are always at least three
+        if len(hashtags) < 3:
+            seen = {tag.lower() for tag in hashtags}
+            hashtags += [tag for tag in DEFAULT_HASHTAGS if tag.lower() not in seen][:3 - len(hashtags)]
+        
+        return hashtags[:5]
+    
+    @staticmethod
+    def _parse_post_response(text):
+        """
+        Split a JSON {"post": ..., "hashtags": [...]} completion into its parts
+        
+        Args:
+            text (str): Raw completion text
             
-            hashtags_text = response.choices[0].message.content
-            # Extract list using regex
-            match = re.search(r'\[.*?\]', hashtags_text)
+        Returns:
+            tuple: (post text, hashtag list or None if the response was not valid JSON)
+        """
+        data = None
+        try:
+            data = json.loads(text)
+        except ValueError:
+            # Models sometimes wrap the JSON in prose or code fences
+            match = _JSON_OBJECT_RE.search(text)
             if match:
-                hashtags = eval(match.group(0))
-                return hashtags[:5]  # Limit to 5 hashtags
-            else:
-                return ["#leadership", "#innovation", "#professional"]
-        except Exception as e:
-            print(f"Error generating hashtags: {e}")
-            return ["#leadership", "#innovation", "#professional"]
+                try:
+                    data = json.loads(match.group(0))
+                except ValueError:
+                    data = None
+        
+        if not isinstance(data, dict) or not isinstance(data.get('post'), str):
+            return text.strip(), None
+        
+        hashtags = data.get('hashtags')
+        if isinstance(hashtags, list):
+            hashtags = ['#' + tag.lstrip('#') for tag in hashtags if isinstance(tag, str) and tag.strip('# ')][:5]
+        return data['post'].strip(), hashtags or None
     
     def _predict_engagement(self, post_content, post_type):
         """
@@ -115,15 +336,7 @@ class ContentGenerator:
         # In reality, this would use ML models trained on engagement data
         
         # Base scores by post type
-        type_scores = {
-            "Professional Insight": 7.5,
-            "Quick Update": 6.5,
-            "Question Starter": 8.0,
-            "Story Format": 7.8,
-            "Industry Analysis": 7.2
-        }
-        
-        base_score = type_scores.get(post_type, 7.0)
+        base_score = _POST_TYPE_BASE_SCORES.get(post_type, 7.0)
         
         # Length factor (optimal range is 900-1200 characters)
         length = len(post_content)
@@ -176,59 +389,16 @@ class ContentGenerator:
         url = source_content.get('url', '')
         source = source_content.get('source', 'Article')
         
-        # Create different content templates based on post type
-        templates = {
-            "Professional Insight": [
-                "I just came across this fascinating article on {title}. It's a great reminder that {insight}. What are your thoughts on this approach? {url}",
-                "Having worked in this field for years, the insights from this article on {title} align with what I've observed. Key takeaway: {insight}. #ThoughtLeadership {url}"
-            ],
-            "Quick Update": [
-                "Quick industry update: {title} - {insight} Read more: {url}",
-                "Just saw this and had to share: {title} - What caught my attention was {insight}. {url}"
-            ],
-            "Question Starter": [
-                "After reading this article on {title}, I'm curious: {question} What's your experience with this? {url}",
-                "This got me thinking: {question} - The article that sparked this question: {title}. {url}"
-            ],
-            "Story Format": [
-                "When I first started in this industry, {insight} wasn't common knowledge. Now, as this article on {title} shows, it's becoming standard practice. Here's what I've learned along the way... {url}",
-                "I remember when {insight} was considered radical thinking. Now it's mainstream as shown in this piece on {title}. {url}"
-            ],
-            "Industry Analysis": [
-                "Looking at the trends discussed in this article on {title}, three key patterns emerge: 1) {insight} 2) Increasing focus on innovation 3) Shift toward sustainable practices. What other patterns are you noticing? {url}",
-                "Market analysis: This piece on {title} highlights {insight}. I'm seeing similar patterns across the sector. Thoughts? {url}"
-            ]
-        }
-        
-        # Generic insights and questions for templates
-        insights = [
-            "focusing on customer experience drives better long-term results",
-            "data-driven decision making is essential for growth",
-            "adaptability is becoming the most valued organizational trait",
-            "building authentic relationships is still the foundation of business success",
-            "innovation happens at the intersection of different disciplines"
-        ]
-        
-        questions = [
-            "How are you implementing these ideas in your organization?",
-            "Do you think this trend will continue over the next 5 years?",
-            "What's been your biggest challenge when applying similar approaches?",
-            "How does this compare to your experience in the industry?",
-            "Is this a game-changer or just another passing trend?"
-        ]
-        
         # Select a template and fill it
-        templates_for_type = templates.get(post_type, templates["Professional Insight"])
+        templates_for_type = _MOCK_TEMPLATES.get(post_type) or _MOCK_TEMPLATES[DEFAULT_POST_TYPE]
         template = random.choice(templates_for_type)
-        insight = random.choice(insights)
-        question = random.choice(questions)
+        insight = random.choice(_MOCK_INSIGHTS)
+        question = random.choice(_MOCK_QUESTIONS)
         
         content = template.format(title=title, insight=insight, question=question, url=url)
         
-        # Generate mock hashtags
-        hashtags = ["#Innovation", "#Leadership", "#ProfessionalDevelopment", "#Industry"]
-        random.shuffle(hashtags)
-        hashtags = hashtags[:3]  # Just use 3 random hashtags
+        # Generate mock hashtags (3 random, in random order)
+        hashtags = random.sample(_MOCK_HASHTAGS, 3)
         
         # Calculate mock engagement score
         engagement_score = round(random.uniform(6.5, 9.5), 1)
@@ -243,9 +413,9 @@ class ContentGenerator:
             "created_at": datetime.now().isoformat()
         }
     
-    def generate(self, voice_profile, source_content, post_type="Professional Insight"):
+    def _build_request(self, voice_profile, source_content, post_type):
         """
-        Generate a personalized LinkedIn post based on voice profile and source content.
+        Build the chat messages for a post generation request
         
         Args:
             voice_profile (dict): User's writing style profile
@@ -253,12 +423,8 @@ class ContentGenerator:
             post_type (str): Type of post to generate
             
         Returns:
-            dict: Generated post with metadata
+            tuple: (messages, max_tokens, article metadata used to build the result)
         """
-        # Use mock mode if API key is not available
-        if self.mock_mode:
-            return self._get_mock_content(voice_profile, source_content, post_type)
-        
         # Ensure voice_profile is a dictionary
         if isinstance(voice_profile, str):
             try:
@@ -287,21 +453,15 @@ class ContentGenerator:
         source = source_content.get('source', 'Article')
         
         # Truncate content if too long
-        if len(content) > 2000:
-            content = content[:2000] + "..."
+        content = truncate_content(content)
             
-        post_type_description = self.post_types.get(post_type, self.post_types["Professional Insight"])
+        post_type_description = POST_TYPE_DESCRIPTIONS.get(post_type) or POST_TYPE_DESCRIPTIONS[DEFAULT_POST_TYPE]
         
-        # Create the prompt for the OpenAI API
-        prompt = f"""
-        Create a LinkedIn post based on the following article:
+        # Everything that is the same for a user and post type goes first, as one
+        # stable prefix providers can cache; only the article block varies per call
+        instructions = f"""You are an expert LinkedIn content creator who specializes in mimicking personal writing styles.
         
-        Title: {title}
-        Source: {source}
-        Content: {content}
-        URL: {url}
-        
-        The post should match the following personal writing style:
+        Posts should match the following personal writing style:
         - Tone: {tone}
         - Vocabulary patterns: {vocabulary}
         - Sentence structure: {sentence_structure}
@@ -319,55 +479,199 @@ class ContentGenerator:
         6. If appropriate for the writing style, include relevant emojis
         7. DO NOT include "Title:" or any other metadata in the post
         
-        Write only the LinkedIn post content, nothing else.
+        Return ONLY valid JSON with keys 'post' (the LinkedIn post content as a string)
+        and 'hashtags' (an array of 3-5 relevant hashtag strings, each starting with #).
         """
         
-        try:
-            response = self.llm.generate_chat_completion(
-                model="gpt-3.5-turbo",
-                messages=[
-                    {"role": "system", "content": "You are an expert LinkedIn content creator who specializes in mimicking personal writing styles."},
-                    {"role": "user", "content": prompt}
-                ],
-                max_tokens=800
-            )
-            
-            generated_post = response.choices[0].message.content.strip()
+        prompt = f"""
+        Create a LinkedIn post based on the following article:
+        
+        Title: {title}
+        Source: {source}
+        Content: {content}
+        URL: {url}
+        """
+        
+        messages = [
+            {"role": "system", "content": instructions},
+            {"role": "user", "content": prompt}
+        ]
+        article = {'title': title, 'url': url, 'source': source, 'industry_language': industry_language}
+        return messages, POST_TYPE_MAX_TOKENS.get(post_type, DEFAULT_MAX_TOKENS), article
+    
+    def _build_post(self, response_text, article, post_type):
+        """
+        Turn a completion into the post result returned to callers
+        
+        Args:
+            response_text (str): Raw completion text
+            article (dict): Article metadata from _build_request
+            post_type (str): Type of post generated
             
-            # Generate hashtags based on content and industry terms
-            hashtags = self._extract_hashtags(content, industry_language)
+        Returns:
+            dict: Generated post with metadata
+        """
+        generated_post, hashtags = self._parse_post_response(response_text)
+        
+        # Fall back to local extraction if the response had no usable hashtag list
+        if not hashtags:
+            hashtags = self._extract_hashtags(generated_post, article['industry_language'])
+        
+        # Calculate engagement prediction
+        engagement_score = self._predict_engagement(generated_post, post_type)
+        
+        # Create result object
+        now_iso = datetime.now().isoformat()
+        return {
+            'id': _new_post_id(),
+            'content': generated_post,
+            'source': article['source'],
+            'source_url': article['url'],
+            'articleTitle': article['title'],
+            'post_type': post_type,
+            'created_at': now_iso,
+            'hashtags': hashtags,
+            'engagementScore': engagement_score,
+            'char_count': len(generated_post),
+            'status': 'pending'
+        }
+    
+    @staticmethod
+    def _error_post(article, post_type):
+        """Placeholder post returned when generation fails"""
+        return {
+            'id': _new_post_id(),
+            'content': f"Error generating content for article: {article['title']}. Please try again.",
+            'source': article['source'],
+            'source_url': article['url'],
+            'articleTitle': article['title'],
+            'post_type': post_type,
+            'created_at': datetime.now().isoformat(),
+            'hashtags': ["#error"],
+            'engagementScore': 1.0,
+            'char_count': 0,
+            'status': 'error'
+        }
+    
+    def generate(self, voice_profile, source_content, post_type=DEFAULT_POST_TYPE, temperature=POST_TEMPERATURE):
+        """
+        Generate a personalized LinkedIn post based on voice profile and source content.
+        
+        Args:
+            voice_profile (dict): User's writing style profile
+            source_content (dict): Content from monitored sources
+            post_type (PostType or str): Type of post to generate
+            temperature (float): Sampling temperature; 0 makes the post reproducible and cacheable
             
-            # Calculate engagement prediction
-            engagement_score = self._predict_engagement(generated_post, post_type)
+        Returns:
+            dict: Generated post with metadata
+        """
+        # Use mock mode if API key is not available
+        if self.mock_mode:
+            return self._get_mock_content(voice_profile, source_content, post_type)
+        
+        messages, max_tokens, article = self._build_request(voice_profile, source_content, post_type)
+        try:
+            # One call returns both the post and its hashtags
+            response_text = self._cached_completion(model="gpt-3.5-turbo", messages=messages, max_tokens=max_tokens,
+                                                    temperature=temperature)
+            return self._build_post(response_text, article, post_type)
+        except Exception:
+            logger.exception("ContentGenerator: Post generation failed for '%s'", article['title'])
+            return self._error_post(article, post_type)
+    
+    def generate_stream(self, voice_profile, source_content, post_type=DEFAULT_POST_TYPE, temperature=POST_TEMPERATURE):
+        """
+        Generate a post while streaming the completion as it arrives.
+        
+        Text deltas are coalesced so consumers get at most one update per
+        STREAM_FLUSH_INTERVAL; the final event carries the same post dict
+        generate() would return.
+        
+        Args:
+            voice_profile (dict): User's writing style profile
+            source_content (dict): Content from monitored sources
+            post_type (PostType or str): Type of post to generate
+            temperature (float): Sampling temperature; 0 makes the post reproducible and cacheable
             
-            # Create result object
-            result = {
-                'id': hash(f"{title}{datetime.now().isoformat()}"),
-                'content': generated_post,
-                'source': source,
-                'source_url': url,
-                'articleTitle': title,
-                'post_type': post_type,
-                'created_at': datetime.now().isoformat(),
-                'hashtags': hashtags,
-                'engagementScore': engagement_score,
-                'char_count': len(generated_post),
-                'status': 'pending'
-            }
+        Yields:
+            dict: {'event': 'delta', 'text': ...} for raw completion text, then
+                {'event': 'done', 'post': ...}
+        """
+        if self.mock_mode:
+            yield {'event': 'done', 'post': self._get_mock_content(voice_profile, source_content, post_type)}
+            return
+        
+        messages, max_tokens, article = self._build_request(voice_profile, source_content, post_type)
+        model = "gpt-3.5-turbo"
+        use_cache = self._should_cache(temperature)
+        key = self._completion_key(model, messages, max_tokens, temperature)
+        try:
+            response_text = self.cache.get(key) if use_cache else None
+            if response_text is not None:
+                yield {'event': 'delta', 'text': response_text}
+            else:
+                parts, pending = [], []
+                last_flush = time.monotonic()
+                for delta in self.llm.stream_chat_completion(model=model, messages=messages, max_tokens=max_tokens,
+                                                             temperature=temperature):
+                    parts.append(delta)
+                    pending.append(delta)
+                    if time.monotonic() - last_flush >= STREAM_FLUSH_INTERVAL:
+                        yield {'event': 'delta', 'text': ''.join(pending)}
+                        pending = []
+                        last_flush = time.monotonic()
+                if pending:
+                    yield {'event': 'delta', 'text': ''.join(pending)}
+                response_text = ''.join(parts)
+                if use_cache:
+                    self.cache.set(key, response_text)
+            post = self._build_post(response_text, article, post_type)
+        except Exception:
+            logger.exception("ContentGenerator: Streamed post generation failed for '%s'", article['title'])
+            post = self._error_post(article, post_type)
+        yield {'event': 'done', 'post': post}
+    
+    def generate_many(self, voice_profile, source_contents, post_type=DEFAULT_POST_TYPE, max_workers=None,
+                      temperature=POST_TEMPERATURE):
+        """
+        Generate posts for several articles concurrently.
+        
+        Each post is generated exactly as by generate(); the LLM calls are
+        I/O-bound, so they run on a thread pool instead of one after another.
+        All requests are queued up front, longest completion budget first, so
+        the slowest posts start early and short posts fill the remaining
+        workers instead of waiting behind them.
+        
+        Args:
+            voice_profile (dict): User's writing style profile
+            source_contents (list): Source content dicts, one post per entry
+            post_type (PostType, str or list): Type of post to generate, or one type per source
+            max_workers (int, optional): Concurrent requests (default GENERATION_MAX_CONCURRENCY)
+            temperature (float): Sampling temperature for every post
             
-            return result
-        except Exception as e:
-            print(f"Error generating content: {e}")
-            return {
-                'id': hash(f"{title}{datetime.now().isoformat()}"),
-                'content': f"Error generating content for article: {title}. Please try again.",
-                'source': source,
-                'source_url': url,
-                'articleTitle': title,
-                'post_type': post_type,
-                'created_at': datetime.now().isoformat(),
-                'hashtags': ["#error"],
-                'engagementScore': 1.0,
-                'char_count': 0,
-                'status': 'error'
-            }
+        Returns:
+            list: Generated posts, in the same order as source_contents
+        """
+        source_contents = list(source_contents)
+        if not source_contents:
+            return []
+        
+        post_types = [post_type] * len(source_contents) if isinstance(post_type, str) else list(post_type)
+        if len(post_types) != len(source_contents):
+            raise ValueError("post_type list must have one entry per source content")
+        
+        # Longest expected output first (sorted() is stable, so ties keep input order)
+        order = sorted(range(len(source_contents)),
+                       key=lambda i: POST_TYPE_MAX_TOKENS.get(post_types[i], DEFAULT_MAX_TOKENS), reverse=True)
+        
+        posts = [None] * len(source_contents)
+        max_workers = min(max_workers or DEFAULT_MAX_CONCURRENCY, len(source_contents))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            # generate() turns failures into error posts, so one bad article never sinks the batch
+            futures = {index: executor.submit(self.generate, voice_profile, source_contents[index], post_types[index],
+                                              temperature)
+                       for index in order}
+            for index, future in futures.items():
+                posts[index] = future.result()
+        return posts
@@ -5,18 +5,146 @@ Bypasses voice analysis and directly generates news summary posts
 import os
 import logging
 import json
+import re
+import time
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from types import MappingProxyType
+from typing import Any, Dict
 from modules.openai_wrapper import OpenAIWrapper
-from modules.llm_provider import OpenAIProvider, GeminiProvider
+from modules.llm_provider import OpenAIProvider, completion_text, get_provider
 from modules.mock_provider import MockProvider
+from modules.content_generator import DEFAULT_MAX_CONCURRENCY, STREAM_FLUSH_INTERVAL, truncate_content
+from modules.llm_cache import LLMCache, make_cache_key
+from modules.article_scorer import _simhash
 
 logger = logging.getLogger('linkedin-generator')
 
+# Part of every completion cache key; bump when the prompts change
+PROMPT_VERSION = '2'
+
+# Completions sampled above this temperature are only cached when the
+# generator is created with cache_summaries=True, so repeat requests still
+# get fresh wording by default
+CACHE_MAX_TEMPERATURE = 0.3
+
+# OpenAI models per call (Gemini uses its own model list). Style extraction is
+# structured output rather than creative writing, so it runs on a cheaper model.
+STYLE_MODEL = os.getenv("STYLE_MODEL", "gpt-4o-mini")
+GEN_MODEL = os.getenv("GEN_MODEL", "gpt-3.5-turbo")
+
+# Previous posts sent for style analysis; a sample of recent posts carries the
+# style as well as a whole history, at a fraction of the prompt tokens
+MAX_STYLE_TOKENS = 4000
+
+# Previous posts whose SimHash fingerprints differ in fewer bits than this are
+# treated as one post (a re-share or light edit), as the article scorer does
+POST_DUPLICATE_DISTANCE = 3
+
+# After Gemini fails to initialize, new generators use the OpenAI fallback for
+# this many seconds instead of repeating the slow model probe each time
+GEMINI_RETRY_AFTER = 300
+
+# (provider name, API key) -> time.monotonic() of its last initialization
+# failure, shared by every DirectGenerator in the process; keyed on the API key
+# so a corrected key is tried at once
+_PROVIDER_FAILURES = {}
+
+# Summary completion parameters, shared by the online and Batch API paths
+_SUMMARY_PARAMS = MappingProxyType({
+    "model": GEN_MODEL,
+    "temperature": 0.7,
+    "max_tokens": 1500,
+    "response_format": {"type": "json_object"}
+})
+
+# Fallback style profile and news summary, shared read-only; callers get copies
+_DEFAULT_STYLE_PROFILE = MappingProxyType({
+    "tone": "Professional with personal touches",
+    "vocabulary": "Industry-specific with accessible explanations",
+    "structure": "Brief intro, main points, engaging question or call to action at the end",
+    "patterns": "Concise sentences, occasional use of questions, personal anecdotes",
+    "hashtags": "3-5 relevant industry and topic hashtags",
+    "emoji_usage": "Sparse, strategic use of 1-2 emojis for emphasis",
+    "engagement_tactics": "Questions to audience, inviting comments, sharing insights"
+})
+
+_MOCK_NEWS_SUMMARY = MappingProxyType({
+    "content": "Just read a fascinating article on the future of AI in marketing. The key takeaway: personalization at scale is becoming the new standard, with 78% of consumers more likely to engage with tailored content.\n\nWhat's interesting is that companies implementing AI-driven personalization are seeing 40% higher conversion rates and better customer retention.\n\nAre you using AI in your marketing strategy yet? I'd love to hear your experiences!\n\n#AIMarketing #DigitalTransformation #CustomerExperience",
+    "hashtags": ("AIMarketing", "DigitalTransformation", "CustomerExperience"),
+    "wordCount": 74,
+    "estimatedReadTime": "1 min read",
+    "type": "News Summary"
+})
+
+# Target word range per summary length
+_SUMMARY_LENGTH_WORDS = MappingProxyType({
+    "short": "100-150 words",
+    "medium": "200-300 words",
+    "long": "400-500 words"
+})
+
+_HASHTAG_RE = re.compile(r'#(\w+)')
+_POST_SEPARATOR_RE = re.compile(r'\n\s*\n')
+
+# Article fields included in the summary prompt, in order, with their labels
+_NEWS_FIELDS = (
+    ("title", "Title"),
+    ("description", "Description"),
+    ("content", "Content"),
+    ("url", "Source URL")
+)
+
+# OpenAI Batch API states after which no more output will appear
+_BATCH_FINAL_STATES = ("completed", "failed", "expired", "cancelled")
+
+def _dedupe_posts(previous_posts):
+    """
+    Drop repeated posts from a post history, keeping the first of each
+    
+    Args:
+        previous_posts (str): Posts separated by blank lines
+        
+    Returns:
+        str: The distinct posts, separated by blank lines
+    """
+    kept, fingerprints = [], []
+    for post in _POST_SEPARATOR_RE.split(previous_posts):
+        post = post.strip()
+        if not post:
+            continue
+        fingerprint = _simhash(post)
+        if fingerprint is not None:
+            if any(bin(fingerprint ^ seen).count('1') < POST_DUPLICATE_DISTANCE for seen in fingerprints):
+                continue
+            fingerprints.append(fingerprint)
+        kept.append(post)
+    return "\n\n".join(kept)
+
+def _is_json(text):
+    """Whether text parses as JSON; malformed structured responses are not cached"""
+    try:
+        json.loads(text)
+        return True
+    except (TypeError, ValueError):
+        return False
+
 class DirectGenerator:
     """Generate content directly from previous posts and news sources"""
     
-    def __init__(self):
-        """Initialize the direct content generator with configured LLM provider"""
+    def __init__(self, cache=None, cache_summaries=False):
+        """
+        Initialize the direct content generator with configured LLM provider
+        
+        Args:
+            cache (LLMCache, optional): Completion cache (default: one built from config)
+            cache_summaries (bool): Also cache the higher-temperature summary completions
+        """
+        # Completion cache; the summary call is only cached when opted in
+        self.cache = cache if cache is not None else LLMCache()
+        self.cache_summaries = cache_summaries
+        self._style_details_memo = None
+        
         # Check mock mode settings from environment variables
         self.mock_mode = os.getenv("MOCK_MODE", "false").lower() in ["true", "1", "yes"]
         provider_name = os.getenv("LLM_PROVIDER", "openai").lower()
@@ -45,15 +173,20 @@ class DirectGenerator:
             logger.info("DirectGenerator: OpenAIWrapper indicates mock mode - missing API keys")
             self.llm = MockProvider()
             logger.info("DirectGenerator: Mock provider initialized and ready")
+        elif provider_name == "gemini" and self._gemini_recently_failed(os.getenv("GEMINI_API_KEY")):
+            logger.warning(f"DirectGenerator: GeminiProvider failed to initialize within the last {GEMINI_RETRY_AFTER}s. Using OpenAIProvider until then.")
+            self.llm = OpenAIProvider(self.client)
         elif provider_name == "gemini":
             try:
                 gemini_api_key = os.getenv("GEMINI_API_KEY")
                 if not gemini_api_key:
                     logger.warning("DirectGenerator: LLM_PROVIDER is 'gemini' but GEMINI_API_KEY is not set. Falling back to mock/OpenAI if possible or may error.")
                     # Potentially fall back or let it fail if GeminiProvider requires key
-                self.llm = GeminiProvider(gemini_api_key)
+                self.llm = get_provider("gemini", gemini_api_key)
+                _PROVIDER_FAILURES.pop(("gemini", gemini_api_key), None)
                 logger.info("DirectGenerator: Successfully initialized GeminiProvider.")
             except Exception as e:
+                _PROVIDER_FAILURES[("gemini", gemini_api_key)] = time.monotonic()
                 logger.error(f"DirectGenerator: Failed to initialize GeminiProvider: {e}. Falling back to OpenAIProvider.")
                 self.llm = OpenAIProvider(self.client) # Fallback
                 logger.info("DirectGenerator: Initialized OpenAIProvider as fallback.")
@@ -69,6 +202,12 @@ class DirectGenerator:
         else:
             logger.info("DirectGenerator: OpenAIWrapper indicates non-mock mode (e.g., OPENAI_API_KEY present).")
             
+    @staticmethod
+    def _gemini_recently_failed(api_key):
+        """Whether Gemini failed to initialize with api_key less than GEMINI_RETRY_AFTER seconds ago"""
+        failed_at = _PROVIDER_FAILURES.get(("gemini", api_key))
+        return failed_at is not None and time.monotonic() - failed_at < GEMINI_RETRY_AFTER
+    
     def analyze_and_generate(self, previous_posts, news_content, summary_length='medium'):
         """
         Analyze previous posts and generate news summary in the same style
@@ -85,38 +224,251 @@ class DirectGenerator:
             return self._mock_summary(previous_posts, news_content, summary_length)
         
         try:
-            # Validate inputs first
-            if not previous_posts or not isinstance(previous_posts, str):
-                logger.warning("Invalid previous_posts input: empty or not a string")
-                previous_posts = "This is a placeholder post since no valid previous posts were provided."
+            # Extract style from previous posts
+            style_profile = self._extract_writing_style(self._validate_previous_posts(previous_posts))
+        except Exception:
+            logger.exception("Error generating direct news summary")
+            # Fall back to mock data
+            return self._mock_summary(previous_posts, news_content, summary_length)
+        
+        return self._summarize(style_profile, previous_posts, news_content, summary_length)
+    
+    def analyze_and_generate_stream(self, previous_posts, news_content, summary_length='medium'):
+        """
+        Analyze previous posts and generate a news summary, reporting progress as it happens
+        
+        The style profile is sent as soon as it is extracted and the summary
+        streams in as it is written, so callers see output long before the
+        full result is ready.
+        
+        Args:
+            previous_posts (str): Previous LinkedIn posts to analyze style
+            news_content (dict): Source news content to summarize
+            summary_length (str): Length of summary (short, medium, long)
             
-            # Validate news_content
-            if not news_content or not isinstance(news_content, dict):
-                logger.warning("Invalid news_content input: not a dictionary or empty")
-                news_content = {"title": "Placeholder Article", "content": "No valid news content was provided.", "url": ""}
+        Yields:
+            dict: {'event': 'style', 'styleProfile': ...}, then
+                {'event': 'delta', 'text': ...} for raw summary text, then
+                {'event': 'done', 'result': ...} with the dict analyze_and_generate() returns
+        """
+        if self.mock_mode:
+            yield {'event': 'done', 'result': self._mock_summary(previous_posts, news_content, summary_length)}
+            return
+        
+        try:
+            style_profile = self._extract_writing_style(self._validate_previous_posts(previous_posts))
+        except Exception:
+            logger.exception("Error generating direct news summary")
+            yield {'event': 'done', 'result': self._mock_summary(previous_posts, news_content, summary_length)}
+            return
+        yield {'event': 'style', 'styleProfile': style_profile}
+        
+        news_content = self._validate_news_content(news_content)
+        for event in self._stream_news_summary(style_profile, news_content, summary_length):
+            if event['event'] == 'done':
+                yield {'event': 'done', 'result': self._summary_result(style_profile, news_content, event['post'])}
+            else:
+                yield event
+    
+    def analyze_and_generate_many(self, previous_posts, news_items, summary_length='medium', max_workers=None):
+        """
+        Analyze previous posts once and summarize several news items in that style
+        
+        The style profile is shared by every summary, so it is extracted once;
+        the summary calls are I/O-bound and run concurrently on a thread pool.
+        
+        Args:
+            previous_posts (str): Previous LinkedIn posts to analyze style
+            news_items (list): Source news content dicts, one summary per entry
+            summary_length (str): Length of summary (short, medium, long)
+            max_workers (int, optional): Concurrent requests (default GENERATION_MAX_CONCURRENCY)
             
-            # Extract style from previous posts
-            style_profile = self._extract_writing_style(previous_posts)
+        Returns:
+            list: Generated post content with style analysis, in the same order as news_items
+        """
+        news_items = list(news_items)
+        if not news_items:
+            return []
+        if self.mock_mode:
+            return [self._mock_summary(previous_posts, item, summary_length) for item in news_items]
+        
+        try:
+            style_profile = self._extract_writing_style(self._validate_previous_posts(previous_posts))
+        except Exception as e:
+            logger.error(f"Error extracting writing style for batch: {e}")
+            style_profile = self._get_default_style_profile()
+        
+        max_workers = min(max_workers or DEFAULT_MAX_CONCURRENCY, len(news_items))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(
+                lambda item: self._summarize(style_profile, previous_posts, item, summary_length), news_items))
+    
+    def _validate_previous_posts(self, previous_posts):
+        """Return previous_posts, or a placeholder post if it is empty or not a string"""
+        if not previous_posts or not isinstance(previous_posts, str):
+            logger.warning("Invalid previous_posts input: empty or not a string")
+            return "This is a placeholder post since no valid previous posts were provided."
+        return previous_posts
+    
+    def _validate_news_content(self, news_content):
+        """Return news_content, or a placeholder article if it is empty or not a dict"""
+        if not news_content or not isinstance(news_content, dict):
+            logger.warning("Invalid news_content input: not a dictionary or empty")
+            return {"title": "Placeholder Article", "content": "No valid news content was provided.", "url": ""}
+        return news_content
+    
+    def _summarize(self, style_profile, previous_posts, news_content, summary_length):
+        """Generate one news summary in the given style, wrapped with its style analysis"""
+        try:
+            news_content = self._validate_news_content(news_content)
             
             # Generate news summary using extracted style
             generated_post = self._generate_news_summary(style_profile, news_content, summary_length)
             
-            # Complete response with both style analysis and generated post
-            return {
-                "styleProfile": style_profile,
-                "generatedPost": generated_post,
-                "timestamp": datetime.now().isoformat(),
-                "source": news_content.get("url", ""),
-                "title": news_content.get("title", "")
-            }
+            return self._summary_result(style_profile, news_content, generated_post)
         
-        except Exception as e:
-            import traceback
-            logger.error(f"Error generating direct news summary: {e}")
-            logger.error(f"Exception traceback: {traceback.format_exc()}")
+        except Exception:
+            logger.exception("Error generating direct news summary")
             # Fall back to mock data
             return self._mock_summary(previous_posts, news_content, summary_length)
     
+    def _summary_result(self, style_profile, news_content, generated_post):
+        """Complete response with both style analysis and generated post"""
+        return {
+            "styleProfile": style_profile,
+            "generatedPost": generated_post,
+            "timestamp": datetime.now().isoformat(),
+            "source": news_content.get("url", ""),
+            "title": news_content.get("title", "")
+        }
+    
+    def batch_generate(self, previous_posts, news_items, summary_length='medium', poll_interval=60, timeout=None):
+        """
+        Summarize many news items through the OpenAI Batch API
+        
+        All summary requests are uploaded as one JSONL file and processed by
+        OpenAI within 24 hours at half the online token price. Meant for offline
+        bulk runs: this call blocks, polling until the batch finishes. Without an
+        OpenAI provider it falls back to analyze_and_generate_many().
+        
+        Args:
+            previous_posts (str): Previous LinkedIn posts to analyze style
+            news_items (list): Source news content dicts, one summary per entry
+            summary_length (str): Length of summary (short, medium, long)
+            poll_interval (float): Seconds between batch status checks
+            timeout (float, optional): Seconds to wait before giving up
+            
+        Returns:
+            list: Generated post content with style analysis, in the same order as news_items
+            
+        Raises:
+            TimeoutError: If the batch has not finished within timeout
+        """
+        news_items = [self._validate_news_content(item) for item in news_items]
+        if not news_items:
+            return []
+        if self.mock_mode or not isinstance(self.llm, OpenAIProvider):
+            return self.analyze_and_generate_many(previous_posts, news_items, summary_length)
+        
+        style_profile = self._extract_writing_style(self._validate_previous_posts(previous_posts))
+        requests = []
+        for index, news_content in enumerate(news_items):
+            messages, _ = self._summary_messages(style_profile, news_content, summary_length)
+            requests.append(json.dumps({
+                "custom_id": str(index),
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": dict(_SUMMARY_PARAMS, messages=messages)
+            }))
+        
+        # The pinned SDK predates client.batches, so the endpoint is called directly
+        batch_file = self.client.files.create(file=("summaries.jsonl", "\n".join(requests).encode("utf-8")),
+                                              purpose="batch")
+        batch = self.client.post("/batches", cast_to=Dict[str, Any], body={
+            "input_file_id": batch_file.id,
+            "endpoint": "/v1/chat/completions",
+            "completion_window": "24h"
+        })
+        logger.info(f"DirectGenerator: Submitted batch {batch['id']} with {len(requests)} summaries")
+        
+        started = time.monotonic()
+        while batch["status"] not in _BATCH_FINAL_STATES:
+            if timeout is not None and time.monotonic() - started > timeout:
+                raise TimeoutError(f"Batch {batch['id']} still {batch['status']} after {timeout}s")
+            time.sleep(poll_interval)
+            batch = self.client.get(f"/batches/{batch['id']}", cast_to=Dict[str, Any])
+        
+        responses = {}
+        if batch.get("output_file_id"):
+            for line in self.client.files.content(batch["output_file_id"]).text.splitlines():
+                record = json.loads(line)
+                response = record.get("response") or {}
+                if response.get("status_code") == 200:
+                    responses[record["custom_id"]] = response["body"]["choices"][0]["message"]["content"]
+        logger.info(f"DirectGenerator: Batch {batch['id']} {batch['status']}, {len(responses)}/{len(requests)} summaries returned")
+        
+        results = []
+        for index, news_content in enumerate(news_items):
+            response_text = responses.get(str(index))
+            if response_text is None:
+                # Failed or expired requests fall back to mock data, as online failures do
+                results.append(self._mock_summary(previous_posts, news_content, summary_length))
+            else:
+                results.append(self._summary_result(style_profile, news_content, self._parse_summary(response_text)))
+        return results
+    
+    def _cached_completion(self, messages, model, temperature, max_tokens, response_format=None, similar_text=None):
+        """
+        Return the completion text for a request, calling the LLM only on a cache miss
+        
+        Args:
+            messages (list): Chat messages
+            model (str): Model name
+            temperature (float): Sampling temperature
+            max_tokens (int): Completion token limit
+            response_format (dict, optional): Provider response format
+            similar_text (str, optional): Source text; a completion cached for a
+                near-identical source (same system message) is reused
+            
+        Returns:
+            str: Generated text
+        """
+        def complete():
+            response = self.llm.generate_chat_completion(
+                messages,
+                model=model,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                response_format=response_format
+            )
+            return completion_text(response)
+        
+        if not self._should_cache(temperature):
+            return complete()
+        
+        key, namespace = self._completion_keys(messages, model, temperature, max_tokens, response_format)
+        return self.cache.get_or_compute(key, complete, text=similar_text, namespace=namespace,
+                                         should_cache=_is_json if response_format else None)
+    
+    def _should_cache(self, temperature):
+        """Whether completions at this temperature go through the cache"""
+        return temperature <= CACHE_MAX_TEMPERATURE or self.cache_summaries
+    
+    def _completion_keys(self, messages, model, temperature, max_tokens, response_format=None):
+        """
+        Cache keys for a completion request
+        
+        Returns:
+            tuple: (exact-match key, semantic namespace); the namespace covers the
+                system message, so near-duplicate sources only match for the same style
+        """
+        provider = type(self.llm).__name__
+        key = make_cache_key(provider=provider, model=model, messages=messages, temperature=temperature,
+                             max_tokens=max_tokens, response_format=response_format, version=PROMPT_VERSION)
+        namespace = make_cache_key(provider=provider, model=model, system=messages[0]['content'],
+                                   temperature=temperature, max_tokens=max_tokens, version=PROMPT_VERSION)
+        return key, namespace
+    
     def _extract_writing_style(self, previous_posts):
         """Extract writing style from previous posts using OpenAI"""
         try:
@@ -124,37 +476,28 @@ class DirectGenerator:
                 return self._get_default_style_profile()
                 
             logger.info("Extracting writing style from previous posts")
+            # Repeats add tokens but no style signal; drop them before the token cap
+            previous_posts = truncate_content(_dedupe_posts(previous_posts), STYLE_MODEL, MAX_STYLE_TOKENS,
+                                              keep_end=True)
             
-            # Create detailed prompt for style analysis
+            # One call returns the structured profile directly
             prompt = [
-                {"role": "system", "content": "You are an expert writing style analyst. Analyze the LinkedIn posts provided and extract the author's writing style characteristics. Focus on tone, sentence structure, vocabulary level, use of questions, emoji usage, hashtag style, and distinctive patterns."},
+                {"role": "system", "content": "You are an expert writing style analyst. Analyze the LinkedIn posts provided and extract the author's writing style characteristics. Focus on tone, sentence structure, vocabulary level, use of questions, emoji usage, hashtag style, and distinctive patterns. Return a JSON object with keys: tone, vocabulary, structure, patterns, hashtags, emoji_usage, engagement_tactics."},
                 {"role": "user", "content": f"Analyze these LinkedIn posts and provide a detailed style profile that could be used to generate new content in the exact same personal style:\n\n{previous_posts}"}
             ]
             
-            response = self.llm.generate_chat_completion(
+            response_text = self._cached_completion(
                 prompt,
-                model="gpt-3.5-turbo",  # Or Gemini equivalent if selected
+                model=STYLE_MODEL,
                 temperature=0.3,
-                max_tokens=1000
-            )
-            raw_analysis = response.choices[0].message.content
-            
-            # Second call to structure the analysis
-            structure_prompt = [
-                {"role": "system", "content": "You are a data structuring assistant. Convert the provided writing style analysis into a structured JSON format with these keys: tone, vocabulary, structure, patterns, hashtags, emoji_usage, engagement_tactics."},
-                {"role": "user", "content": f"Convert this writing style analysis to structured JSON:\n\n{raw_analysis}"}
-            ]
-            
-            structure_response = self.llm.generate_chat_completion(
-                structure_prompt,
-                model="gpt-3.5-turbo",  # Or Gemini equivalent if selected
-                temperature=0.1,
-                max_tokens=800,
-                response_format={"type": "json_object"}
+                max_tokens=1000,
+                response_format={"type": "json_object"},
+                # Feeds re-pulled later are mostly the same posts; reuse their profile
+                similar_text=previous_posts
             )
             
             # Parse structured style profile
-            style_profile = json.loads(structure_response.choices[0].message.content)
+            style_profile = json.loads(response_text)
             
             return style_profile
             
@@ -168,102 +511,127 @@ class DirectGenerator:
             if not news_content or not self.client:
                 return self._get_mock_news_summary()
             
-            length_words = {
-                "short": "100-150 words",
-                "medium": "200-300 words",
-                "long": "400-500 words"
-            }.get(summary_length, "200-300 words")
-            
-            # Construct content details from news_content
-            content_details = ""
-            if "title" in news_content:
-                content_details += f"Title: {news_content['title']}\n"
-            if "description" in news_content:
-                content_details += f"Description: {news_content['description']}\n"
-            if "content" in news_content:
-                content_details += f"Content: {news_content['content']}\n"
-            if "url" in news_content:
-                content_details += f"Source URL: {news_content['url']}\n"
-                
-            if not content_details:
-                content_details = str(news_content)
-            
-            # Format style details
-            style_details = json.dumps(style_profile, indent=2)
-            
-            # Create detailed prompt for content generation
-            prompt = [
-                {"role": "system", "content": f"You are a professional LinkedIn content writer. Generate a LinkedIn post summarizing news content in the exact style described in the profile below. The summary should be {length_words} long.\n\nSTYLE PROFILE:\n{style_details}"},
-                {"role": "user", "content": f"Create a LinkedIn post summarizing this news:\n\n{content_details}"}
-            ]
-            
-            response = self.llm.generate_chat_completion(
-                prompt,
-                model="gpt-3.5-turbo",  # Or Gemini equivalent if selected
-                temperature=0.7,
-                max_tokens=1500
-            )
-            post_content = response.choices[0].message.content
-        
-            # Extract hashtags if present
-            hashtags = []
-            hashtag_extractor_prompt = [
-                {"role": "system", "content": "Extract all hashtags from the text. Return only a JSON array of hashtags without the # symbol."},
-                {"role": "user", "content": post_content}
-            ]
-            
-            hashtag_response = self.client.chat.completions.create(
-                model="gpt-3.5-turbo",
-                messages=hashtag_extractor_prompt,
-                temperature=0.1,
-                max_tokens=200,
-                response_format={"type": "json_object"}
-            )
-            
-            try:
-                hashtag_data = json.loads(hashtag_response.choices[0].message.content)
-                if isinstance(hashtag_data, dict) and "hashtags" in hashtag_data:
-                    hashtags = hashtag_data["hashtags"]
-                elif isinstance(hashtag_data, list):
-                    hashtags = hashtag_data
-            except:
-                # If we can't parse JSON, extract hashtags manually
-                import re
-                hashtags = re.findall(r'#(\w+)', post_content)
-            
-            return {
-                "content": post_content,
-                "hashtags": hashtags,
-                "wordCount": len(post_content.split()),
-                "estimatedReadTime": f"{max(1, len(post_content.split()) // 200)} min read",
-                "type": "News Summary"
-            }
+            messages, content_details = self._summary_messages(style_profile, news_content, summary_length)
+            post_content = self._cached_completion(messages, similar_text=content_details, **_SUMMARY_PARAMS)
+            return self._parse_summary(post_content)
         
         except Exception as e:
             logger.error(f"Error generating news summary: {e}")
             return self._get_mock_news_summary()
     
-    def _get_default_style_profile(self):
-        """Return default style profile for fallback"""
+    def _stream_news_summary(self, style_profile, news_content, summary_length):
+        """
+        Generate a news summary while streaming the completion as it arrives
+        
+        Text deltas are coalesced so consumers get at most one update per
+        STREAM_FLUSH_INTERVAL; the final event carries the same post dict
+        _generate_news_summary() would return.
+        
+        Yields:
+            dict: {'event': 'delta', 'text': ...} for raw completion text, then
+                {'event': 'done', 'post': ...}
+        """
+        try:
+            if not news_content or not self.client:
+                yield {'event': 'done', 'post': self._get_mock_news_summary()}
+                return
+            
+            messages, content_details = self._summary_messages(style_profile, news_content, summary_length)
+            use_cache = self._should_cache(_SUMMARY_PARAMS["temperature"])
+            response_text = None
+            if use_cache:
+                key, namespace = self._completion_keys(messages, **_SUMMARY_PARAMS)
+                response_text = self.cache.get(key)
+                if response_text is None:
+                    response_text = self.cache.get_similar(content_details, namespace)
+            
+            if response_text is not None:
+                yield {'event': 'delta', 'text': response_text}
+            else:
+                parts, pending = [], []
+                last_flush = time.monotonic()
+                for delta in self.llm.stream_chat_completion(messages, **_SUMMARY_PARAMS):
+                    parts.append(delta)
+                    pending.append(delta)
+                    if time.monotonic() - last_flush >= STREAM_FLUSH_INTERVAL:
+                        yield {'event': 'delta', 'text': ''.join(pending)}
+                        pending = []
+                        last_flush = time.monotonic()
+                if pending:
+                    yield {'event': 'delta', 'text': ''.join(pending)}
+                response_text = ''.join(parts)
+                if use_cache and _is_json(response_text):
+                    self.cache.set(key, response_text, text=content_details, namespace=namespace)
+            post = self._parse_summary(response_text)
+        except Exception:
+            logger.exception("Error streaming news summary")
+            post = self._get_mock_news_summary()
+        yield {'event': 'done', 'post': post}
+    
+    def _summary_messages(self, style_profile, news_content, summary_length):
+        """
+        Build the chat messages for a news summary
+        
+        Returns:
+            tuple: (messages, content_details) where content_details is the article block
+        """
+        length_words = _SUMMARY_LENGTH_WORDS.get(summary_length, _SUMMARY_LENGTH_WORDS["medium"])
+        
+        # Construct content details from news_content
+        content_details = "".join(f"{label}: {news_content[key]}\n"
+                                  for key, label in _NEWS_FIELDS if key in news_content)
+        if not content_details:
+            content_details = str(news_content)
+        
+        style_details = self._style_details(style_profile)
+        
+        # Create detailed prompt for content generation; the post and its
+        # hashtags come back together as one JSON object. The static
+        # instructions and the author's style profile lead the system message
+        # as one byte-stable prefix providers can cache across articles.
+        prompt = [
+            {"role": "system", "content": f"You are a professional LinkedIn content writer. Generate a LinkedIn post summarizing news content in the exact style described in the profile below. Return JSON with fields 'content' (the LinkedIn post) and 'hashtags' (array of the post's hashtags without the # symbol).\n\nSTYLE PROFILE:\n{style_details}\n\nThe summary should be {length_words} long."},
+            {"role": "user", "content": f"Create a LinkedIn post summarizing this news:\n\n{content_details}"}
+        ]
+        return prompt, content_details
+    
+    def _style_details(self, style_profile):
+        """Formatted style profile for the summary prompt, reused while the same profile object is passed"""
+        memo = self._style_details_memo
+        if memo is not None and memo[0] is style_profile:
+            return memo[1]
+        style_details = json.dumps(style_profile, indent=2, sort_keys=True)
+        # One (profile, text) tuple, replaced atomically, so worker threads never see a mismatched pair
+        self._style_details_memo = (style_profile, style_details)
+        return style_details
+    
+    def _parse_summary(self, post_content):
+        """Turn a summary completion into the generated post dict"""
+        try:
+            post_data = json.loads(post_content)
+            post_content = post_data["content"]
+            hashtags = post_data.get("hashtags") or []
+        except (ValueError, KeyError, TypeError, AttributeError):
+            # Not the expected JSON; use the text as the post and read hashtags from it
+            hashtags = _HASHTAG_RE.findall(post_content)
+        hashtags = [str(tag).lstrip('#') for tag in hashtags]
+        
+        word_count = len(post_content.split())
         return {
-            "tone": "Professional with personal touches",
-            "vocabulary": "Industry-specific with accessible explanations",
-            "structure": "Brief intro, main points, engaging question or call to action at the end",
-            "patterns": "Concise sentences, occasional use of questions, personal anecdotes",
-            "hashtags": "3-5 relevant industry and topic hashtags",
-            "emoji_usage": "Sparse, strategic use of 1-2 emojis for emphasis",
-            "engagement_tactics": "Questions to audience, inviting comments, sharing insights"
+            "content": post_content,
+            "hashtags": hashtags,
+            "wordCount": word_count,
+            "estimatedReadTime": f"{max(1, word_count // 200)} min read",
+            "type": "News Summary"
         }
     
+    def _get_default_style_profile(self):
+        """Return default style profile for fallback"""
+        return dict(_DEFAULT_STYLE_PROFILE)
+    
     def _get_mock_news_summary(self):
         """Return mock news summary for fallback"""
-        return {
-            "content": "Just read a fascinating article on the future of AI in marketing. The key takeaway: personalization at scale is becoming the new standard, with 78% of consumers more likely to engage with tailored content.\n\nWhat's interesting is that companies implementing AI-driven personalization are seeing 40% higher conversion rates and better customer retention.\n\nAre you using AI in your marketing strategy yet? I'd love to hear your experiences!\n\n#AIMarketing #DigitalTransformation #CustomerExperience",
-            "hashtags": ["AIMarketing", "DigitalTransformation", "CustomerExperience"],
-            "wordCount": 74,
-            "estimatedReadTime": "1 min read",
-            "type": "News Summary"
-        }
+        return dict(_MOCK_NEWS_SUMMARY, hashtags=list(_MOCK_NEWS_SUMMARY["hashtags"]))
     
     def _mock_summary(self, previous_posts, news_content, summary_length):
         """Generate mock data for testing"""
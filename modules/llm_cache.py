@@ -0,0 +1,300 @@
+"""
+LLM Response Cache for Enhanced LinkedIn Post Generator
+This module caches generated completions so identical (or near-identical)
+requests can be answered without another round-trip to the LLM provider.
+
+Two lookup tiers are provided:
+    1. Exact match on a SHA-256 key of the request parameters.
+    2. Semantic match on a lightweight hashed bag-of-words embedding of the
+       source text, returning the stored result when cosine similarity is
+       above the configured threshold.
+"""
+import os
+import json
+import math
+import re
+import time
+import zlib
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional
+
+from .config import DEFAULT_LLM_CACHE_CONFIG, _apply_env_overrides
+
+logger = logging.getLogger('linkedin-generator')
+
+# Redis is optional; without it the cache stays in-process
+try:
+    import redis
+except ImportError:
+    redis = None
+
+_TOKEN_RE = re.compile(r'\w+')
+_EMBEDDING_DIMS = 512
+
+
+def make_cache_key(**parts: Any) -> str:
+    """Build a deterministic cache key from keyword arguments
+
+    Args:
+        **parts: JSON-serializable values identifying the request
+
+    Returns:
+        str: Hex SHA-256 digest of the sorted JSON payload
+    """
+    payload = json.dumps(parts, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def cache_key(model: str, messages: Any, temperature: float, max_tokens: Optional[int] = None,
+              **params: Any) -> Optional[str]:
+    """Exact-match key for a deterministic chat completion request
+
+    Args:
+        model (str): Model name
+        messages (list): Chat messages sent to the model
+        temperature (float): Sampling temperature
+        max_tokens (int, optional): Completion token limit
+        **params: Any other request parameters that change the output
+
+    Returns:
+        str: Hex SHA-256 key, or None when the request is sampled
+            (temperature above 0) and should not be answered from the cache
+    """
+    if temperature > 0:
+        return None
+    return make_cache_key(model=model, messages=messages, temperature=temperature,
+                          max_tokens=max_tokens, **params)
+
+
+def embed_text(text: str) -> Dict[int, float]:
+    """Embed text as a normalized, hashed bag-of-words vector
+
+    Args:
+        text (str): Text to embed
+
+    Returns:
+        dict: Sparse vector mapping bucket index to weight (unit length)
+    """
+    vector = {}
+    for token in _TOKEN_RE.findall(text.lower()):
+        bucket = zlib.crc32(token.encode('utf-8')) % _EMBEDDING_DIMS
+        vector[bucket] = vector.get(bucket, 0.0) + 1.0
+
+    norm = math.sqrt(sum(weight * weight for weight in vector.values()))
+    if norm == 0:
+        return {}
+    return {bucket: weight / norm for bucket, weight in vector.items()}
+
+
+def cosine_similarity(a: Dict[int, float], b: Dict[int, float]) -> float:
+    """Cosine similarity of two unit-length sparse vectors"""
+    if len(a) > len(b):
+        a, b = b, a
+    return sum(weight * b.get(bucket, 0.0) for bucket, weight in a.items())
+
+
+class CacheBackend:
+    """Base class for cache storage backends.
+
+    Backends store JSON-serializable values under string keys and are
+    responsible for expiring entries after their TTL.
+    """
+
+    def get(self, key: str) -> Any:
+        """Return the stored value or None if missing/expired"""
+        raise NotImplementedError("Subclasses must implement get method")
+
+    def set(self, key: str, value: Any) -> None:
+        """Store a value under the given key"""
+        raise NotImplementedError("Subclasses must implement set method")
+
+    def __len__(self) -> int:
+        return 0
+
+
+class MemoryCacheBackend(CacheBackend):
+    """Thread-safe in-process TTL cache with LRU eviction"""
+
+    def __init__(self, maxsize: int = 500, ttl: int = 3600):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class RedisCacheBackend(CacheBackend):
+    """Redis-backed cache shared across worker processes"""
+
+    def __init__(self, url: str, ttl: int = 3600, prefix: str = 'linkedout:llm:'):
+        self.client = redis.Redis.from_url(url)
+        self.ttl = ttl
+        self.prefix = prefix
+
+    def get(self, key):
+        raw = self.client.get(self.prefix + key)
+        return json.loads(raw) if raw is not None else None
+
+    def set(self, key, value):
+        self.client.setex(self.prefix + key, self.ttl, json.dumps(value, default=str))
+
+
+class LLMCache:
+    """
+    Response cache for LLM-backed generation with exact and semantic tiers.
+    """
+
+    def __init__(self, config=None, backend: Optional[CacheBackend] = None):
+        """Initialize the cache with configuration
+
+        Args:
+            config (dict, optional): Configuration override
+            backend (CacheBackend, optional): Storage backend override
+        """
+        self.config = DEFAULT_LLM_CACHE_CONFIG.copy()
+        self.config = _apply_env_overrides(self.config, "LLM_CACHE")
+        if config:
+            self.config.update(config)
+
+        self.backend = backend or self._create_backend()
+        self.hits = 0
+        self.semantic_hits = 0
+        self.misses = 0
+
+        # Semantic index: namespace -> OrderedDict(key -> embedding)
+        self._semantic_index = {}
+        self._lock = threading.Lock()
+
+    def _create_backend(self) -> CacheBackend:
+        """Pick Redis when configured and available, else in-process memory"""
+        redis_url = self.config['redis_url'] or os.getenv('REDIS_URL', '')
+        if redis_url and redis is not None:
+            try:
+                backend = RedisCacheBackend(redis_url, ttl=self.config['ttl'])
+                backend.client.ping()
+                logger.info("LLMCache: Using Redis backend")
+                return backend
+            except Exception as e:
+                logger.warning(f"LLMCache: Redis unavailable ({e}), using in-process cache")
+        return MemoryCacheBackend(maxsize=self.config['maxsize'], ttl=self.config['ttl'])
+
+    def get(self, key: str) -> Any:
+        """Look up an exact-match entry"""
+        value = self.backend.get(key)
+        self._record('hits' if value is not None else 'misses')
+        return value
+
+    def get_similar(self, text: str, namespace: str = '') -> Any:
+        """Look up the stored value whose indexed text is most similar
+
+        Args:
+            text (str): Text to compare against indexed entries
+            namespace (str): Partition so unrelated requests never match
+
+        Returns:
+            The cached value, or None when nothing meets the threshold
+        """
+        value = self._find_similar(text, namespace)
+        self._record('semantic_hits' if value is not None else 'misses')
+        return value
+
+    def _find_similar(self, text, namespace):
+        query = embed_text(text)
+        if not query:
+            return None
+
+        best_key, best_score = None, self.config['similarity_threshold']
+        with self._lock:
+            index = self._semantic_index.get(namespace, {})
+            for key, embedding in index.items():
+                score = cosine_similarity(query, embedding)
+                if score >= best_score:
+                    best_key, best_score = key, score
+
+        return self.backend.get(best_key) if best_key is not None else None
+
+    def _record(self, counter):
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def set(self, key: str, value: Any, text: Optional[str] = None, namespace: str = '') -> None:
+        """Store a value and optionally index it for semantic lookup"""
+        self.backend.set(key, value)
+        if not text:
+            return
+        embedding = embed_text(text)
+        if not embedding:
+            return
+        with self._lock:
+            index = self._semantic_index.setdefault(namespace, OrderedDict())
+            index[key] = embedding
+            index.move_to_end(key)
+            while len(index) > self.config['maxsize']:
+                index.popitem(last=False)
+
+    def get_or_compute(self, key: str, compute: Callable[[], Any], text: Optional[str] = None,
+                       namespace: str = '', should_cache: Callable[[Any], bool] = None) -> Any:
+        """Return a cached value, computing and storing it on a miss
+
+        Args:
+            key (str): Exact-match cache key
+            compute (callable): Produces the value on a miss
+            text (str, optional): Text used for semantic lookup/indexing
+            namespace (str): Semantic index partition
+            should_cache (callable, optional): Predicate deciding whether a
+                computed value may be stored (e.g. skip error results)
+
+        Returns:
+            The cached or freshly computed value
+        """
+        value = self.backend.get(key)
+        if value is not None:
+            self._record('hits')
+            return value
+        if text:
+            value = self._find_similar(text, namespace)
+            if value is not None:
+                self._record('semantic_hits')
+                return value
+        self._record('misses')
+
+        value = compute()
+        if value is not None and (should_cache is None or should_cache(value)):
+            self.set(key, value, text=text, namespace=namespace)
+        return value
+
+    @property
+    def stats(self) -> Dict[str, Any]:
+        """Cache counters for health/diagnostic endpoints"""
+        with self._lock:
+            return {
+                'backend': type(self.backend).__name__,
+                'size': len(self.backend),
+                'hits': self.hits,
+                'semantic_hits': self.semantic_hits,
+                'misses': self.misses
+            }
@@ -1,13 +1,72 @@
 import os
+import functools
 import logging
+import random
+import threading
 import time
 import traceback
-import openai
-from typing import Dict, List, Any, Union, Optional
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from types import SimpleNamespace
+from typing import Dict, Iterator, List, Any, Union, Optional
+
+from modules.llm_cache import LLMCache, cache_key, make_cache_key
+from modules.openai_wrapper import OpenAIWrapper, get_openai_client
+
+# Gemini support is optional; GeminiProvider raises ImportError without it
+try:
+    import google.generativeai as genai
+    from google.api_core import exceptions as google_exceptions
+except ImportError:
+    genai = google_exceptions = None
 
 # Configure module logger
 logger = logging.getLogger(__name__)
 
+# How many of the preferred Gemini models a request may hedge across. With
+# more than 1, the next model is only started if the previous one hasn't
+# answered within GEMINI_HEDGE_DELAY seconds (or failed), so the preferred
+# model always goes first; each hedge is an extra paid request
+GEMINI_RACE_MODELS = max(1, int(os.getenv("GEMINI_RACE_MODELS", "1")))
+GEMINI_HEDGE_DELAY = float(os.getenv("GEMINI_HEDGE_DELAY", "10"))
+
+# Gemini transport ("grpc", "rest"); None keeps the library default
+GEMINI_TRANSPORT = os.getenv("GEMINI_TRANSPORT") or None
+
+# Settings genai was last configured with, so repeat configuration is skipped
+_GEMINI_CONFIG = {}
+_GEMINI_CONFIG_LOCK = threading.Lock()
+
+# Upper bound (seconds) on a single retry backoff
+MAX_RETRY_DELAY = 30.0
+
+# Shared across providers so racing requests don't spawn threads per call
+_GEMINI_EXECUTOR = ThreadPoolExecutor(max_workers=max(4, GEMINI_RACE_MODELS * 4),
+                                      thread_name_prefix="gemini")
+
+def _configure_gemini(api_key: str) -> None:
+    """Point the google.generativeai client at api_key, once per key
+    
+    genai keeps one client (and gRPC channel or HTTP session) per service,
+    shared by every GenerativeModel, but genai.configure() throws them away.
+    Reconfiguring only when the key or transport changes lets every provider
+    instance reuse the same warm connection.
+    """
+    settings = (api_key, GEMINI_TRANSPORT)
+    with _GEMINI_CONFIG_LOCK:
+        if _GEMINI_CONFIG.get("settings") == settings:
+            return
+        genai.configure(api_key=api_key, transport=GEMINI_TRANSPORT)
+        _GEMINI_CONFIG["settings"] = settings
+
+def _backoff_delay(attempt: int, base_delay: float, max_delay: float = MAX_RETRY_DELAY) -> float:
+    """Randomized exponential backoff for retry attempt (0-based)
+    
+    The delay is drawn between base_delay and base_delay * 2**attempt (capped),
+    so retries from concurrent requests spread out instead of arriving together.
+    """
+    ceiling = min(max_delay, base_delay * (2 ** attempt))
+    return random.uniform(base_delay, max(base_delay, ceiling))
+
 class LLMProvider:
     """Base class for language model providers used in the application.
     
@@ -31,6 +90,21 @@ class LLMProvider:
             NotImplementedError: This method must be implemented by subclasses.
         """
         raise NotImplementedError("Subclasses must implement generate_chat_completion method")
+    
+    def stream_chat_completion(self, messages: List[Dict[str, str]], **kwargs: Any) -> Iterator[str]:
+        """Generate a chat completion, yielding text as it becomes available.
+        
+        Providers without native streaming yield the whole completion at once.
+        
+        Args:
+            messages: A list of message dictionaries, each containing 'role' and 'content'.
+            **kwargs: Additional parameters for the LLM provider (temperature, max_tokens, etc.)
+            
+        Yields:
+            str: Successive pieces of the generated text
+        """
+        response = self.generate_chat_completion(messages, **kwargs)
+        yield completion_text(response)
 
 class OpenAIProvider(LLMProvider):
     """OpenAI API implementation of the LLMProvider interface.
@@ -55,6 +129,7 @@ class OpenAIProvider(LLMProvider):
                 model: The model to use (default: gpt-3.5-turbo)
                 temperature: Sampling temperature (default: 0.7)
                 max_tokens: Maximum tokens to generate (default: 1500)
+                response_format: e.g. {"type": "json_object"} for JSON mode (optional)
                 
         Returns:
             An OpenAI API response object with the generated completion
@@ -63,8 +138,41 @@ class OpenAIProvider(LLMProvider):
             model=kwargs.get("model", "gpt-3.5-turbo"),
             messages=messages,
             temperature=kwargs.get("temperature", 0.7),
-            max_tokens=kwargs.get("max_tokens", 1500)
+            max_tokens=kwargs.get("max_tokens", 1500),
+            **self._response_format(kwargs)
+        )
+    
+    def is_available(self) -> bool:
+        """Check if provider has a client to send requests with (no API call)"""
+        return self.client is not None
+    
+    @staticmethod
+    def _response_format(kwargs: Dict[str, Any]) -> Dict[str, Any]:
+        """The response_format argument, only when the caller asked for one"""
+        response_format = kwargs.get("response_format")
+        return {"response_format": response_format} if response_format else {}
+    
+    def stream_chat_completion(self, messages: List[Dict[str, str]], **kwargs: Any) -> Iterator[str]:
+        """Stream a chat completion from OpenAI's API.
+        
+        Args:
+            messages: A list of message dictionaries with 'role' and 'content' keys
+            **kwargs: Additional parameters for the OpenAI API (see generate_chat_completion)
+            
+        Yields:
+            str: Content deltas in arrival order
+        """
+        stream = self.client.chat.completions.create(
+            model=kwargs.get("model", "gpt-3.5-turbo"),
+            messages=messages,
+            temperature=kwargs.get("temperature", 0.7),
+            max_tokens=kwargs.get("max_tokens", 1500),
+            stream=True,
+            **self._response_format(kwargs)
         )
+        for chunk in stream:
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
 
 class GeminiProvider(LLMProvider):
     """Implements access to Google's Gemini API with OpenAI fallback.
@@ -81,6 +189,14 @@ class GeminiProvider(LLMProvider):
         super().__init__()
         self.logger = logging.getLogger('linkedin-generator')
         
+        # Attempts per model and base backoff delay (seconds) for transient failures
+        self.max_retries = max(1, int(os.environ.get("GEMINI_MAX_RETRIES", "3")))
+        self.retry_delay = float(os.environ.get("GEMINI_RETRY_DELAY", "1.0"))
+        
+        # GenerativeModel instances by name, shared by initialization, fallbacks and races
+        self._models = {}
+        self._models_lock = threading.Lock()
+        
         # Check for explicit mock mode first
         self.mock_mode = os.environ.get("MOCK_MODE", "false").lower() in ["true", "1", "yes"]
         if self.mock_mode:
@@ -103,26 +219,28 @@ class GeminiProvider(LLMProvider):
         Raises:
             ValueError: If no valid API key is provided and no model can be initialized
         """
-        import google.generativeai as genai
-        import time
-        
         # Skip initialization if in mock mode
         if self.mock_mode:
             self.logger.info("GeminiProvider initialization skipped (mock mode)")
             return
+        
+        if genai is None:
+            raise ImportError("google-generativeai is not installed; it is required for GeminiProvider")
             
         if not self.api_key:
             self.logger.error("No Gemini API key provided. Set GEMINI_API_KEY environment variable or pass api_key to GeminiProvider.")
             self.logger.info("Attempting to fall back to OpenAI for this session...")
-            fallback_provider = OpenAIProvider() 
-            if fallback_provider.is_available():
+            wrapper = OpenAIWrapper()
+            if not wrapper.is_mock() and OpenAIProvider(wrapper.get_client()).is_available():
                 self.logger.warning("OpenAI fallback provider is available, will use for this session instead of Gemini")
+                # No Gemini models to try; generate_chat_completion goes straight to the OpenAI fallback
+                self.model_names = []
                 return
             else:
                 raise ValueError("No valid Gemini API key provided and OpenAI fallback is not available")
         
-        # Configure the Gemini API
-        genai.configure(api_key=self.api_key)
+        # Configure the Gemini API (once per key, keeping the shared connection)
+        _configure_gemini(self.api_key)
         
         # Define generation config (used across models)
         self.generation_config = {
@@ -145,53 +263,53 @@ class GeminiProvider(LLMProvider):
         self.current_model_name = None
         
         # Try to list available models with retry logic
-        for attempt in range(max_retries):
+        for attempt in range(self.max_retries):
             try:
                 all_models = genai.list_models()
                 model_names = [model.name for model in all_models]
-                self.logger.info(f"Available Gemini models: {model_names}")
+                self.logger.info("Available Gemini models: %s", model_names)
                 
-                # Update model list based on available models if possible
-                available_models = []
-                for model_name in self.model_names:
-                    if any(model_name in m for m in model_names):
-                        available_models.append(model_name)
+                # Update model list based on available models if possible;
+                # API names look like "models/gemini-1.5-pro"
+                available = {name.rsplit("/", 1)[-1] for name in model_names}
+                available_models = [name for name in self.model_names if name in available]
                 
                 if available_models:
-                    self.logger.info(f"Found matching models in API: {available_models}")
-                    self.model_names = available_models + [m for m in self.model_names if m not in available_models]
+                    self.logger.info("Found matching models in API: %s", available_models)
+                    self.model_names = available_models + [m for m in self.model_names if m not in available]
                 break
                 
             except Exception as e:
-                import traceback
-                self.logger.warning(f"Attempt {attempt+1}/{max_retries}: Unable to list models: {str(e)}")
-                self.logger.debug(f"Model listing exception details: {traceback.format_exc()}")
-                if attempt < max_retries - 1:
-                    time.sleep(retry_delay)
+                self.logger.warning("Attempt %d/%d: Unable to list models: %s", attempt + 1, self.max_retries, e)
+                if self.logger.isEnabledFor(logging.DEBUG):
+                    self.logger.debug("Model listing exception details:\n%s", traceback.format_exc())
+                if attempt < self.max_retries - 1:
+                    time.sleep(_backoff_delay(attempt, self.retry_delay))
         
         # Try each model name with retry logic for each model
         for model_name in self.model_names:
             success = False
-            for attempt in range(max_retries):
+            for attempt in range(self.max_retries):
                 try:
-                    self.model = genai.GenerativeModel(model_name, generation_config=self.generation_config)
-                    test_response = self.model.generate_content("Hello, please respond with a single word: Working")
+                    model = self._get_model(model_name)
+                    test_response = model.generate_content("Hello, please respond with a single word: Working")
                     
                     if test_response and hasattr(test_response, 'text'):
-                        self.logger.info(f"Successfully initialized Gemini with model '{model_name}'")
-                        self.logger.info(f"Test response: {test_response.text[:20]}...")
+                        self.logger.info("Successfully initialized Gemini with model '%s'", model_name)
+                        self.logger.info("Test response: %.20s...", test_response.text)
+                        self.model = model
                         self.current_model_name = model_name
                         success = True
                         break
                     else:
-                        self.logger.warning(f"Model {model_name} did not return valid response format")
+                        self.logger.warning("Model %s did not return valid response format", model_name)
                 
                 except Exception as e:
-                    import traceback
-                    self.logger.warning(f"Attempt {attempt+1}/{max_retries} failed for model '{model_name}': {str(e)}")
-                    self.logger.debug(f"Gemini model initialization exception:\n{traceback.format_exc()}")
-                    if attempt < max_retries - 1:
-                        time.sleep(retry_delay)
+                    self.logger.warning("Attempt %d/%d failed for model '%s': %s", attempt + 1, self.max_retries, model_name, e)
+                    if self.logger.isEnabledFor(logging.DEBUG):
+                        self.logger.debug("Gemini model initialization exception:\n%s", traceback.format_exc())
+                    if attempt < self.max_retries - 1:
+                        time.sleep(_backoff_delay(attempt, self.retry_delay))
             
             if success:
                 break
@@ -199,7 +317,7 @@ class GeminiProvider(LLMProvider):
         if self.model is None:
             raise ValueError("Could not initialize any Gemini model with the provided API key after all retries")
             
-        self.logger.info(f"GeminiProvider initialization complete using model: {self.current_model_name}")
+        self.logger.info("GeminiProvider initialization complete using model: %s", self.current_model_name)
 
     def generate_chat_completion(self, messages, **kwargs):
         """Generate a chat completion using Gemini API with fallback mechanisms.
@@ -218,9 +336,6 @@ class GeminiProvider(LLMProvider):
         Raises:
             Exception: If all Gemini models and fallbacks fail
         """
-        import logging
-        import time
-        
         # Handle mock mode with a realistic test response
         if self.mock_mode:
             self.logger.info("GeminiProvider.generate_chat_completion running in mock mode")
@@ -249,136 +364,427 @@ class GeminiProvider(LLMProvider):
             }
         
         # Normal processing path
-        import google.generativeai as genai
-        from google.api_core import exceptions as google_exceptions
-        import openai
-        
         logger = logging.getLogger('linkedin-generator')
         
-        # Format messages from OpenAI format to Gemini format
-        # Gemini doesn't have a direct "system" role, so we'll include system prompts differently
+        gemini_messages = self._to_gemini_messages(messages)
+        
+        generation_config = self._generation_config(kwargs)
+        
+        # Hedge across the leading models so one slow model doesn't add its full
+        # timeout to the request; the rest are tried in order afterwards
+        race, rest = self.model_names[:GEMINI_RACE_MODELS], self.model_names[GEMINI_RACE_MODELS:]
+        if gemini_messages:
+            response = self._race_models(race, gemini_messages, generation_config)
+            if response is not None:
+                return response
+            for model_name in rest:
+                response = self._generate_with_model(model_name, gemini_messages, generation_config)
+                if response is not None:
+                    return response
+        else:
+            logger.warning("No properly formatted messages to send to Gemini")
+        
+        # If we've exhausted all Gemini models, fall back to OpenAI
+        logger.warning("All Gemini models failed, attempting to fall back to OpenAI")
+        
+        # Check for OpenAI API key
+        openai_api_key = os.getenv("OPENAI_API_KEY")
+        if not openai_api_key:
+            logger.error("OpenAI API key not found for fallback")
+            raise Exception("All Gemini models failed and OpenAI API key not available for fallback")
+        
+        try:
+            # Shared client, so repeated fallbacks reuse its connection pool
+            openai_client = get_openai_client(openai_api_key)
+            
+            # Create a new instance of OpenAIProvider (from this module)
+            openai_provider = OpenAIProvider(openai_client)
+            
+            logger.info("Falling back to OpenAI for this request")
+            return openai_provider.generate_chat_completion(messages, **kwargs)
+            
+        except Exception as e:
+            logger.error("OpenAI fallback also failed: %s", e)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("OpenAI fallback exception details:\n%s", traceback.format_exc())
+            raise Exception(f"All LLM providers failed. Last error: {str(e)}")
+
+    def stream_chat_completion(self, messages, **kwargs):
+        """Stream a chat completion from the initialized Gemini model.
+        
+        If the stream fails before producing any text, the request falls back
+        to generate_chat_completion (other models, then OpenAI) and its result
+        is yielded whole.
+        
+        Args:
+            messages: List of message dictionaries with 'role' and 'content' keys
+            **kwargs: Additional parameters (see generate_chat_completion)
+            
+        Yields:
+            str: Content deltas in arrival order
+        """
+        if self.mock_mode or self.model is None:
+            yield from super().stream_chat_completion(messages, **kwargs)
+            return
+        
+        model_name = self.current_model_name
+        started = False
+        try:
+            stream = self._get_model(model_name).generate_content(
+                self._to_gemini_messages(messages),
+                generation_config=self._generation_config(kwargs),
+                stream=True
+            )
+            for chunk in stream:
+                text = chunk.text
+                if text:
+                    started = True
+                    yield text
+        except Exception as e:
+            if started:
+                raise
+            self.logger.warning("Streaming from Gemini model '%s' failed (%s), falling back to a full completion",
+                                model_name, e)
+            yield from super().stream_chat_completion(messages, **kwargs)
+    
+    @staticmethod
+    def _generation_config(kwargs):
+        """Gemini generation parameters from OpenAI-style keyword arguments"""
+        return {
+            "temperature": kwargs.get("temperature", 0.7),
+            "max_output_tokens": kwargs.get("max_tokens", 2048),
+            "top_p": kwargs.get("top_p", 0.95),
+            "top_k": kwargs.get("top_k", 40),
+        }
+    
+    def _get_model(self, model_name):
+        """Return the GenerativeModel for model_name, creating it on first use.
+        
+        Args:
+            model_name: Name of the Gemini model
+            
+        Returns:
+            genai.GenerativeModel: Model instance reused across requests
+        """
+        with self._models_lock:
+            model = self._models.get(model_name)
+            if model is None:
+                model = self._models[model_name] = genai.GenerativeModel(
+                    model_name, generation_config=self.generation_config)
+            return model
+    
+    @staticmethod
+    def _to_gemini_messages(messages):
+        """Convert OpenAI-format messages to Gemini format in one pass.
+        
+        Gemini has no "system" role, so system prompts are prepended to the
+        first user message, or sent as a user message if there is none.
+        
+        Args:
+            messages: List of message dictionaries with 'role' and 'content' keys
+            
+        Returns:
+            list: Gemini message dictionaries with 'role' and 'parts' keys
+        """
         gemini_messages = []
-        system_prompt = ""
+        system_parts = []
         
         for msg in messages:
             role = msg.get("role", "").lower()
             content = msg.get("content", "")
             
             if role == "system":
-                system_prompt += content + "\n"
+                system_parts.append(content)
             elif role == "user":
                 gemini_messages.append({"role": "user", "parts": [content]})
             elif role == "assistant":
                 gemini_messages.append({"role": "model", "parts": [content]})
-                
-        # If we have a system prompt, prepend it to the first user message
-        # or add it as a user message if none exists
-        if system_prompt:
+        
+        if system_parts:
+            system_prompt = "\n".join(system_parts)
             if gemini_messages and gemini_messages[0]["role"] == "user":
-                gemini_messages[0]["parts"][0] = system_prompt + "\n\n" + gemini_messages[0]["parts"][0]
+                gemini_messages[0]["parts"][0] = f"{system_prompt}\n\n{gemini_messages[0]['parts'][0]}"
             else:
                 gemini_messages.insert(0, {"role": "user", "parts": [system_prompt]})
+        return gemini_messages
+    
+    def _race_models(self, model_names, gemini_messages, generation_config):
+        """Query Gemini models in preference order, hedging slow ones.
         
-        # Configure generation parameters
-        generation_config = {
-            "temperature": kwargs.get("temperature", 0.7),
-            "max_output_tokens": kwargs.get("max_tokens", 2048),
-            "top_p": kwargs.get("top_p", 0.95),
-            "top_k": kwargs.get("top_k", 40),
-        }
+        The first model is queried alone. The next one is started only when
+        every running model has failed, or none has answered within
+        GEMINI_HEDGE_DELAY seconds; from then on the first valid answer wins.
         
-        # Try to generate content with each model in our fallback chain
-        for model_name in self.model_names:
-            # Multiple retry attempts for transient errors
-            for attempt in range(self.max_retries):
-                try:
-                    # Use the cached model if it matches our target model, otherwise create a new one
-                    if self.model is None or self.current_model_name != model_name:
-                        logger.info(f"Switching to model '{model_name}'")
-                        self.model = genai.GenerativeModel(model_name, generation_config=self.generation_config)
-                        self.current_model_name = model_name
-                    
-                    # If we have chat messages, use generate_content with messages
-                    if gemini_messages:
-                        logger.debug(f"Attempt {attempt+1}/{self.max_retries}: Sending chat messages to Gemini model '{model_name}'")
-                        response = self.model.generate_content(
-                            gemini_messages,
-                            generation_config=generation_config
-                        )
-                        
-                        # Check if we have a valid response
-                        if response and hasattr(response, 'text'):
-                            logger.info(f"Successfully generated content with model '{model_name}'")
-                            # Format response to match OpenAI format for consistency
-                            return {
-                                "choices": [
-                                    {
-                                        "message": {
-                                            "role": "assistant",
-                                            "content": response.text
-                                        },
-                                        "finish_reason": "stop"
-                                    }
-                                ],
-                                "model": model_name,
-                                "provider": "gemini"
-                            }
-                        else:
-                            logger.warning(f"Model '{model_name}' returned an invalid response format on attempt {attempt+1}")
-                            if attempt < self.max_retries - 1:
-                                time.sleep(self.retry_delay)
-                                continue
-                            # Fall through to try another model if max retries reached
-                        
-                    else:
-                        logger.warning("No properly formatted messages to send to Gemini")
-                        # Skip retries if we have no messages to send
-                        break
-                
-                except (google_exceptions.ResourceExhausted, 
-                        google_exceptions.ServiceUnavailable, 
-                        google_exceptions.DeadlineExceeded) as e:
-                    # These are likely transient errors, retry
-                    logger.warning(f"Transient error with model '{model_name}' on attempt {attempt+1}: {str(e)}")
-                    if attempt < self.max_retries - 1:
-                        wait_time = self.retry_delay * (2 ** attempt)  # Exponential backoff
-                        logger.info(f"Waiting {wait_time}s before retry...")
-                        time.sleep(wait_time)
-                        continue
-                    else:
-                        logger.error(f"Failed after {self.max_retries} attempts with model '{model_name}'")
-                        # Move to next model
-                        break
-                        
-                except Exception as e:
-                    import traceback
-                    logger.error(f"Unrecoverable error with model '{model_name}': {str(e)}")
-                    logger.debug(f"Exception details:\n{traceback.format_exc()}")
-                    # Skip retries for errors that aren't likely to be transient
-                    break
-                # Continue to the next model
-                continue
+        Args:
+            model_names: Models to try, most preferred first
+            gemini_messages: Messages already converted to Gemini format
+            generation_config: Per-request generation parameters
+            
+        Returns:
+            The first valid OpenAI-format response, or None if every model failed
+        """
+        if not model_names:
+            return None
+        if len(model_names) == 1:
+            return self._generate_with_model(model_names[0], gemini_messages, generation_config)
         
-        # If we've exhausted all Gemini models, fall back to OpenAI
-        logger.warning("All Gemini models failed, attempting to fall back to OpenAI")
+        remaining = iter(model_names)
+        futures, pending = [], set()
         
-        # Check for OpenAI API key
-        openai_api_key = os.getenv("OPENAI_API_KEY")
-        if not openai_api_key:
-            logger.error("OpenAI API key not found for fallback")
-            raise Exception("All Gemini models failed and OpenAI API key not available for fallback")
+        def start_next():
+            name = next(remaining, None)
+            if name is not None:
+                future = _GEMINI_EXECUTOR.submit(self._generate_with_model, name, gemini_messages, generation_config)
+                futures.append(future)
+                pending.add(future)
         
+        start_next()
         try:
-            # Create OpenAI client with the API key
-            openai_client = openai.OpenAI(api_key=openai_api_key)
+            while pending:
+                done, pending = wait(pending, timeout=GEMINI_HEDGE_DELAY, return_when=FIRST_COMPLETED)
+                for future in done:
+                    try:
+                        response = future.result()
+                    except Exception as e:
+                        self.logger.error("Gemini request failed: %s", e)
+                        continue
+                    if response is not None:
+                        return response
+                # Nothing usable yet: a slow model is hedged, a failed one replaced
+                start_next()
+            return None
+        finally:
+            # Hedges that haven't started are dropped; running ones finish in the background
+            for future in futures:
+                future.cancel()
+    
+    def _generate_with_model(self, model_name, gemini_messages, generation_config):
+        """Generate with one Gemini model, retrying transient errors.
+        
+        Args:
+            model_name: Name of the Gemini model to use
+            gemini_messages: Messages already converted to Gemini format
+            generation_config: Per-request generation parameters
             
-            # Create a new instance of OpenAIProvider (from this module)
-            openai_provider = OpenAIProvider(openai_client)
+        Returns:
+            An OpenAI-format response dict, or None if the model failed
+        """
+        logger = logging.getLogger('linkedin-generator')
+        
+        # Multiple retry attempts for transient errors
+        for attempt in range(self.max_retries):
+            try:
+                model = self._get_model(model_name)
+                
+                logger.debug("Attempt %d/%d: Sending chat messages to Gemini model '%s'", attempt + 1, self.max_retries, model_name)
+                response = model.generate_content(
+                    gemini_messages,
+                    generation_config=generation_config
+                )
+                
+                # Check if we have a valid response
+                if response and hasattr(response, 'text'):
+                    logger.info("Successfully generated content with model '%s'", model_name)
+                    # Format response to match OpenAI format for consistency
+                    return {
+                        "choices": [
+                            {
+                                "message": {
+                                    "role": "assistant",
+                                    "content": response.text
+                                },
+                                "finish_reason": "stop"
+                            }
+                        ],
+                        "model": model_name,
+                        "provider": "gemini"
+                    }
+                
+                logger.warning("Model '%s' returned an invalid response format on attempt %d", model_name, attempt + 1)
+                if attempt < self.max_retries - 1:
+                    time.sleep(_backoff_delay(attempt, self.retry_delay))
             
-            logger.info("Falling back to OpenAI for this request")
-            return openai_provider.generate_chat_completion(messages, **kwargs)
+            except (google_exceptions.ResourceExhausted, 
+                    google_exceptions.ServiceUnavailable, 
+                    google_exceptions.DeadlineExceeded) as e:
+                # These are likely transient errors, retry
+                logger.warning("Transient error with model '%s' on attempt %d: %s", model_name, attempt + 1, e)
+                if attempt < self.max_retries - 1:
+                    wait_time = _backoff_delay(attempt, self.retry_delay)
+                    logger.info("Waiting %.1fs before retry...", wait_time)
+                    time.sleep(wait_time)
+                else:
+                    logger.error("Failed after %d attempts with model '%s'", self.max_retries, model_name)
+                    
+            except Exception as e:
+                logger.error("Unrecoverable error with model '%s': %s", model_name, e)
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("Exception details:\n%s", traceback.format_exc())
+                # Skip retries for errors that aren't likely to be transient
+                break
+        
+        return None
+
+
+_PROVIDER_LOCK = threading.Lock()
+
+
+def get_provider(kind: str, api_key: Optional[str] = None) -> LLMProvider:
+    """Shared provider instance for a provider kind and API key.
+    
+    Building a GeminiProvider lists the available models and probes them,
+    which takes seconds, so every generator and analyzer reuses one instance
+    per key. Mock-mode providers are cheap and are built fresh. A provider
+    that fails to initialize is not cached, so the next call retries.
+    
+    Args:
+        kind: Provider name, "gemini" or "openai"
+        api_key: API key for the provider (default: from the environment)
+        
+    Returns:
+        LLMProvider: The shared provider
+        
+    Raises:
+        ValueError: If kind is not a known provider
+    """
+    if os.environ.get("MOCK_MODE", "false").lower() in ["true", "1", "yes"]:
+        return _build_provider(kind, api_key)
+    # Concurrent first calls wait for one initialization instead of each probing
+    with _PROVIDER_LOCK:
+        return _cached_provider(kind, api_key)
+
+
+def _build_provider(kind: str, api_key: Optional[str]) -> LLMProvider:
+    """Construct a new provider of the given kind"""
+    if kind == "gemini":
+        return GeminiProvider(api_key)
+    if kind == "openai":
+        return OpenAIProvider(get_openai_client(api_key or os.getenv("OPENAI_API_KEY")))
+    raise ValueError(f"Unknown LLM provider: {kind}")
+
+
+_cached_provider = functools.lru_cache(maxsize=None)(_build_provider)
+
+
+def completion_text(response: Any) -> str:
+    """Generated text of a completion, from OpenAI response objects or the dicts other providers return"""
+    if isinstance(response, dict):
+        return response["choices"][0]["message"]["content"]
+    return response.choices[0].message.content
+
+
+def text_completion(text: str) -> Any:
+    """Minimal OpenAI-style response object carrying text (response.choices[0].message.content)"""
+    message = SimpleNamespace(role="assistant", content=text)
+    return SimpleNamespace(choices=[SimpleNamespace(message=message, finish_reason="stop")])
+
+
+class CachingLLMProvider(LLMProvider):
+    """Response cache in front of another provider.
+    
+    Identical requests are answered from an exact-match tier, and requests
+    whose last user message is nearly identical to a cached one (same model,
+    system message and parameters) from the semantic tier. Sampled requests
+    (temperature above 0) are passed straight through unless cache_sampled is
+    set, since callers usually want fresh wording from them. Cache hits are
+    returned as OpenAI-style response objects, so callers are unchanged.
+    """
+    
+    def __init__(self, provider: LLMProvider, cache: Optional[LLMCache] = None, cache_sampled: bool = False):
+        """Wrap a provider with a response cache.
+        
+        Args:
+            provider: The provider that serves cache misses
+            cache: Response cache (default: one built from config)
+            cache_sampled: Also cache requests with temperature above 0
+        """
+        self.provider = provider
+        self.cache = cache if cache is not None else LLMCache()
+        self.cache_sampled = cache_sampled
+    
+    def __getattr__(self, name: str) -> Any:
+        # Everything else (client, mock_mode, is_available, ...) comes from the wrapped provider
+        if name == "provider":
+            raise AttributeError(name)
+        return getattr(self.provider, name)
+    
+    def _cache_keys(self, messages: List[Dict[str, str]], kwargs: Dict[str, Any]):
+        """Exact-match key, semantic namespace and semantic text for a request, or None if it is not cached"""
+        provider = type(self.provider).__name__
+        params = dict(kwargs)
+        key = cache_key(params.pop("model", None), messages, params.pop("temperature", 0.7),
+                        params.pop("max_tokens", None), provider=provider, **params)
+        if key is None:
+            if not self.cache_sampled:
+                return None
+            key = make_cache_key(provider=provider, messages=messages, params=kwargs)
+        # The last user message is matched semantically; everything else must be identical
+        user_indexes = [i for i, m in enumerate(messages) if m.get("role") == "user"]
+        last = user_indexes[-1] if user_indexes else len(messages)
+        last_user = messages[last].get("content", "") if user_indexes else ""
+        context = messages[:last] + messages[last + 1:]
+        namespace = make_cache_key(provider=provider, context=context, params=kwargs)
+        return key, namespace, last_user
+    
+    def _log_lookup(self, hit: bool) -> None:
+        """Log a cache lookup with the running counters"""
+        if not logger.isEnabledFor(logging.INFO):
+            return
+        stats = self.cache.stats
+        logger.info("LLM response cache %s (hits=%d, semantic_hits=%d, misses=%d)",
+                    "hit" if hit else "miss", stats['hits'], stats['semantic_hits'], stats['misses'])
+    
+    def generate_chat_completion(self, messages: List[Dict[str, str]], **kwargs: Any) -> Any:
+        """Generate a chat completion, answering from the cache when possible.
+        
+        Args:
+            messages: A list of message dictionaries with 'role' and 'content' keys
+            **kwargs: Parameters passed through to the wrapped provider
             
-        except Exception as e:
-            logger.error(f"OpenAI fallback also failed: {str(e)}")
-            logger.debug(f"OpenAI fallback exception details:\n{traceback.format_exc()}")
-            raise Exception(f"All LLM providers failed. Last error: {str(e)}")
+        Returns:
+            The wrapped provider's response, or an OpenAI-style response on a cache hit
+        """
+        keys = self._cache_keys(messages, kwargs)
+        if keys is None:
+            return self.provider.generate_chat_completion(messages, **kwargs)
+        
+        key, namespace, text = keys
+        computed = []
+        
+        def complete():
+            response = self.provider.generate_chat_completion(messages, **kwargs)
+            computed.append(response)
+            return completion_text(response)
+        
+        content = self.cache.get_or_compute(key, complete, text=text, namespace=namespace)
+        self._log_lookup(hit=not computed)
+        # A fresh response is returned as-is; hits only carry the cached text
+        return computed[0] if computed else text_completion(content)
+    
+    def stream_chat_completion(self, messages: List[Dict[str, str]], **kwargs: Any) -> Iterator[str]:
+        """Stream a chat completion; a cached completion is yielded whole.
+        
+        Args:
+            messages: A list of message dictionaries with 'role' and 'content' keys
+            **kwargs: Parameters passed through to the wrapped provider
+            
+        Yields:
+            str: Successive pieces of the generated text
+        """
+        keys = self._cache_keys(messages, kwargs)
+        if keys is not None:
+            key, namespace, text = keys
+            content = self.cache.get(key)
+            if content is None:
+                content = self.cache.get_similar(text, namespace)
+            self._log_lookup(hit=content is not None)
+            if content is not None:
+                yield content
+                return
+        
+        parts = []
+        for delta in self.provider.stream_chat_completion(messages, **kwargs):
+            parts.append(delta)
+            yield delta
+        if keys is not None:
+            self.cache.set(key, "".join(parts), text=text, namespace=namespace)
@@ -2,10 +2,18 @@
 Logging configuration for the LinkedIn Post Generator application.
 Centralizes logging setup to ensure consistent formatting across the application.
 """
+import atexit
 import logging
+import queue
 import sys
 import os
-from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener, TimedRotatingFileHandler
+
+# Days of rotated log files to keep
+LOG_BACKUP_DAYS = int(os.getenv("LOG_BACKUP_DAYS", "14"))
+
+# Background thread that writes queued records to the real handlers
+_listener = None
 
 def configure_logging(log_level=logging.INFO):
     """
@@ -35,17 +43,35 @@ def configure_logging(log_level=logging.INFO):
     console_handler.setFormatter(console_formatter)
     console_handler.setLevel(log_level)
     
-    # Create file handler
-    log_file = os.path.join(logs_dir, f'app_{datetime.now().strftime("%Y%m%d")}.log')
-    file_handler = logging.FileHandler(log_file)
+    # Create file handler; rotates at midnight (app.log.YYYY-MM-DD) and only
+    # opens the file on the first write
+    log_file = os.path.join(logs_dir, 'app.log')
+    file_handler = TimedRotatingFileHandler(log_file, when='midnight', backupCount=LOG_BACKUP_DAYS,
+                                            encoding='utf-8', delay=True)
     file_handler.setFormatter(file_formatter)
     file_handler.setLevel(log_level)
     
-    # Add handlers to logger
-    logger.addHandler(console_handler)
-    logger.addHandler(file_handler)
+    # Callers only enqueue records; a background listener does the console and
+    # file writes, so request threads never block on disk I/O
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+    else:
+        atexit.register(_stop_listener)
+    log_queue = queue.Queue(-1)
+    _listener = QueueListener(log_queue, console_handler, file_handler, respect_handler_level=True)
+    _listener.start()
+    logger.addHandler(QueueHandler(log_queue))
     
     logger.info(f"Logging configured with level {logging.getLevelName(log_level)}")
     logger.info(f"Log file: {log_file}")
     
     return logger
+
+
+def _stop_listener():
+    """Flush queued records and stop the listener thread at interpreter exit"""
+    if _listener is not None:
+        _listener.stop()
@@ -3,13 +3,74 @@ Mock LLM Provider for testing and development purposes
 """
 import os
 import logging
+import functools
+import itertools
 import json
 import random
-from datetime import datetime
+import re
+from types import MappingProxyType
 from modules.llm_provider import LLMProvider
 
 logger = logging.getLogger('linkedin-generator')
 
+# Prompt keywords and the response category they select; when several
+# categories match, the first in _CATEGORY_PRIORITY wins
+_KEYWORD_CATEGORIES = MappingProxyType({
+    "linkedin": "linkedin_posts",
+    "post": "linkedin_posts",
+    "summarize": "summaries",
+    "summary": "summaries",
+    "error": "error_responses",
+})
+_CATEGORY_PRIORITY = ("linkedin_posts", "summaries", "error_responses")
+_KEYWORD_RE = re.compile("|".join(map(re.escape, _KEYWORD_CATEGORIES)), re.IGNORECASE)
+
+
+@functools.lru_cache(maxsize=None)
+def _load_responses():
+    """Load mock responses from mock_responses.json if available, else the defaults
+
+    Returns:
+        MappingProxyType: Read-only mapping of response category to a tuple of responses
+    """
+    default_responses = {
+        "linkedin_posts": [
+            "I'm excited to announce that our team has just hit a major milestone! After months of hard work, we've successfully launched our new product. #TeamSuccess #ProductLaunch",
+            "Just wrapped up an enlightening webinar on AI ethics. The discussions around responsible innovation were thought-provoking. Sharing key takeaways soon! #AIEthics #ProfessionalDevelopment", 
+            "Honored to be recognized as a thought leader in our industry this week. Grateful for my incredible team who makes innovation possible every day. #Leadership #Teamwork"
+        ],
+        "summaries": [
+            "The article discusses advances in artificial intelligence and their impact on business operations.",
+            "Research highlights the importance of work-life balance for productivity and employee retention.",
+            "The study examines market trends in the tech industry and predicts continued growth in cloud computing."
+        ],
+        "error_responses": [
+            {"error": "mock_error", "message": "This is a mock error response for testing"},
+            {"error": "timeout", "message": "Mock timeout error"},
+            {"error": "rate_limit", "message": "Mock rate limit exceeded"}
+        ]
+    }
+    
+    # Check if custom responses file exists
+    mock_responses_path = os.path.join(os.path.dirname(__file__), 'mock_responses.json')
+    if os.path.exists(mock_responses_path):
+        try:
+            with open(mock_responses_path, 'r') as f:
+                custom_responses = json.load(f)
+            logger.info(f"MockProvider: Loaded custom mock responses from {mock_responses_path}")
+            return _freeze(custom_responses)
+        except Exception as e:
+            logger.warning(f"MockProvider: Failed to load custom responses: {e}")
+    
+    logger.info("MockProvider: Using default mock responses")
+    return _freeze(default_responses)
+
+
+def _freeze(responses):
+    """Read-only view of a responses dict, with list values turned into tuples"""
+    return MappingProxyType({k: tuple(v) if isinstance(v, list) else v for k, v in responses.items()})
+
+
 class MockProvider(LLMProvider):
     """
     Mock LLM Provider that returns predefined responses for testing
@@ -22,45 +83,23 @@ class MockProvider(LLMProvider):
         self.logger = logging.getLogger('linkedin-generator')
         self.logger.info("MockProvider: Initializing mock LLM provider")
         
-        # Load predefined responses if available
-        self.responses = self._load_responses()
+        # Predefined responses, loaded once per process and shared read-only
+        self.responses = _load_responses()
         self.response_index = 0
         self.mock_conversation_history = []
         
-    def _load_responses(self):
-        """Load mock responses from a file if available"""
-        default_responses = {
-            "linkedin_posts": [
-                "I'm excited to announce that our team has just hit a major milestone! After months of hard work, we've successfully launched our new product. #TeamSuccess #ProductLaunch",
-                "Just wrapped up an enlightening webinar on AI ethics. The discussions around responsible innovation were thought-provoking. Sharing key takeaways soon! #AIEthics #ProfessionalDevelopment", 
-                "Honored to be recognized as a thought leader in our industry this week. Grateful for my incredible team who makes innovation possible every day. #Leadership #Teamwork"
-            ],
-            "summaries": [
-                "The article discusses advances in artificial intelligence and their impact on business operations.",
-                "Research highlights the importance of work-life balance for productivity and employee retention.",
-                "The study examines market trends in the tech industry and predicts continued growth in cloud computing."
-            ],
-            "error_responses": [
-                {"error": "mock_error", "message": "This is a mock error response for testing"},
-                {"error": "timeout", "message": "Mock timeout error"},
-                {"error": "rate_limit", "message": "Mock rate limit exceeded"}
-            ]
+        # Content pickers bound once per category; the fallbacks cover custom
+        # response files that omit a category
+        self._pickers = {
+            "linkedin_posts": functools.partial(random.choice, self.responses.get("linkedin_posts", ["Mock LinkedIn post content"])),
+            "summaries": functools.partial(random.choice, self.responses.get("summaries", ["Mock summary content"])),
+            None: lambda: "This is a generic mock response.",
         }
+        self._pick_error = functools.partial(
+            random.choice, self.responses.get("error_responses", [{"error": "mock_error", "message": "Mock error"}]))
+        # Orders responses within this provider (cheaper than a wall-clock timestamp)
+        self._sequence = itertools.count(1)
         
-        # Check if custom responses file exists
-        mock_responses_path = os.path.join(os.path.dirname(__file__), 'mock_responses.json')
-        if os.path.exists(mock_responses_path):
-            try:
-                with open(mock_responses_path, 'r') as f:
-                    custom_responses = json.load(f)
-                self.logger.info(f"MockProvider: Loaded custom mock responses from {mock_responses_path}")
-                return custom_responses
-            except Exception as e:
-                self.logger.warning(f"MockProvider: Failed to load custom responses: {e}")
-        
-        self.logger.info("MockProvider: Using default mock responses")
-        return default_responses
-    
     def generate_chat_completion(self, messages, **kwargs):
         """
         Generate a mock chat completion response
@@ -76,41 +115,21 @@ class MockProvider(LLMProvider):
         self.mock_conversation_history.extend(messages)
         
         # Determine response type based on the last user message
-        last_user_msg = ""
-        for msg in reversed(messages):
-            if msg.get("role") == "user":
-                last_user_msg = msg.get("content", "").lower()
-                break
-                
-        # Select appropriate mock content based on message content
-        content = "This is a generic mock response."
+        last_user_msg = next((m.get("content", "") for m in reversed(messages) if m.get("role") == "user"), "")
+        
+        # One scan finds every keyword; the highest-priority category wins
+        found = {_KEYWORD_CATEGORIES[match.lower()] for match in _KEYWORD_RE.findall(last_user_msg)}
+        category = next((c for c in _CATEGORY_PRIORITY if c in found), None)
         
-        if "linkedin" in last_user_msg or "post" in last_user_msg:
-            content = random.choice(self.responses.get("linkedin_posts", ["Mock LinkedIn post content"]))
-        elif "summarize" in last_user_msg or "summary" in last_user_msg:
-            content = random.choice(self.responses.get("summaries", ["Mock summary content"]))
-        elif "error" in last_user_msg:
+        if category == "error_responses":
             # Return a mock error response for testing error handling
-            error_resp = random.choice(self.responses.get("error_responses", [{"error": "mock_error", "message": "Mock error"}]))
-            return {
-                "error": error_resp
-            }
+            return {"error": self._pick_error()}
         
         # Return in OpenAI-compatible format
         return {
-            "choices": [
-                {
-                    "message": {
-                        "role": "assistant", 
-                        "content": content
-                    }
-                }
-            ],
+            "choices": [{"message": {"role": "assistant", "content": self._pickers[category]()}}],
             "model": "mock-model",
-            "mock_metadata": {
-                "timestamp": datetime.now().isoformat(),
-                "is_mock": True
-            }
+            "mock_metadata": {"sequence": next(self._sequence), "is_mock": True}
         }
     
     def is_available(self):
@@ -4,10 +4,55 @@ This module provides a clean wrapper for OpenAI client initialization
 """
 import os
 import logging
+import functools
 import importlib.util
+import traceback
 
 logger = logging.getLogger('linkedin-generator')
 
+# Resolved once at import; without the package the wrapper runs in mock mode
+try:
+    import httpx
+    from openai import OpenAI, APIError
+except ImportError:
+    httpx = OpenAI = APIError = None
+
+_OPENAI_AVAILABLE = OpenAI is not None
+
+
+@functools.lru_cache(maxsize=4)
+def get_openai_client(api_key):
+    """Process-wide OpenAI client for an API key
+
+    Every wrapper and fallback path shares one client per key, so they all
+    draw on the same warm connection pool instead of re-handshaking TLS.
+
+    Args:
+        api_key (str): OpenAI API key
+
+    Returns:
+        OpenAI: Configured client
+    """
+    # The SDK retries connection errors, 429s and 5xx with exponential backoff
+    max_retries = int(os.getenv("OPENAI_MAX_RETRIES", "3"))
+    return OpenAI(api_key=api_key, max_retries=max_retries, http_client=_build_http_client())
+
+
+def _build_http_client():
+    """HTTP client whose pool keeps enough warm connections for concurrent generation
+
+    The SDK default keeps only 20 idle connections alive, so bursts from
+    generate_many() and worker threads would re-handshake TLS on most calls.
+    HTTP/2 multiplexing is used when the optional h2 package is installed.
+    """
+    limits = httpx.Limits(
+        max_connections=int(os.getenv("OPENAI_MAX_CONNECTIONS", "200")),
+        max_keepalive_connections=int(os.getenv("OPENAI_MAX_KEEPALIVE_CONNECTIONS", "100"))
+    )
+    http2 = importlib.util.find_spec('h2') is not None
+    return httpx.Client(limits=limits, http2=http2)
+
+
 class OpenAIWrapper:
     """Wrapper for OpenAI client to handle initialization safely"""
     
@@ -36,31 +81,26 @@ class OpenAIWrapper:
             return
 
         try:
-            # Check if the openai package is available
-            if importlib.util.find_spec('openai') is None:
+            if not _OPENAI_AVAILABLE:
                 logger.error("OpenAI package not found. Switching to mock mode.")
                 self.mock_mode = True
                 self.client = None
                 return
 
-            from openai import OpenAI, APIError # Import OpenAI and specific APIError
-
-            # Attempt standard initialization
-            self.client = OpenAI(api_key=self.api_key)
+            self.client = get_openai_client(self.api_key)
             logger.info("OpenAI client initialized successfully.")
 
-        except APIError as e:
+        except APIError as e:  # Only reachable when the package (and so APIError) is available
             # Handle errors specifically from the OpenAI API (e.g., authentication, connection)
             logger.error(f"OpenAI APIError during client initialization: {e}. Switching to mock mode.")
             self.mock_mode = True
             self.client = None
         except ImportError:
-            # This case should ideally be caught by find_spec, but as a safeguard
+            # This case should ideally be caught by the import check, but as a safeguard
             logger.error("Failed to import OpenAI components. Switching to mock mode.")
             self.mock_mode = True
             self.client = None
         except Exception as e:
-            import traceback
             tb_str = traceback.format_exc()
             logger.error(f"Unexpected error initializing OpenAI client: {e}\nTraceback:\n{tb_str}Switching to mock mode.")
             self.mock_mode = True
@@ -2,66 +2,138 @@
 Rate limiter module to prevent API abuse and manage resource consumption
 """
 import os
+import math
 import time
+import threading
 from functools import wraps
 from flask import request, jsonify, current_app
 import logging
 
 logger = logging.getLogger('linkedin-generator')
 
-# Simple in-memory rate limiter (in production, consider using Redis)
+# Redis is optional; without it each worker process keeps its own buckets
+try:
+    import redis
+except ImportError:
+    redis = None
+
 class RateLimiter:
+    """In-process token bucket rate limiter guarded by a lock"""
+    
     def __init__(self, limit=60, window=60):  # Default: 60 requests per minute
         """
         Initialize the rate limiter
         
         Args:
-            limit: Maximum number of requests allowed in the time window
-            window: Time window in seconds
+            limit: Maximum number of requests allowed in the time window (bucket capacity)
+            window: Time window in seconds over which the bucket fully refills
         """
         self.limit = limit
         self.window = window
+        self.rate = limit / float(window)  # tokens added per second
         self.clients = {}
+        self._lock = threading.Lock()
+        
+    def _result(self, allowed, tokens):
+        """Convert a bucket state into (is_limited, reset_time, remaining)"""
+        if allowed:
+            return False, 0, int(tokens)
+        reset_time = max(1, math.ceil((1 - tokens) / self.rate))
+        return True, reset_time, 0
         
     def is_rate_limited(self, client_id):
         """Check if a client is currently rate limited
         
         Args:
-            client_id: Unique identifier for the client (typically IP address)
+            client_id: Unique identifier for the client (API key or IP address)
             
         Returns:
             tuple: (is_limited, reset_time, remaining)
         """
         current = time.time()
         
-        # Initialize client record if not exists
-        if client_id not in self.clients:
-            self.clients[client_id] = {
-                'requests': [],
-                'blocked_until': 0
-            }
-        
-        client = self.clients[client_id]
-        
-        # If client is currently blocked
-        if client['blocked_until'] > current:
-            reset_time = int(client['blocked_until'] - current)
-            return True, reset_time, 0
+        with self._lock:
+            tokens, last = self.clients.get(client_id, (self.limit, current))
             
-        # Clean old requests outside the time window
-        client['requests'] = [req for req in client['requests'] if req > current - self.window]
-        
-        # Check if client has reached the limit
-        remaining = self.limit - len(client['requests'])
-        if remaining <= 0:
-            # Block for double the window time if they've maxed out requests
-            client['blocked_until'] = current + (self.window * 2)
-            reset_time = self.window * 2
-            return True, reset_time, 0
+            # Refill for the time elapsed since the last request
+            tokens = min(self.limit, tokens + (current - last) * self.rate)
+            allowed = tokens >= 1
+            if allowed:
+                tokens -= 1
+            self.clients[client_id] = (tokens, current)
             
-        # Add current request
-        client['requests'].append(current)
-        return False, 0, remaining
+            # Drop idle clients whose buckets have fully refilled
+            if len(self.clients) > 10000:
+                self.clients = {
+                    cid: state for cid, state in self.clients.items()
+                    if current - state[1] < self.window
+                }
+                
+        return self._result(allowed, tokens)
+
+
+class RedisTokenBucket(RateLimiter):
+    """Token bucket shared by all worker processes through Redis"""
+    
+    # Refill and take a token atomically in one round-trip
+    LUA_SCRIPT = """
+    local capacity = tonumber(ARGV[1])
+    local rate = tonumber(ARGV[2])
+    local now = tonumber(ARGV[3])
+    local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+    local tokens = tonumber(bucket[1]) or capacity
+    local last = tonumber(bucket[2]) or now
+    tokens = math.min(capacity, tokens + math.max(0, now - last) * rate)
+    local allowed = 0
+    if tokens >= 1 then
+        tokens = tokens - 1
+        allowed = 1
+    end
+    redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+    redis.call('EXPIRE', KEYS[1], ARGV[4])
+    return {allowed, tostring(tokens)}
+    """
+    
+    def __init__(self, url, limit=60, window=60, prefix='linkedout:ratelimit:'):
+        """
+        Initialize the Redis-backed rate limiter
+        
+        Args:
+            url: Redis connection URL
+            limit: Maximum number of requests allowed in the time window
+            window: Time window in seconds
+            prefix: Key prefix for bucket hashes
+        """
+        super().__init__(limit=limit, window=window)
+        self.client = redis.Redis.from_url(url)
+        self.prefix = prefix
+        self.script = self.client.register_script(self.LUA_SCRIPT)
+        
+    def is_rate_limited(self, client_id):
+        try:
+            allowed, tokens = self.script(
+                keys=[self.prefix + str(client_id)],
+                args=[self.limit, self.rate, time.time(), self.window * 2]
+            )
+            return self._result(int(allowed) == 1, float(tokens))
+        except redis.RedisError as e:
+            # Keep serving with per-process limits if Redis goes away
+            logger.warning(f"Redis rate limiter unavailable, using in-process bucket: {e}")
+            return super().is_rate_limited(client_id)
+
+
+def create_limiter(limit, window=60):
+    """Create a Redis-backed limiter when REDIS_URL is set, else an in-process one"""
+    redis_url = os.environ.get('REDIS_URL')
+    if redis_url and redis is not None:
+        try:
+            limiter = RedisTokenBucket(redis_url, limit=limit, window=window)
+            limiter.client.ping()
+            logger.info("Rate limiter: using shared Redis token bucket")
+            return limiter
+        except Exception as e:
+            logger.warning(f"Rate limiter: Redis unavailable ({e}), using in-process token bucket")
+    return RateLimiter(limit=limit, window=window)
 
 
 # Get configuration from environment variables with defaults
@@ -73,7 +145,7 @@ except ValueError:
     rate_limit_value = default_limit
 
 # Global rate limiter instance
-limiter = RateLimiter(limit=rate_limit_value)
+limiter = create_limiter(rate_limit_value)
 
 def rate_limit(f):
     """Decorator to apply rate limiting to Flask routes"""
@@ -87,8 +159,10 @@ def rate_limit(f):
         if current_app.config.get('TESTING', False):
             return f(*args, **kwargs)
         
-        # Get client identifier (IP address or custom header for testing)
-        client_id = request.headers.get('X-Test-Client-ID', request.remote_addr)
+        # Get client identifier (API key, custom header for testing, or IP address)
+        client_id = (request.headers.get('X-API-Key')
+                     or request.headers.get('X-Test-Client-ID')
+                     or request.remote_addr)
         is_limited, reset_time, remaining = limiter.is_rate_limited(client_id)
         
         if is_limited:
@@ -2,7 +2,9 @@
 Settings Manager Module - Handles configuration changes during runtime
 """
 import os
+import sys
 import json
+import signal
 import logging
 import threading
 import time
@@ -34,6 +36,36 @@ class SettingsManager:
         
         # Load current environment variables
         load_dotenv(self.env_file)
+        
+        # Version of the .env file last loaded; changes when settings are saved
+        self._lock = threading.Lock()
+        self.version = self._env_version()
+    
+    def _env_version(self):
+        """Modification time of the .env file, used to detect saved settings"""
+        try:
+            return os.stat(self.env_file).st_mtime_ns
+        except OSError:
+            return 0
+    
+    def reload_if_changed(self):
+        """
+        Reload the .env file if it changed since it was last loaded, e.g.
+        because another worker process saved new settings.
+        
+        Returns:
+            bool: True if settings were reloaded
+        """
+        current = self._env_version()
+        if current == self.version:
+            return False
+        with self._lock:
+            if current == self.version:
+                return False
+            load_dotenv(self.env_file, override=True)
+            self.version = current
+        logger.info("Settings changed on disk, reloaded environment")
+        return True
     
     def get_current_settings(self):
         """Get current application settings"""
@@ -94,7 +126,9 @@ class SettingsManager:
                 logger.info("Updated OPENAI_API_KEY")
             
             # Reload environment variables
-            load_dotenv(self.env_file, override=True)
+            with self._lock:
+                load_dotenv(self.env_file, override=True)
+                self.version = self._env_version()
             
             return True
         
@@ -115,10 +149,16 @@ class SettingsManager:
         def _restart():
             logger.info(f"Scheduled restart in {delay} seconds...")
             time.sleep(delay)
-            logger.info("Restarting application...")
-            # Use SIGUSR1 signal to trigger a graceful restart
-            # The main app should catch this and restart
-            os.kill(os.getpid(), 10)  # SIGUSR1 = 10
+            if 'gunicorn' in sys.modules:
+                # Ask the gunicorn arbiter for a rolling restart (HUP) so other
+                # workers keep serving while this one is replaced
+                logger.info("Requesting rolling worker restart from gunicorn...")
+                os.kill(os.getppid(), signal.SIGHUP)
+            else:
+                logger.info("Restarting application...")
+                # Use SIGUSR1 signal to trigger a graceful restart
+                # The main app should catch this and restart
+                os.kill(os.getpid(), signal.SIGUSR1)
         
         try:
             # Start restart in a separate thread
@@ -4,7 +4,6 @@ Utilities for Enhanced LinkedIn Post Generator
 import os
 import logging
 import sys
-import httpx
 
 logger = logging.getLogger('linkedin-generator')
 
@@ -22,6 +21,7 @@ def initialize_openai_client():
         return None, True # mock_mode is true
 
     try:
+        import httpx
         from openai import OpenAI, APIError # Import OpenAI and specific APIError
 
         # Configure an httpx client to explicitly not use environment proxies
@@ -64,3 +64,26 @@ def clean_environment():
             os.environ.pop(var)
             
     return True
+
+def load_or_create_secret_key(path, size=32):
+    """
+    Read a persisted secret key, creating it (mode 0600) on first use.
+    Workers racing to create the file all end up reading the same key.
+    """
+    try:
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    except FileExistsError:
+        pass
+    else:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(os.urandom(size))
+        logger.info(f"Created new secret key file at {path}")
+
+    with open(path, 'rb') as f:
+        key = f.read()
+    if len(key) < size:
+        # Another worker may still be writing the file; fall back to a
+        # process-local key rather than using a truncated one
+        logger.warning(f"Secret key file {path} is incomplete; using a temporary key")
+        return os.urandom(size)
+    return key
@@ -7,7 +7,7 @@ import random
 import json
 import logging
 from modules.openai_wrapper import OpenAIWrapper
-from modules.llm_provider import OpenAIProvider, GeminiProvider
+from modules.llm_provider import OpenAIProvider, get_provider, CachingLLMProvider, completion_text
 
 logger = logging.getLogger('linkedin-generator')
 
@@ -25,11 +25,10 @@ class VoiceAnalyzer:
 
         if provider_name == "gemini":
             try:
-                from modules.llm_provider import GeminiProvider
                 gemini_api_key = os.getenv("GEMINI_API_KEY")
                 if not gemini_api_key:
                     logger.warning("VoiceAnalyzer: LLM_PROVIDER is 'gemini' but GEMINI_API_KEY is not set. Falling back to mock/OpenAI if possible or may error.")
-                self.llm = GeminiProvider(gemini_api_key)
+                self.llm = get_provider("gemini", gemini_api_key)
                 logger.info("VoiceAnalyzer: Successfully initialized GeminiProvider.")
             except Exception as e:
                 logger.error(f"VoiceAnalyzer: Failed to initialize GeminiProvider: {e}. Falling back to OpenAIProvider.")
@@ -41,6 +40,10 @@ class VoiceAnalyzer:
             self.llm = OpenAIProvider(self.client)
             logger.info("VoiceAnalyzer: Initialized OpenAIProvider (default or explicit).")
 
+        # The same posts should always yield the same profile, so analyses are
+        # cached even though the request is sampled
+        self.llm = CachingLLMProvider(self.llm, cache_sampled=True)
+
         if self.mock_mode:
             logger.info("VoiceAnalyzer: OpenAIWrapper indicates mock mode (e.g., OPENAI_API_KEY missing). Specific provider behavior may vary.")
         else:
@@ -84,7 +87,7 @@ class VoiceAnalyzer:
             )
             
             # Extract and parse the JSON response
-            style_profile = response.choices[0].message.content
+            style_profile = completion_text(response)
             return json.loads(style_profile)
         except Exception as e:
             print(f"Error during voice analysis: {e}")
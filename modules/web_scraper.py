@@ -14,12 +14,12 @@ import re
 import logging
 import hashlib
 from urllib.parse import urlparse, urljoin
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import ThreadPoolExecutor, TimeoutError, as_completed
 from typing import List, Dict, Any, Optional, Tuple, Union
 
 # Import our article scoring module
 from .article_scorer import ArticleScorer
-from .config import DEFAULT_WEBSCRAPER_CONFIG, _apply_env_overrides
+from .config import DEFAULT_WEBSCRAPER_CONFIG, _apply_env_overrides, compile_url_patterns
 
 # Configure logger
 logger = logging.getLogger(__name__)
@@ -27,6 +27,8 @@ logger = logging.getLogger(__name__)
 # Conditionally import these modules
 try:
     import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
     from bs4 import BeautifulSoup
     import feedparser
     import newspaper
@@ -63,9 +65,15 @@ class WebScraper:
         self.visited_urls = set()
         self.mock_mode = MOCK_MODE
         
+        # Shared keep-alive session so every fetch reuses pooled connections
+        self.session = None if self.mock_mode else self._create_session()
+        
         # Initialize article scorer with our config
         self.article_scorer = ArticleScorer(self.config)
         
+        # All excluded URL patterns as one regex (a single scan per URL)
+        self.excluded_url_pattern = compile_url_patterns(tuple(self.config['excluded_patterns']))
+        
         # Load data from file system if available
         self.load_state()
         
@@ -73,6 +81,32 @@ class WebScraper:
             logger.info("Running web scraper in mock mode. Will use sample article data.")
             self._initialize_mock_sources()
     
+    def _create_session(self):
+        """Create a pooled HTTP session shared by all source fetches
+        
+        Returns:
+            requests.Session: Session with connection pooling and retries
+        """
+        session = requests.Session()
+        retries = Retry(
+            total=self.config['retry_count'],
+            backoff_factor=0.3,
+            status_forcelist=(429, 500, 502, 503, 504)
+        )
+        adapter = HTTPAdapter(
+            pool_connections=self.config['pool_connections'],
+            pool_maxsize=self.config['pool_maxsize'],
+            max_retries=retries
+        )
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        session.max_redirects = self.config['max_redirects']
+        session.headers.update({
+            'User-Agent': self.config['user_agent'],
+            'Connection': 'keep-alive'
+        })
+        return session
+    
     def load_state(self):
         """Load scraper state from file system"""
         try:
@@ -242,6 +276,15 @@ class WebScraper:
             list: All sources
         """
         return self.sources
+    
+    def last_refresh(self):
+        """Get the most recent article cache refresh time across sources
+        
+        Returns:
+            float: Unix timestamp of the newest cache entry (0 if none)
+        """
+        return max((entry.get('timestamp', 0) for entry in list(self.content_cache.values())
+                    if isinstance(entry, dict)), default=0)
         
     def _generate_source_id(self, url):
         """Generate a unique source ID from URL
@@ -271,10 +314,8 @@ class WebScraper:
             return None
             
         try:
-            headers = {'User-Agent': self.config['user_agent']}
-            response = requests.get(
+            response = self.session.get(
                 url, 
-                headers=headers, 
                 timeout=self.config['request_timeout'],
                 allow_redirects=True
             )
@@ -305,9 +346,8 @@ class WebScraper:
             for path in common_paths:
                 test_url = urljoin(url, path)
                 try:
-                    feed_response = requests.head(
+                    feed_response = self.session.head(
                         test_url, 
-                        headers=headers,
                         timeout=self.config['request_timeout'] / 2
                     )
                     if feed_response.status_code == 200:
@@ -321,12 +361,14 @@ class WebScraper:
             
         return None
         
-    def fetch_articles(self, source_id=None, force_refresh=False):
+    def fetch_articles(self, source_id=None, force_refresh=False, filter_category=None, max_articles=None):
         """Fetch articles from a specific source or all sources
         
         Args:
             source_id (str, optional): ID of source to fetch from. If None, fetch from all.
             force_refresh (bool): If True, bypass cache
+            filter_category (str, optional): Only return articles whose category contains this term
+            max_articles (int, optional): Maximum number of articles to return
             
         Returns:
             list: Articles fetched
@@ -338,24 +380,24 @@ class WebScraper:
             source = next((s for s in self.sources if s['id'] == source_id), None)
             if source:
                 if self._should_check_source(source) or force_refresh:
-                    return self._fetch_source_articles(source, force_refresh)
-                else:
+                    articles = self._fetch_source_articles(source, force_refresh)
+                elif source_id in self.content_cache:
                     # Return cached articles if we shouldn't check yet
-                    if source_id in self.content_cache:
-                        logger.debug(f"Using cached content for {source['name']} (not time to check yet)")
-                        return self.content_cache[source_id]['articles']
-                    else:
-                        # No cache but not time to check, return empty
-                        return []
+                    logger.debug(f"Using cached content for {source['name']} (not time to check yet)")
+                    articles = self.content_cache[source_id]['articles']
             else:
                 logger.warning(f"Source ID {source_id} not found")
                 return []
         
         # Otherwise fetch from all active sources that should be checked
         else:
-            with ThreadPoolExecutor(max_workers=self.config['max_workers']) as executor:
-                future_to_source = {}
-                
+            # Sources are I/O-bound, so fetch them concurrently; never run more
+            # threads than the session pool can serve without thrashing
+            max_workers = min(self.config['max_workers'], self.config['pool_maxsize'])
+            executor = ThreadPoolExecutor(max_workers=max_workers)
+            future_to_source = {}
+            
+            try:
                 for source in self.sources:
                     if not source.get('active', True):
                         continue
@@ -369,19 +411,34 @@ class WebScraper:
                         logger.debug(f"Using cached content for {source['name']}")
                         articles.extend(self.content_cache[source['id']]['articles'])
                         
-                # Collect results from threads
-                for future in as_completed(future_to_source):
-                    source = future_to_source[future]
-                    try:
-                        source_articles = future.result()
-                        if source_articles:
-                            articles.extend(source_articles)
-                    except Exception as e:
-                        logger.error(f"Error fetching from {source['name']}: {e}")
+                # Collect results as they complete; a failed or slow source is
+                # skipped without aborting the rest of the batch
+                try:
+                    for future in as_completed(future_to_source, timeout=self.config['fetch_timeout']):
+                        source = future_to_source[future]
+                        try:
+                            source_articles = future.result()
+                            if source_articles:
+                                articles.extend(source_articles)
+                        except Exception as e:
+                            logger.error(f"Error fetching from {source['name']}: {e}")
+                except TimeoutError:
+                    pending = [s['name'] for f, s in future_to_source.items() if not f.done()]
+                    logger.warning(f"Timed out waiting for sources, skipping: {', '.join(pending)}")
+                    for future in future_to_source:
+                        future.cancel()
+            finally:
+                executor.shutdown(wait=False)
             
             # Use our article scorer to organize all articles by relevance
             articles = self._order_articles_by_relevance(articles)
         
+        if filter_category:
+            category = filter_category.lower()
+            articles = [a for a in articles if category in a.get('category', '').lower()]
+        if max_articles:
+            articles = articles[:max_articles]
+        
         return articles
         
     def _order_articles_by_relevance(self, articles):
@@ -440,14 +497,14 @@ class WebScraper:
         # Return cached articles if available and not expired
         if not force_refresh and source_id in self.content_cache:
             cache_entry = self.content_cache[source_id]
-            if time.time() - cache_entry['timestamp'] < self.config['cache_duration']:
+            if time.time() - cache_entry.get('timestamp', 0) < self.config['cache_duration']:
                 logger.debug(f"Using cached articles for {source['name']}")
                 return cache_entry['articles']
                 
         articles = []
         
         # Update last check time
-        self.last_check[source_id] = datetime.now().isoformat()
+        self.last_check[source_id] = datetime.now()
         
         # 1. Try RSS feed first if available
         rss_url = source.get('rss_url')
@@ -499,10 +556,13 @@ class WebScraper:
         """
         articles = []
         
-        # Parse RSS feed
-        feed = feedparser.parse(rss_url)
+        # Download through the shared session, then parse the RSS feed
+        response = self.session.get(rss_url, timeout=self.config['request_timeout'])
+        response.raise_for_status()
+        feed = feedparser.parse(response.content)
         
-        # Extract articles
+        # Extract articles (undated entries share one fetch timestamp)
+        now = datetime.now()
         for entry in feed.entries:
             try:
                 # Get publication date
@@ -512,7 +572,7 @@ class WebScraper:
                 elif hasattr(entry, 'updated_parsed') and entry.updated_parsed:
                     pub_date = datetime(*entry.updated_parsed[:6])
                 else:
-                    pub_date = datetime.now()
+                    pub_date = now
                     
                 # Create article object
                 article = {
@@ -627,7 +687,7 @@ class WebScraper:
                     continue
                     
                 # Skip URLs matching excluded patterns
-                if any(re.search(pattern, article_url, re.IGNORECASE) for pattern in self.config['excluded_patterns']):
+                if self.excluded_url_pattern and self.excluded_url_pattern.search(article_url):
                     continue
                     
                 try:
@@ -659,8 +719,7 @@ class WebScraper:
                     # If still no content, use readability
                     if not content.strip():
                         try:
-                            headers = {'User-Agent': self.config['user_agent']}
-                            response = requests.get(article_url, headers=headers, timeout=self.config['request_timeout'])
+                            response = self.session.get(article_url, timeout=self.config['request_timeout'])
                             doc = Document(response.text)
                             content = doc.summary()
                             # Strip HTML
@@ -821,7 +880,10 @@ class WebScraper:
         
         # Generate mock articles
         for source in self.sources:
-            self.content_cache[source['id']] = {'articles': self._get_mock_articles(source), 'last_updated': datetime.now()}
+            self.content_cache[source['id']] = {
+                'timestamp': time.time(),
+                'articles': self.article_scorer.process_articles(self._get_mock_articles(source), source.get('category', ''))
+            }
             
         logger.info(f"Initialized {len(self.sources)} mock sources")
         
@@ -902,7 +964,8 @@ class WebScraper:
             bool: True if URL is an RSS feed, False otherwise
         """
         try:
-            feed = feedparser.parse(url)
+            response = self.session.get(url, timeout=self.config['request_timeout'])
+            feed = feedparser.parse(response.content)
             return len(feed.entries) > 0 and hasattr(feed, 'version') and feed.version != ''
         except:
             return False
@@ -922,7 +985,7 @@ class WebScraper:
             headers = {
                 'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
             }
-            response = requests.get(url, headers=headers, timeout=15)
+            response = self.session.get(url, headers=headers, timeout=15)
             response.raise_for_status()
             
             soup = BeautifulSoup(response.content, 'html.parser')
@@ -980,7 +1043,9 @@ class WebScraper:
         """
         url = source['url']
         try:
-            feed = feedparser.parse(url)
+            response = self.session.get(url, timeout=self.config['request_timeout'])
+            response.raise_for_status()
+            feed = feedparser.parse(response.content)
             results = []
             
             for entry in feed.entries[:10]:  # Get up to 10 recent entries
@@ -1045,8 +1110,9 @@ class WebScraper:
         
         # Date recency bonus
         try:
-            pub_date = datetime.fromisoformat(content.get('date', datetime.now().isoformat()))
-            days_old = (datetime.now() - pub_date).days
+            now = datetime.now()
+            pub_date = datetime.fromisoformat(content.get('date', now.isoformat()))
+            days_old = (now - pub_date).days
             recency_bonus = max(0, 2 - (days_old / 7))  # Up to 2 points for very recent content
         except:
             recency_bonus = 0
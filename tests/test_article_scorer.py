@@ -0,0 +1,134 @@
+"""
+Tests for article filtering and scoring in the Enhanced LinkedIn Generator
+"""
+
+import os
+import sys
+import asyncio
+import unittest
+from datetime import datetime, timedelta
+
+# Ensure modules directory is in path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from modules.article_scorer import ArticleScorer
+
+def make_article(url, title, summary='', content_length=2000):
+    """Build a fresh article dict published now"""
+    return {
+        'url': url,
+        'title': title,
+        'summary': summary,
+        'content': 'x' * content_length,
+        'pub_date': datetime.now().isoformat()
+    }
+
+class TestArticleScorer(unittest.TestCase):
+    """Test suite for ArticleScorer"""
+
+    def setUp(self):
+        """Articles covering the excluded/required/boost term filters"""
+        self.articles = [
+            make_article('https://a.example/1', 'Kubernetes adoption keeps growing', 'Cloud platforms report gains'),
+            make_article('https://a.example/2', 'Crypto SCAM warning for investors', 'Regulators step in'),
+            make_article('https://a.example/3', 'Quarterly results from the cloud market', 'Analysts expect more growth')
+        ]
+
+    def process(self, **config):
+        config.setdefault('relevance_threshold', 0)
+        return ArticleScorer(config).process_articles([dict(a) for a in self.articles])
+
+    def test_excluded_terms_are_case_insensitive(self):
+        """Articles mentioning an excluded term in any case are dropped"""
+        urls = [a['url'] for a in self.process(excluded_terms=['scam'])]
+        self.assertNotIn('https://a.example/2', urls)
+        self.assertEqual(len(urls), 2)
+
+    def test_required_terms_keep_only_matches(self):
+        """Only articles mentioning a required term survive"""
+        urls = [a['url'] for a in self.process(required_terms=['Cloud'])]
+        self.assertEqual(sorted(urls), ['https://a.example/1', 'https://a.example/3'])
+
+    def test_boost_terms_are_case_insensitive(self):
+        """Boost terms match regardless of case and only when present"""
+        article = self.articles[0]
+        upper = ArticleScorer({'boost_terms': ['KUBERNETES']}).calculate_relevance_score(dict(article), '')
+        lower = ArticleScorer({'boost_terms': ['kubernetes']}).calculate_relevance_score(dict(article), '')
+        missing = ArticleScorer({'boost_terms': ['serverless']}).calculate_relevance_score(dict(article), '')
+        self.assertAlmostEqual(upper, lower, places=6)
+        self.assertNotAlmostEqual(upper, missing, places=6)
+
+    def test_process_articles_async_matches_sync(self):
+        """Scoring an async stream gives the same ranking as the list version"""
+        async def stream():
+            for article in self.articles:
+                await asyncio.sleep(0)
+                yield dict(article)
+        
+        scorer = ArticleScorer({'relevance_threshold': 0, 'max_articles_per_source': 2})
+        ranked = asyncio.run(scorer.process_articles_async(stream()))
+        
+        self.assertEqual([a['url'] for a in ranked],
+                         [a['url'] for a in scorer.process_articles([dict(a) for a in self.articles])])
+        self.assertEqual(len(ranked), 2)
+
+    def test_stale_and_undated_articles(self):
+        """Articles past max_article_age are dropped; unparseable dates count as new"""
+        stale = make_article('https://a.example/old', 'An older story about cloud growth')
+        stale['pub_date'] = (datetime.now() - timedelta(days=30)).isoformat()
+        undated = make_article('https://a.example/undated', 'A story with a broken date field')
+        undated['pub_date'] = 'not a date'
+
+        processed = ArticleScorer({'relevance_threshold': 0}).process_articles([stale, undated])
+
+        self.assertEqual([a['url'] for a in processed], ['https://a.example/undated'])
+        datetime.fromisoformat(processed[0]['pub_date'])
+
+    def test_missing_pub_date_scores_as_unknown_age(self):
+        """Articles without a pub_date get neutral recency, not the score of a brand-new article"""
+        fresh = make_article('https://a.example/fresh', 'A story about steady cloud growth')
+        missing = dict(fresh, url='https://a.example/missing')
+        del missing['pub_date']
+        scorer = ArticleScorer({'relevance_threshold': 0})
+
+        processed = {a['url']: a for a in scorer.process_articles([fresh, missing])}
+
+        self.assertLess(processed['https://a.example/missing']['relevance_score'],
+                        processed['https://a.example/fresh']['relevance_score'])
+        self.assertAlmostEqual(processed['https://a.example/missing']['relevance_score'],
+                               scorer.calculate_relevance_score(dict(missing), ''), places=6)
+        self.assertNotIn('pub_date', processed['https://a.example/missing'])
+
+    def test_order_by_relevance_deduplicates_urls(self):
+        """Duplicate URLs keep the higher-scored copy; URL-less articles are dropped"""
+        articles = [
+            {'url': 'https://a.example/1', 'relevance_score': 0.4, 'pub_date': '2025-01-01'},
+            {'url': 'https://a.example/2', 'relevance_score': 0.6, 'pub_date': '2025-01-01'},
+            {'url': 'https://a.example/1', 'relevance_score': 0.9, 'pub_date': '2025-01-02'},
+            {'url': '', 'relevance_score': 1.0}
+        ]
+
+        ordered = ArticleScorer().order_articles_by_relevance(articles)
+
+        self.assertEqual([(a['url'], a['relevance_score']) for a in ordered],
+                         [('https://a.example/1', 0.9), ('https://a.example/2', 0.6)])
+
+    def test_order_by_relevance_drops_near_duplicates(self):
+        """The same story under another URL is dropped unless suppression is off"""
+        story = 'Regulators approved the merger of two regional banks after a year long review. ' * 20
+        articles = [
+            {'url': 'https://a.example/1', 'title': 'Bank merger approved', 'content': story, 'relevance_score': 0.9},
+            {'url': 'https://b.example/1', 'title': 'Bank merger approved', 'content': story + 'Updated.',
+             'relevance_score': 0.8},
+            {'url': 'https://c.example/1', 'title': 'Chip exports rise', 'content': 'Semiconductor shipments grew. ' * 20,
+             'relevance_score': 0.7}
+        ]
+
+        deduped = ArticleScorer().order_articles_by_relevance(articles)
+        kept = ArticleScorer({'near_duplicate_distance': 0}).order_articles_by_relevance(articles)
+
+        self.assertEqual([a['url'] for a in deduped], ['https://a.example/1', 'https://c.example/1'])
+        self.assertEqual(len(kept), 3)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,157 @@
+"""
+Tests for post generation in the Enhanced LinkedIn Generator
+"""
+
+import os
+import sys
+import unittest
+from unittest.mock import patch, MagicMock
+
+# Ensure modules directory is in path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from modules.content_generator import ContentGenerator, PostType
+from modules.llm_cache import LLMCache, MemoryCacheBackend
+
+def make_completion(text):
+    """Build an OpenAI-style completion response carrying text"""
+    response = MagicMock()
+    response.choices[0].message.content = text
+    return response
+
+class TestContentGenerator(unittest.TestCase):
+    """Test suite for ContentGenerator"""
+
+    def setUp(self):
+        """Generator in live mode with a fake LLM and an isolated cache"""
+        with patch.dict(os.environ, {"OPENAI_API_KEY": "sk-test", "LLM_PROVIDER": "openai"}):
+            self.generator = ContentGenerator(cache=LLMCache(backend=MemoryCacheBackend(maxsize=10, ttl=60)))
+        self.generator.mock_mode = False
+        self.generator.llm = MagicMock()
+        self.generator.llm.generate_chat_completion.return_value = make_completion(
+            '{"post": "Prices keep falling. #ai", "hashtags": ["#ai", "cloud"]}')
+        self.source = {'title': 'Cloud costs fall', 'content': 'Providers cut prices again.', 'url': 'https://a.example/1'}
+
+    def test_repeated_generate_uses_cached_completions(self):
+        """Identical temperature-0 requests reuse the cached completion"""
+        first = self.generator.generate({'tone': 'calm'}, self.source, temperature=0)
+        second = self.generator.generate({'tone': 'calm'}, self.source, temperature=0)
+
+        self.assertEqual(first['content'], second['content'])
+        self.assertEqual(self.generator.llm.generate_chat_completion.call_count, 1)
+
+    def test_sampled_generate_skips_cache(self):
+        """Regenerating at the default temperature asks the model again"""
+        self.generator.generate({'tone': 'calm'}, self.source)
+        self.generator.generate({'tone': 'calm'}, self.source)
+
+        self.assertEqual(self.generator.llm.generate_chat_completion.call_count, 2)
+        self.assertEqual(self.generator.llm.generate_chat_completion.call_args.kwargs['temperature'], 0.7)
+
+    def test_near_duplicate_article_gets_its_own_completion(self):
+        """A reworded repost of a story is a new request, never another article's post"""
+        story = 'Cloud providers cut storage and compute prices again this quarter as competition grows. ' * 5
+        self.generator.llm.generate_chat_completion.side_effect = [
+            make_completion('{"post": "Prices keep falling. #ai", "hashtags": ["#ai"]}'),
+            make_completion('{"post": "Cloud is a price war now. #cloud", "hashtags": ["#cloud"]}'),
+        ]
+        first = self.generator.generate({'tone': 'calm'}, dict(self.source, content=story), temperature=0)
+        repost = self.generator.generate({'tone': 'calm'}, dict(self.source, content=story + 'Updated.',
+                                                              url='https://b.example/1'), temperature=0)
+
+        self.assertNotEqual(repost['content'], first['content'])
+        self.assertEqual(repost['source_url'], 'https://b.example/1')
+        self.assertEqual(self.generator.llm.generate_chat_completion.call_count, 2)
+
+    def test_post_and_hashtags_come_from_one_json_completion(self):
+        """The JSON response supplies both the post and normalized hashtags"""
+        post = self.generator.generate({}, self.source)
+
+        self.assertEqual(post['content'], 'Prices keep falling. #ai')
+        self.assertEqual(post['hashtags'], ['#ai', '#cloud'])
+
+    def test_dict_response_from_gemini_is_read(self):
+        """Providers returning plain dicts (Gemini, mock) work on the non-streaming path"""
+        self.generator.llm.generate_chat_completion.return_value = {
+            "choices": [{"message": {"role": "assistant", "content": '{"post": "Prices keep falling.", "hashtags": []}'}}]}
+
+        self.assertEqual(self.generator.generate({}, self.source)['content'], 'Prices keep falling.')
+
+    def test_plain_text_response_falls_back_to_local_hashtags(self):
+        """Non-JSON responses are used verbatim; hashtags come from the text, topped up to three"""
+        self.generator.llm.generate_chat_completion.return_value = make_completion("Big week for cloud. #Cloud #FinOps")
+
+        post = self.generator.generate({}, self.source)
+
+        self.assertEqual(post['content'], 'Big week for cloud. #Cloud #FinOps')
+        self.assertEqual(post['hashtags'], ['#Cloud', '#FinOps', '#leadership'])
+
+    def test_post_type_enum_and_name_share_cache_entry(self):
+        """A PostType member and its plain name build the same request"""
+        by_name = self.generator.generate({}, self.source, 'Quick Update', temperature=0)
+        by_enum = self.generator.generate({}, self.source, PostType.QUICK_UPDATE, temperature=0)
+
+        self.assertEqual(by_enum['content'], by_name['content'])
+        self.assertEqual(self.generator.llm.generate_chat_completion.call_count, 1)
+        self.assertEqual(self.generator.llm.generate_chat_completion.call_args.kwargs['max_tokens'], 500)
+
+    def test_generate_many_keeps_input_order(self):
+        """Concurrent generation returns one post per source, in input order"""
+        sources = [dict(self.source, title=f'Story {i}', url=f'https://a.example/{i}') for i in range(5)]
+
+        posts = self.generator.generate_many({}, sources, max_workers=3)
+
+        self.assertEqual([post['articleTitle'] for post in posts], [f'Story {i}' for i in range(5)])
+
+    def test_generate_many_bins_by_post_type_budget(self):
+        """Mixed post types get their own token budgets and results stay in order"""
+        sources = [dict(self.source, title=f'Story {i}') for i in range(3)]
+        types = ['Quick Update', 'Story Format', 'Quick Update']
+
+        posts = self.generator.generate_many({}, sources, post_type=types)
+
+        self.assertEqual([post['post_type'] for post in posts], types)
+        budgets = sorted(call.kwargs['max_tokens'] for call in self.generator.llm.generate_chat_completion.call_args_list)
+        self.assertEqual(budgets, [500, 500, 800])
+
+    def test_generate_many_short_posts_do_not_wait_for_long_ones(self):
+        """Short posts are generated while a long post is still in flight"""
+        import threading
+        short_calls = []
+        shorts_done = threading.Event()
+        long_saw_shorts = []
+
+        def complete(messages, **kwargs):
+            if kwargs['max_tokens'] == 800:
+                long_saw_shorts.append(shorts_done.wait(2))
+            else:
+                short_calls.append(1)
+                if len(short_calls) == 2:
+                    shorts_done.set()
+            return make_completion('{"post": "Prices keep falling.", "hashtags": ["#ai"]}')
+        self.generator.llm.generate_chat_completion.side_effect = complete
+        sources = [dict(self.source, title=f'Story {i}', content=f'Providers cut prices, part {i}.') for i in range(3)]
+
+        self.generator.generate_many({}, sources, post_type=['Quick Update', 'Story Format', 'Quick Update'],
+                                     max_workers=2)
+
+        self.assertEqual(long_saw_shorts, [True])
+
+    def test_generate_stream_yields_deltas_then_post(self):
+        """Streamed text arrives as deltas and the final event carries the parsed post"""
+        self.generator.llm.stream_chat_completion.return_value = iter(
+            ['{"post": "Prices ', 'keep falling.", ', '"hashtags": ["#ai"]}'])
+
+        events = list(self.generator.generate_stream({}, self.source, temperature=0))
+
+        self.assertEqual(''.join(e['text'] for e in events if e['event'] == 'delta'),
+                         '{"post": "Prices keep falling.", "hashtags": ["#ai"]}')
+        self.assertEqual(events[-1]['event'], 'done')
+        self.assertEqual(events[-1]['post']['content'], 'Prices keep falling.')
+
+        # The streamed completion is cached for the non-streaming path
+        self.assertEqual(self.generator.generate({}, self.source, temperature=0)['content'], 'Prices keep falling.')
+        self.generator.llm.generate_chat_completion.assert_not_called()
+
+if __name__ == '__main__':
+    unittest.main()
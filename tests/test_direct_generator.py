@@ -0,0 +1,203 @@
+"""
+Tests for direct news summary generation in the Enhanced LinkedIn Generator
+"""
+
+import os
+import sys
+import json
+import unittest
+from unittest.mock import patch, MagicMock
+
+# Ensure modules directory is in path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from modules import direct_generator
+from modules.direct_generator import DirectGenerator
+from modules.llm_provider import OpenAIProvider
+from modules.llm_cache import LLMCache, MemoryCacheBackend
+
+STYLE_PROFILE = {
+    "tone": "Upbeat", "vocabulary": "Plain", "structure": "Short paragraphs", "patterns": "Questions",
+    "hashtags": "Three tags", "emoji_usage": "None", "engagement_tactics": "Ask for opinions"
+}
+
+def make_completion(text):
+    """Build an OpenAI-style completion response carrying text"""
+    response = MagicMock()
+    response.choices[0].message.content = text
+    return response
+
+class TestDirectGenerator(unittest.TestCase):
+    """Test suite for DirectGenerator"""
+
+    def setUp(self):
+        """Generator in live mode with a fake LLM and an isolated cache"""
+        with patch.dict(os.environ, {"OPENAI_API_KEY": "sk-test", "LLM_PROVIDER": "openai", "MOCK_MODE": "false"}):
+            self.generator = DirectGenerator(cache=LLMCache(backend=MemoryCacheBackend(maxsize=10, ttl=60)))
+        self.generator.llm = MagicMock()
+        self.generator.llm.generate_chat_completion.return_value = make_completion(json.dumps(STYLE_PROFILE))
+
+    def test_style_profile_comes_from_one_json_completion(self):
+        """Style extraction asks for the structured profile in a single call"""
+        profile = self.generator._extract_writing_style("Shipped a new release today! What do you think?")
+
+        self.assertEqual(profile, STYLE_PROFILE)
+        self.assertEqual(self.generator.llm.generate_chat_completion.call_count, 1)
+        call = self.generator.llm.generate_chat_completion.call_args
+        self.assertEqual(call.kwargs['response_format'], {"type": "json_object"})
+
+    def test_dict_responses_from_gemini_are_read(self):
+        """Providers returning plain dicts (Gemini, mock) work on the non-streaming path"""
+        self.generator.llm.generate_chat_completion.return_value = {
+            "choices": [{"message": {"role": "assistant", "content": json.dumps(STYLE_PROFILE)}}], "provider": "gemini"}
+
+        self.assertEqual(self.generator._extract_writing_style("Shipped a new release today!"), STYLE_PROFILE)
+
+    def test_repeated_style_extraction_uses_cache(self):
+        """The same previous posts are analyzed once"""
+        self.generator._extract_writing_style("Shipped a new release today!")
+        profile = self.generator._extract_writing_style("Shipped a new release today!")
+
+        self.assertEqual(profile, STYLE_PROFILE)
+        self.assertEqual(self.generator.llm.generate_chat_completion.call_count, 1)
+
+    def test_near_duplicate_feed_reuses_style_profile(self):
+        """A feed re-pulled with one extra post is served from the semantic cache"""
+        feed = "\n\n".join(f"Post {i}: shipping the new analytics dashboard to customers this week." for i in range(8))
+        self.generator._extract_writing_style(feed)
+        profile = self.generator._extract_writing_style(feed + "\n\nPost 8: dashboard feedback is in.")
+
+        self.assertEqual(profile, STYLE_PROFILE)
+        self.assertEqual(self.generator.llm.generate_chat_completion.call_count, 1)
+
+    def test_long_post_history_is_cut_to_the_latest_posts(self):
+        """Only the end of a long history is sent for style analysis"""
+        history = "Old post about hiring. " * 5000 + "Latest post about launch day."
+
+        self.generator._extract_writing_style(history)
+
+        sent = self.generator.llm.generate_chat_completion.call_args.args[0][1]['content']
+        self.assertTrue(sent.endswith("Latest post about launch day."))
+        self.assertLess(len(sent), len(history) // 4)
+
+    def test_repeated_posts_are_sent_once(self):
+        """Re-shared and lightly edited posts are dropped before style analysis"""
+        launch = "Excited to share that our team just shipped the new analytics dashboard. Huge thanks to everyone! #launch"
+        hiring = "We are looking for a senior data engineer to join us in Berlin. DM me if interested. #hiring"
+
+        self.generator._extract_writing_style("\n\n".join([launch, hiring, launch.replace("!", "!!"), launch]))
+
+        sent = self.generator.llm.generate_chat_completion.call_args.args[0][1]['content']
+        self.assertEqual(sent.count("analytics dashboard"), 1)
+        self.assertIn(hiring, sent)
+
+    def test_summaries_are_cached_only_when_enabled(self):
+        """High-temperature summaries are regenerated unless cache_summaries is set"""
+        self.generator.llm.generate_chat_completion.return_value = make_completion(
+            '{"content": "Worth a read.", "hashtags": ["News"]}')
+        news = {'title': 'Chip prices drop', 'url': 'https://a.example/1'}
+
+        for _ in range(2):
+            self.generator._generate_news_summary(STYLE_PROFILE, news, 'short')
+        self.assertEqual(self.generator.llm.generate_chat_completion.call_count, 2)
+
+        self.generator.cache_summaries = True
+        for _ in range(2):
+            self.generator._generate_news_summary(STYLE_PROFILE, news, 'short')
+        self.assertEqual(self.generator.llm.generate_chat_completion.call_count, 3)
+
+    def test_summary_and_hashtags_come_from_one_completion(self):
+        """The summary call returns the post and its hashtags together"""
+        self.generator.llm.generate_chat_completion.return_value = make_completion(
+            '{"content": "Chips are getting cheaper. #AI #Hardware", "hashtags": ["AI", "#Hardware"]}')
+
+        post = self.generator._generate_news_summary(STYLE_PROFILE, {'title': 'Chip prices drop'}, 'short')
+
+        self.assertEqual(post['content'], 'Chips are getting cheaper. #AI #Hardware')
+        self.assertEqual(post['hashtags'], ['AI', 'Hardware'])
+        self.assertEqual(self.generator.llm.generate_chat_completion.call_count, 1)
+
+    def test_plain_text_summary_falls_back_to_local_hashtags(self):
+        """Non-JSON summaries are used verbatim with hashtags read from the text"""
+        self.generator.llm.generate_chat_completion.return_value = make_completion("Chips are cheaper. #AI #Hardware")
+
+        post = self.generator._generate_news_summary(STYLE_PROFILE, {'title': 'Chip prices drop'}, 'short')
+
+        self.assertEqual(post['content'], 'Chips are cheaper. #AI #Hardware')
+        self.assertEqual(post['hashtags'], ['AI', 'Hardware'])
+
+    def test_batch_extracts_style_once_and_keeps_order(self):
+        """One style call serves every summary; results follow the input order"""
+        summary = make_completion('{"content": "Worth a read.", "hashtags": ["News"]}')
+        self.generator.llm.generate_chat_completion.side_effect = (
+            lambda messages, **kwargs: summary if 'STYLE PROFILE' in messages[0]['content']
+            else make_completion(json.dumps(STYLE_PROFILE)))
+        items = [{'title': f'Story {i}', 'url': f'https://a.example/{i}'} for i in range(4)]
+
+        results = self.generator.analyze_and_generate_many("Posts about chips.", items, max_workers=2)
+
+        self.assertEqual([result['title'] for result in results], [f'Story {i}' for i in range(4)])
+        self.assertTrue(all(result['styleProfile'] == STYLE_PROFILE for result in results))
+        self.assertEqual(self.generator.llm.generate_chat_completion.call_count, 5)
+
+    def test_streamed_summary_yields_deltas_then_post(self):
+        """Summary text arrives as deltas and the final event carries the parsed post"""
+        self.generator.llm.stream_chat_completion.return_value = iter(
+            ['{"content": "Chips ', 'are cheaper.", ', '"hashtags": ["AI"]}'])
+
+        events = list(self.generator._stream_news_summary(STYLE_PROFILE, {'title': 'Chip prices drop'}, 'short'))
+
+        self.assertEqual(''.join(e['text'] for e in events if e['event'] == 'delta'),
+                         '{"content": "Chips are cheaper.", "hashtags": ["AI"]}')
+        self.assertEqual(events[-1]['event'], 'done')
+        self.assertEqual(events[-1]['post']['content'], 'Chips are cheaper.')
+        self.assertEqual(events[-1]['post']['hashtags'], ['AI'])
+
+    def test_analyze_and_generate_stream_sends_style_first(self):
+        """The style profile arrives before any summary text; the last event has the full result"""
+        self.generator.llm.stream_chat_completion.return_value = iter(['{"content": "Worth a read.", "hashtags": []}'])
+
+        events = list(self.generator.analyze_and_generate_stream("Posts about chips.", {'title': 'Chip prices drop'}))
+
+        self.assertEqual([event['event'] for event in events], ['style', 'delta', 'done'])
+        self.assertEqual(events[0]['styleProfile'], STYLE_PROFILE)
+        self.assertEqual(events[-1]['result']['generatedPost']['content'], 'Worth a read.')
+        self.assertEqual(events[-1]['result']['title'], 'Chip prices drop')
+
+    def test_batch_generate_submits_one_file_and_maps_results(self):
+        """Batch API output is matched back to the input order; failed rows fall back"""
+        self.generator.llm = MagicMock(spec=OpenAIProvider)
+        self.generator.llm.generate_chat_completion.return_value = make_completion(json.dumps(STYLE_PROFILE))
+        client = self.generator.client = MagicMock()
+        client.files.create.return_value.id = 'file-in'
+        client.post.return_value = {'id': 'batch_1', 'status': 'in_progress'}
+        client.get.return_value = {'id': 'batch_1', 'status': 'completed', 'output_file_id': 'file-out'}
+        ok = {'status_code': 200, 'body': {'choices': [{'message': {'content': '{"content": "Second.", "hashtags": []}'}}]}}
+        client.files.content.return_value.text = json.dumps({'custom_id': '1', 'response': ok})
+        items = [{'title': 'First'}, {'title': 'Second'}]
+
+        results = self.generator.batch_generate("Posts about chips.", items, poll_interval=0)
+
+        upload = client.files.create.call_args.kwargs['file'][1].decode('utf-8').splitlines()
+        self.assertEqual([json.loads(line)['custom_id'] for line in upload], ['0', '1'])
+        self.assertEqual(results[1]['generatedPost']['content'], 'Second.')
+        self.assertEqual(results[1]['styleProfile'], STYLE_PROFILE)
+        self.assertEqual(results[0]['title'], 'First')
+        self.assertEqual(results[0]['generatedPost']['type'], 'News Summary')
+
+    def test_failed_gemini_init_is_not_retried_immediately(self):
+        """After Gemini fails once, new generators go straight to the OpenAI fallback until the key changes"""
+        env = {"OPENAI_API_KEY": "sk-test", "LLM_PROVIDER": "gemini", "GEMINI_API_KEY": "g-test", "MOCK_MODE": "false"}
+        with patch.dict(os.environ, env), patch.dict(direct_generator._PROVIDER_FAILURES, clear=True), \
+                patch('modules.direct_generator.get_provider', side_effect=ValueError("no model")) as gemini:
+            first = DirectGenerator(cache=self.generator.cache)
+            second = DirectGenerator(cache=self.generator.cache)
+            with patch.dict(os.environ, {"GEMINI_API_KEY": "g-fixed"}):
+                DirectGenerator(cache=self.generator.cache)
+
+        self.assertIsInstance(first.llm, OpenAIProvider)
+        self.assertIsInstance(second.llm, OpenAIProvider)
+        self.assertEqual([call.args[1] for call in gemini.call_args_list], ["g-test", "g-fixed"])
+
+if __name__ == '__main__':
+    unittest.main()
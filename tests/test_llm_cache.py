@@ -0,0 +1,69 @@
+"""
+Tests for the LLM response cache in the Enhanced LinkedIn Generator
+"""
+
+import os
+import sys
+import unittest
+
+# Ensure modules directory is in path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from modules.llm_cache import LLMCache, MemoryCacheBackend, cache_key, make_cache_key
+
+class TestLLMCache(unittest.TestCase):
+    """Test suite for the response cache"""
+
+    def setUp(self):
+        """Create an isolated in-process cache"""
+        self.cache = LLMCache(backend=MemoryCacheBackend(maxsize=10, ttl=60))
+
+    def test_cache_key_is_order_independent(self):
+        """Keys depend on content, not on dict ordering"""
+        key_a = make_cache_key(voice={"tone": "calm", "name": "A"}, type="Quick Update")
+        key_b = make_cache_key(type="Quick Update", voice={"name": "A", "tone": "calm"})
+        self.assertEqual(key_a, key_b)
+
+    def test_chat_cache_key_only_for_deterministic_requests(self):
+        """Sampled requests get no key; deterministic ones differ by every parameter"""
+        messages = [{"role": "user", "content": "Summarize this"}]
+        self.assertIsNone(cache_key("gpt-3.5-turbo", messages, 0.7, 500))
+        self.assertEqual(cache_key("gpt-3.5-turbo", messages, 0, 500), cache_key("gpt-3.5-turbo", messages, 0, 500))
+        self.assertNotEqual(cache_key("gpt-3.5-turbo", messages, 0, 500), cache_key("gpt-4o-mini", messages, 0, 500))
+        self.assertNotEqual(cache_key("gpt-3.5-turbo", messages, 0, 500), cache_key("gpt-3.5-turbo", messages, 0, 200))
+
+    def test_get_or_compute_exact_hit(self):
+        """Second identical request is served without recomputing"""
+        calls = []
+        compute = lambda: calls.append(1) or {"content": "post"}
+
+        first = self.cache.get_or_compute("key", compute)
+        second = self.cache.get_or_compute("key", compute)
+
+        self.assertEqual(first, second)
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(self.cache.stats['hits'], 1)
+        self.assertEqual(self.cache.stats['misses'], 1)
+
+    def test_get_or_compute_semantic_hit(self):
+        """Near-identical source text in the same namespace reuses the result"""
+        text = "OpenAI releases a new model for enterprise customers with faster responses"
+        self.cache.get_or_compute("a", lambda: {"content": "post"}, text=text, namespace="ns")
+
+        result = self.cache.get_or_compute("b", lambda: {"content": "other"}, text=text + ".", namespace="ns")
+        self.assertEqual(result, {"content": "post"})
+        self.assertEqual(self.cache.stats['semantic_hits'], 1)
+
+        # Other namespaces never match
+        result = self.cache.get_or_compute("c", lambda: {"content": "other"}, text=text, namespace="other")
+        self.assertEqual(result, {"content": "other"})
+
+    def test_error_results_not_cached(self):
+        """Values rejected by should_cache are recomputed next time"""
+        is_ok = lambda value: value.get('status') != 'error'
+        self.cache.get_or_compute("key", lambda: {"status": "error"}, should_cache=is_ok)
+        result = self.cache.get_or_compute("key", lambda: {"status": "pending"}, should_cache=is_ok)
+        self.assertEqual(result, {"status": "pending"})
+
+if __name__ == '__main__':
+    unittest.main()
@@ -12,8 +12,9 @@ from unittest.mock import patch, MagicMock
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 # Import modules to test
-from modules.llm_provider import LLMProvider, OpenAIProvider, GeminiProvider
+from modules.llm_provider import LLMProvider, OpenAIProvider, GeminiProvider, CachingLLMProvider
 from modules.direct_generator import DirectGenerator
+from modules.llm_cache import LLMCache, MemoryCacheBackend
 
 class TestLLMProviders(unittest.TestCase):
     """Test suite for LLM providers"""
@@ -96,6 +97,200 @@ class TestLLMProviders(unittest.TestCase):
         self.assertIn("content", response["choices"][0]["message"])
         self.assertEqual(response["choices"][0]["message"]["content"], "This is a mock Gemini response")
     
+    def test_retry_backoff_grows_with_jitter_and_cap(self):
+        """Retry delays are randomized, grow per attempt and never exceed the cap"""
+        from modules.llm_provider import _backoff_delay
+        for attempt in range(8):
+            delay = _backoff_delay(attempt, 1.0, max_delay=10.0)
+            self.assertGreaterEqual(delay, 1.0)
+            self.assertLessEqual(delay, min(10.0, 2 ** attempt))
+
+    def test_gemini_without_key_falls_back_to_openai(self):
+        """A missing Gemini key uses the OpenAI fallback instead of failing at startup"""
+        env = {"MOCK_MODE": "false", "OPENAI_API_KEY": "sk-test", "GEMINI_API_KEY": ""}
+        with patch.dict(os.environ, env), patch('modules.llm_provider.get_openai_client') as get_client:
+            provider = GeminiProvider()
+            get_client.return_value.chat.completions.create.return_value = {"choices": [{"message": {"content": "From OpenAI"}}]}
+            response = provider.generate_chat_completion([{"role": "user", "content": "Hi"}])
+
+        self.assertEqual(provider.model_names, [])
+        self.assertEqual(response["choices"][0]["message"]["content"], "From OpenAI")
+        self.assertTrue(OpenAIProvider(MagicMock()).is_available())
+        self.assertFalse(OpenAIProvider(None).is_available())
+
+    def test_gemini_provider_is_built_once_per_key(self):
+        """Generators share one initialized GeminiProvider per API key"""
+        from modules import llm_provider
+        os.environ["MOCK_MODE"] = "false"
+        llm_provider._cached_provider.cache_clear()
+        try:
+            with patch.object(llm_provider, 'GeminiProvider') as gemini:
+                first = llm_provider.get_provider("gemini", "key-a")
+                second = llm_provider.get_provider("gemini", "key-a")
+                llm_provider.get_provider("gemini", "key-b")
+        finally:
+            llm_provider._cached_provider.cache_clear()
+
+        self.assertIs(first, second)
+        self.assertEqual(gemini.call_count, 2)
+        with self.assertRaises(ValueError):
+            llm_provider.get_provider("unknown")
+
+    def test_gemini_streams_chunks(self):
+        """Gemini text chunks are yielded as they arrive"""
+        os.environ["MOCK_MODE"] = "false"
+        with patch.object(GeminiProvider, '_initialize_gemini'):
+            provider = GeminiProvider("mock-api-key")
+        provider.model = MagicMock()
+        provider.model.generate_content.return_value = iter([MagicMock(text="Hello "), MagicMock(text="world")])
+        provider.current_model_name = 'gemini-1.5-flash'
+        provider._models['gemini-1.5-flash'] = provider.model
+
+        deltas = list(provider.stream_chat_completion([{"role": "user", "content": "Hi"}], max_tokens=50))
+
+        self.assertEqual(deltas, ["Hello ", "world"])
+        self.assertTrue(provider.model.generate_content.call_args.kwargs['stream'])
+        self.assertEqual(provider.model.generate_content.call_args.kwargs['generation_config']['max_output_tokens'], 50)
+
+    def test_dict_providers_stream_whole_completion(self):
+        """Providers without native streaming yield their full text once"""
+        from modules.mock_provider import MockProvider
+
+        deltas = list(MockProvider().stream_chat_completion([{"role": "user", "content": "Hello"}]))
+
+        self.assertEqual(deltas, ["This is a generic mock response."])
+
+    @patch('google.generativeai.configure')
+    def test_gemini_configured_once_per_key(self, mock_configure):
+        """Repeat configuration with the same key keeps genai's shared clients"""
+        from modules import llm_provider
+        with patch.dict(llm_provider._GEMINI_CONFIG, clear=True):
+            llm_provider._configure_gemini("key-a")
+            llm_provider._configure_gemini("key-a")
+            llm_provider._configure_gemini("key-b")
+
+        self.assertEqual(mock_configure.call_count, 2)
+
+    def test_gemini_message_conversion(self):
+        """System prompts are folded into the first user message; assistant turns become model turns"""
+        converted = GeminiProvider._to_gemini_messages([
+            {"role": "system", "content": "Be brief."},
+            {"role": "system", "content": "Use English."},
+            {"role": "user", "content": "Hi"},
+            {"role": "assistant", "content": "Hello"}
+        ])
+
+        self.assertEqual(converted, [
+            {"role": "user", "parts": ["Be brief.\nUse English.\n\nHi"]},
+            {"role": "model", "parts": ["Hello"]}
+        ])
+        self.assertEqual(GeminiProvider._to_gemini_messages([{"role": "system", "content": "Be brief."}]),
+                         [{"role": "user", "parts": ["Be brief."]}])
+
+    def _gemini_provider_with_models(self, mock_generative_model, slow_models):
+        """GeminiProvider over pro/flash fakes; models in slow_models block until released"""
+        import threading
+        release = threading.Event()
+
+        def build_model(model_name, **kwargs):
+            model = MagicMock()
+            if model_name in slow_models:
+                model.generate_content.side_effect = lambda *a, **k: release.wait(5) and MagicMock(text="Slow")
+            else:
+                model.generate_content.return_value = MagicMock(text=f"Answer from {model_name}")
+            return model
+        mock_generative_model.side_effect = build_model
+
+        os.environ["MOCK_MODE"] = "false"
+        with patch.object(GeminiProvider, '_initialize_gemini'):
+            provider = GeminiProvider("mock-api-key")
+        provider.model_names = ['gemini-1.5-pro', 'gemini-1.5-flash']
+        provider.generation_config = {}
+        provider.max_retries, provider.retry_delay = 1, 0
+        return provider, release
+
+    @patch('modules.llm_provider.GEMINI_HEDGE_DELAY', 0.05)
+    @patch('modules.llm_provider.GEMINI_RACE_MODELS', 2)
+    @patch('google.generativeai.GenerativeModel')
+    def test_gemini_hedges_a_slow_preferred_model(self, mock_generative_model):
+        """A slow preferred model is hedged with the next one after the hedge delay"""
+        provider, release = self._gemini_provider_with_models(mock_generative_model, {'gemini-1.5-pro'})
+
+        try:
+            response = provider.generate_chat_completion([{"role": "user", "content": "Generate a test post"}])
+        finally:
+            release.set()
+
+        self.assertEqual(response["choices"][0]["message"]["content"], "Answer from gemini-1.5-flash")
+        # Model objects are built once per name and reused afterwards
+        self.assertIs(provider._get_model('gemini-1.5-flash'), provider._get_model('gemini-1.5-flash'))
+        self.assertEqual(mock_generative_model.call_count, 2)
+
+    @patch('modules.llm_provider.GEMINI_RACE_MODELS', 2)
+    @patch('google.generativeai.GenerativeModel')
+    def test_gemini_prompt_preferred_model_is_not_hedged(self, mock_generative_model):
+        """A preferred model answering within the hedge delay is the only request sent"""
+        provider, release = self._gemini_provider_with_models(mock_generative_model, set())
+
+        response = provider.generate_chat_completion([{"role": "user", "content": "Generate a test post"}])
+
+        self.assertEqual(response["choices"][0]["message"]["content"], "Answer from gemini-1.5-pro")
+        self.assertEqual([c.args[0] for c in mock_generative_model.call_args_list], ['gemini-1.5-pro'])
+
+    def test_openai_clients_are_shared_per_key(self):
+        """Wrappers and fallbacks reuse one client (and connection pool) per API key"""
+        from modules.openai_wrapper import get_openai_client
+        get_openai_client.cache_clear()
+
+        client = get_openai_client("sk-test-shared")
+
+        self.assertIs(get_openai_client("sk-test-shared"), client)
+        self.assertIsNot(get_openai_client("sk-test-other"), client)
+        get_openai_client.cache_clear()
+
+    def test_caching_provider_reuses_deterministic_completions(self):
+        """Deterministic requests are served from the cache; sampled ones pass through"""
+        inner = MagicMock()
+        inner.generate_chat_completion.return_value = {"choices": [{"message": {"content": "Cached answer"}}]}
+        provider = CachingLLMProvider(inner, cache=LLMCache(backend=MemoryCacheBackend(maxsize=10, ttl=60)))
+        messages = [
+            {"role": "system", "content": "You are a helpful assistant"},
+            {"role": "user", "content": "Summarize the quarterly cloud pricing changes for enterprise customers"}
+        ]
+        reworded = [messages[0], {"role": "user", "content": "Summarize the quarterly cloud pricing changes for enterprise customers."}]
+
+        provider.generate_chat_completion(messages, temperature=0)
+        repeat = provider.generate_chat_completion(messages, temperature=0)
+        similar = provider.generate_chat_completion(reworded, temperature=0)
+        self.assertEqual(repeat.choices[0].message.content, "Cached answer")
+        self.assertEqual(similar.choices[0].message.content, "Cached answer")
+        self.assertEqual(inner.generate_chat_completion.call_count, 1)
+
+        provider.generate_chat_completion(messages, temperature=0.7)
+        self.assertEqual(inner.generate_chat_completion.call_count, 2)
+
+    def test_mock_provider_picks_response_by_keyword(self):
+        """Post requests win over summaries, summaries over errors"""
+        from modules.mock_provider import MockProvider
+        provider = MockProvider()
+        ask = lambda text: provider.generate_chat_completion([{"role": "user", "content": text}])
+
+        self.assertIn(ask("Write a LinkedIn POST summary")["choices"][0]["message"]["content"],
+                      provider.responses["linkedin_posts"])
+        self.assertIn(ask("Please summarize this error")["choices"][0]["message"]["content"],
+                      provider.responses["summaries"])
+        self.assertIn("error", ask("Trigger an ERROR"))
+        self.assertEqual(ask("Hello")["choices"][0]["message"]["content"], "This is a generic mock response.")
+
+    def test_mock_responses_are_loaded_once_and_shared(self):
+        """Every MockProvider shares one read-only copy of the mock responses"""
+        from modules.mock_provider import MockProvider
+        first, second = MockProvider(), MockProvider()
+
+        self.assertIs(first.responses, second.responses)
+        with self.assertRaises(TypeError):
+            first.responses["summaries"] = ()
+
     def test_direct_generator_initialization(self):
         """Test that DirectGenerator can initialize in mock mode"""
         generator = DirectGenerator()